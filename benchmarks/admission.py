@@ -0,0 +1,124 @@
+"""
+Benchmarks miner admission decisions: the precomputed `AdmissionTable` against scanning the metagraph
+on every request.
+
+Run it as a module from the repository root, so the `template` package is importable:
+
+    python -m benchmarks.admission
+"""
+import time
+
+import numpy as np
+
+from template.base.utils.admission import AdmissionTable
+
+
+def admit_scan(
+    hotkey,
+    hotkeys,
+    validator_permit,
+    stake,
+    force_validator_permit,
+    minimum_stake,
+):
+    # Previous implementation, scanning the hotkeys and checking the config on every request.
+    if hotkey not in hotkeys:
+        return True, "Unrecognized hotkey", 0.0
+    uid = hotkeys.index(hotkey)
+    if force_validator_permit and not validator_permit[uid]:
+        return True, "Non-validator hotkey", float(stake[uid])
+    if minimum_stake > 0 and stake[uid] < minimum_stake:
+        return True, "Insufficient stake", float(stake[uid])
+    return False, "Hotkey recognized!", float(stake[uid])
+
+
+def decisions_per_second(fn, callers, duration):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        for hotkey in callers:
+            fn(hotkey)
+        count += len(callers)
+    return count / (time.perf_counter() - start)
+
+
+def main(args):
+    rng = np.random.default_rng(0)
+
+    print(f"Admission decisions per second, {args.requests} callers per round")
+    print(
+        f"{'n':>8} {'scan (/s)':>14} {'table (/s)':>14} {'build (ms)':>11} {'speedup':>9}"
+    )
+    for n in args.sizes:
+        hotkeys = [f"5{uid:047d}" for uid in range(n)]
+        validator_permit = rng.random(n) < 0.25
+        stake = rng.pareto(1.0, n).astype(np.float32)
+
+        # Mostly registered callers, uniformly spread over the uids, and a few unknown ones.
+        callers = [
+            hotkeys[uid] if uid < n else f"unknown-{uid}"
+            for uid in rng.integers(0, int(n * 1.1), args.requests)
+        ]
+
+        start = time.perf_counter()
+        table = AdmissionTable.build(
+            hotkeys,
+            validator_permit,
+            stake,
+            force_validator_permit=True,
+            minimum_stake=args.minimum_stake,
+        )
+        build = time.perf_counter() - start
+
+        scan = decisions_per_second(
+            lambda hotkey: admit_scan(
+                hotkey,
+                hotkeys,
+                validator_permit,
+                stake,
+                True,
+                args.minimum_stake,
+            ),
+            callers,
+            args.duration,
+        )
+        lookup = decisions_per_second(table.lookup, callers, args.duration)
+        print(
+            f"{n:>8} {scan:>14,.0f} {lookup:>14,.0f} {build * 1e3:>11.2f} {lookup / scan:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark miner admission decisions"
+    )
+    parser.add_argument(
+        "--sizes",
+        help="Number of uids in the metagraph",
+        type=int,
+        nargs="+",
+        default=[256, 1024, 4096],
+    )
+    parser.add_argument(
+        "--requests",
+        help="Number of requests per round",
+        type=int,
+        default=1000,
+    )
+    parser.add_argument(
+        "--minimum_stake",
+        help="Minimum stake of admitted callers",
+        type=float,
+        default=1.0,
+    )
+    parser.add_argument(
+        "--duration",
+        help="Seconds spent measuring each implementation",
+        type=float,
+        default=1.0,
+    )
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,150 @@
+"""
+Benchmarks micro-batching of miner forward calls: requests per second and latency of a synthetic
+model served by a `MicroBatcher` at several maximum batch sizes, against unbatched calls.
+
+Run it as a module from the repository root, so the `template` package is importable:
+
+    python -m benchmarks.batching
+"""
+import asyncio
+import time
+
+import numpy as np
+
+from template.base.utils.batching import MicroBatcher
+
+
+class Model:
+    # Synthetic CPU inference: a few dense layers, with a fixed cost per call like a real model invocation.
+    def __init__(self, dim: int, layers: int, overhead: float):
+        rng = np.random.default_rng(0)
+        self.weights = [
+            rng.standard_normal((dim, dim)).astype(np.float32) / np.sqrt(dim)
+            for _ in range(layers)
+        ]
+        self.overhead = overhead
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        deadline = time.perf_counter() + self.overhead
+        while time.perf_counter() < deadline:
+            pass
+        for weight in self.weights:
+            x = np.tanh(x @ weight)
+        return x
+
+
+async def run(model, inputs, clients, duration, max_batch_size, max_delay):
+    # Closed loop: each client sends a request as soon as it received the previous response.
+    async def forward(x):
+        # Wait for the requests received before, as the event loop of the axon would.
+        await asyncio.sleep(0)
+        return model(x[None])[0]
+
+    async def forward_batch(batch):
+        return list(model(np.stack(batch)))
+
+    if max_batch_size > 0:
+        batcher = MicroBatcher(forward_batch, max_batch_size, max_delay)
+        submit = batcher.submit
+    else:
+        submit = forward
+
+    latencies = []
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+
+    async def client(i):
+        while loop.time() < deadline:
+            start = loop.time()
+            await submit(inputs[i])
+            latencies.append(loop.time() - start)
+            # Let the other clients queue their requests, as concurrent connections would.
+            await asyncio.sleep(0)
+
+    start = loop.time()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    elapsed = loop.time() - start
+    return len(latencies) / elapsed, np.percentile(latencies, [50, 99])
+
+
+def main(args):
+    model = Model(args.dim, args.layers, args.overhead)
+    inputs = np.random.default_rng(1).standard_normal(
+        (args.clients, args.dim), dtype=np.float32
+    )
+
+    print(
+        f"{args.clients} concurrent clients, {args.layers} layers of {args.dim}x{args.dim}, "
+        f"{args.overhead * 1e3:.1f} ms overhead per call, max delay {args.max_delay * 1e3:.1f} ms"
+    )
+    print(
+        f"{'batch size':>10} {'requests/s':>11} {'p50 (ms)':>9} {'p99 (ms)':>9} {'speedup':>8}"
+    )
+    baseline = None
+    for max_batch_size in [0] + args.batch_sizes:
+        throughput, (p50, p99) = asyncio.run(
+            run(
+                model,
+                inputs,
+                args.clients,
+                args.duration,
+                max_batch_size,
+                args.max_delay,
+            )
+        )
+        baseline = baseline or throughput
+        label = max_batch_size or "off"
+        print(
+            f"{label:>10} {throughput:>11,.0f} {p50 * 1e3:>9.2f} {p99 * 1e3:>9.2f} {throughput / baseline:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark micro-batching of miner forward calls"
+    )
+    parser.add_argument(
+        "--batch_sizes",
+        help="Maximum batch sizes to benchmark",
+        type=int,
+        nargs="+",
+        default=[1, 4, 16, 64],
+    )
+    parser.add_argument(
+        "--clients",
+        help="Number of concurrent clients",
+        type=int,
+        default=64,
+    )
+    parser.add_argument(
+        "--max_delay",
+        help="Maximum seconds a request waits for its batch to fill up",
+        type=float,
+        default=0.002,
+    )
+    parser.add_argument(
+        "--dim", help="Width of the synthetic model", type=int, default=256
+    )
+    parser.add_argument(
+        "--layers",
+        help="Number of layers of the synthetic model",
+        type=int,
+        default=4,
+    )
+    parser.add_argument(
+        "--overhead",
+        help="Fixed seconds of work per model call",
+        type=float,
+        default=0.0005,
+    )
+    parser.add_argument(
+        "--duration",
+        help="Seconds spent measuring each batch size",
+        type=float,
+        default=2.0,
+    )
+    args = parser.parse_args()
+
+    main(args)
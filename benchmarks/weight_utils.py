@@ -0,0 +1,143 @@
+"""
+Benchmarks weight normalization and conversion: the vectorized `weight_utils` functions against the
+previous loop based implementations.
+
+Run it as a module from the repository root, so the `template` package is importable:
+
+    python -m benchmarks.weight_utils
+"""
+import timeit
+
+import numpy as np
+
+from template.base.utils.weight_utils import (
+    U16_MAX,
+    convert_weights_and_uids_for_emit,
+    normalize_max_weight,
+    normalize_max_weight_batch,
+)
+
+
+def normalize_max_weight_loop(x: np.ndarray, limit: float = 0.1) -> np.ndarray:
+    # Previous implementation, building estimation_sum with a list comprehension.
+    epsilon = 1e-7
+
+    weights = x.copy()
+    values = np.sort(weights)
+
+    if x.sum() == 0 or len(x) * limit <= 1:
+        return np.ones_like(x) / x.size
+    else:
+        estimation = values / values.sum()
+
+        if estimation.max() <= limit:
+            return weights / weights.sum()
+
+        cumsum = np.cumsum(estimation, 0)
+
+        estimation_sum = np.array(
+            [(len(values) - i - 1) * estimation[i] for i in range(len(values))]
+        )
+        n_values = (
+            estimation / (estimation_sum + cumsum + epsilon) < limit
+        ).sum()
+
+        cutoff_scale = (limit * cumsum[n_values - 1] - epsilon) / (
+            1 - (limit * (len(estimation) - n_values))
+        )
+        cutoff = cutoff_scale * values.sum()
+
+        weights[weights > cutoff] = cutoff
+
+        y = weights / weights.sum()
+
+        return y
+
+
+def convert_weights_and_uids_for_emit_loop(uids, weights):
+    # Previous implementation, rounding and filtering weights one by one in Python.
+    max_weight = float(np.max(weights))
+    weights = [float(value) / max_weight for value in weights]
+    weight_vals = []
+    weight_uids = []
+    for i, (weight_i, uid_i) in enumerate(list(zip(weights, uids))):
+        uint16_val = round(float(weight_i) * int(U16_MAX))
+        if uint16_val != 0:
+            weight_vals.append(uint16_val)
+            weight_uids.append(uid_i)
+    return weight_uids, weight_vals
+
+
+def best_of(fn, repeat):
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def main(args):
+    rng = np.random.default_rng(0)
+
+    print("normalize_max_weight, single vector")
+    print(f"{'n':>8} {'loop (ms)':>12} {'vectorized (ms)':>16} {'speedup':>9}")
+    for n in args.sizes:
+        # Heavy tailed weights so the cutoff path is exercised.
+        x = rng.pareto(0.5, n).astype(np.float32)
+        loop = best_of(lambda: normalize_max_weight_loop(x, args.limit), 5)
+        vectorized = best_of(lambda: normalize_max_weight(x, args.limit), 5)
+        print(
+            f"{n:>8} {loop * 1e3:>12.3f} {vectorized * 1e3:>16.3f} {loop / vectorized:>8.1f}x"
+        )
+
+    print()
+    print(f"normalize_max_weight_batch, {args.snapshots} snapshots")
+    print(f"{'n':>8} {'per row (ms)':>13} {'batched (ms)':>13} {'speedup':>9}")
+    for n in args.sizes[:2]:
+        x = rng.pareto(0.5, (args.snapshots, n)).astype(np.float32)
+        rows = best_of(
+            lambda: [normalize_max_weight(row, args.limit) for row in x], 3
+        )
+        batched = best_of(lambda: normalize_max_weight_batch(x, args.limit), 3)
+        print(
+            f"{n:>8} {rows * 1e3:>13.1f} {batched * 1e3:>13.1f} {rows / batched:>8.1f}x"
+        )
+
+    print()
+    print("convert_weights_and_uids_for_emit")
+    print(f"{'n':>8} {'loop (ms)':>12} {'vectorized (ms)':>16} {'speedup':>9}")
+    for n in args.sizes:
+        uids = np.arange(min(n, U16_MAX + 1))
+        weights = normalize_max_weight(rng.random(uids.size), args.limit)
+        loop = best_of(
+            lambda: convert_weights_and_uids_for_emit_loop(uids, weights), 5
+        )
+        vectorized = best_of(
+            lambda: convert_weights_and_uids_for_emit(uids, weights), 5
+        )
+        print(
+            f"{uids.size:>8} {loop * 1e3:>12.3f} {vectorized * 1e3:>16.3f} {loop / vectorized:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark weight normalization and conversion"
+    )
+    parser.add_argument(
+        "--sizes",
+        help="Weight vector sizes to benchmark",
+        type=int,
+        nargs="+",
+        default=[256, 4096, 65536],
+    )
+    parser.add_argument(
+        "--limit", help="Max weight limit", type=float, default=0.1
+    )
+    parser.add_argument(
+        "--snapshots",
+        help="Number of weight vectors normalized by the batched benchmark",
+        type=int,
+        default=1000,
+    )
+    args = parser.parse_args()
+
+    main(args)
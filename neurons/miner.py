@@ -57,11 +57,33 @@ class Miner(BaseMinerNeuron):
 
         The 'forward' function is a placeholder and should be overridden with logic that is appropriate for
         the miner's intended operation. This method demonstrates a basic transformation of input data.
+
+        The forward runs on the event loop of the axon. CPU heavy work should be moved off it with
+        self.offload( fn, *args, synapse=synapse ), which runs on the pool selected by --neuron.offload.
         """
         # TODO(developer): Replace with actual implementation logic.
         synapse.dummy_output = synapse.dummy_input * 2
         return synapse
 
+    async def forward_batch(
+        self, synapses: typing.List[template.protocol.Dummy]
+    ) -> typing.List[template.protocol.Dummy]:
+        """
+        Processes a batch of 'Dummy' synapses received concurrently, when batching is enabled with
+        --neuron.max_batch_size. This method should be replaced with batched logic, e.g. a single model
+        inference over the inputs of every synapse.
+
+        Args:
+            synapses (List[template.protocol.Dummy]): The synapse objects to process together.
+
+        Returns:
+            List[template.protocol.Dummy]: The synapse objects with their 'dummy_output' field set, in the same order.
+        """
+        # TODO(developer): Replace with actual batched implementation logic.
+        for synapse in synapses:
+            synapse.dummy_output = synapse.dummy_input * 2
+        return synapses
+
     async def blacklist(
         self, synapse: template.protocol.Dummy
     ) -> typing.Tuple[bool, str]:
@@ -89,8 +111,10 @@ class Miner(BaseMinerNeuron):
         - Consider blacklisting entities that are not validators or have insufficient stake.
 
         In practice it would be wise to blacklist requests from entities that are not validators, or do not have
-        enough stake. This can be checked via metagraph.S and metagraph.validator_permit. You can always attain
-        the uid of the sender via a metagraph.hotkeys.index( synapse.dendrite.hotkey ) call.
+        enough stake. This template looks up the decision precomputed by self.index_metagraph() in self.admission,
+        according to the --blacklist.force_validator_permit, --blacklist.allow_non_registered and
+        --blacklist.minimum_stake flags. For custom logic, self.stakes and self.validator_permits hold the stake
+        and permit of every uid, and self.caller_uid( synapse ) returns the uid of the sender, None if un-registered.
 
         Otherwise, allow the request to be processed further.
         """
@@ -102,29 +126,18 @@ class Miner(BaseMinerNeuron):
             return True, "Missing dendrite or hotkey"
 
         # TODO(developer): Define how miners should blacklist requests.
-        uid = self.metagraph.hotkeys.index(synapse.dendrite.hotkey)
-        if (
-            not self.config.blacklist.allow_non_registered
-            and synapse.dendrite.hotkey not in self.metagraph.hotkeys
-        ):
-            # Ignore requests from un-registered entities.
+        # The decision of every hotkey is precomputed from the metagraph and the blacklist config at each resync.
+        admission = self.admission.lookup(synapse.dendrite.hotkey)
+        if not admission.allowed:
             bt.logging.trace(
-                f"Blacklisting un-registered hotkey {synapse.dendrite.hotkey}"
+                f"Blacklisting hotkey {synapse.dendrite.hotkey}: {admission.reason}"
             )
-            return True, "Unrecognized hotkey"
-
-        if self.config.blacklist.force_validator_permit:
-            # If the config is set to force validator permit, then we should only allow requests from validators.
-            if not self.metagraph.validator_permit[uid]:
-                bt.logging.warning(
-                    f"Blacklisting a request from non-validator hotkey {synapse.dendrite.hotkey}"
-                )
-                return True, "Non-validator hotkey"
+            return True, admission.reason
 
         bt.logging.trace(
             f"Not Blacklisting recognized hotkey {synapse.dendrite.hotkey}"
         )
-        return False, "Hotkey recognized!"
+        return False, admission.reason
 
     async def priority(self, synapse: template.protocol.Dummy) -> float:
         """
@@ -153,12 +166,9 @@ class Miner(BaseMinerNeuron):
             return 0.0
 
         # TODO(developer): Define how miners should prioritize requests.
-        caller_uid = self.metagraph.hotkeys.index(
+        priority = self.admission.lookup(
             synapse.dendrite.hotkey
-        )  # Get the caller index.
-        priority = float(
-            self.metagraph.S[caller_uid]
-        )  # Return the stake as the priority.
+        ).priority  # Return the stake as the priority.
         bt.logging.trace(
             f"Prioritizing {synapse.dendrite.hotkey} with value: {priority}"
         )
@@ -27,9 +27,32 @@ __spec_version__ = (
     + (1 * int(version_split[2]))
 )
 
-# Import all submodules.
-from . import protocol
-from . import base
-from . import validator
-from . import api
-from .subnet_links import SUBNET_LINKS
+# Submodules are imported lazily on first access, so importing `template` or a single submodule such as
+# `template.protocol` does not pull in the whole package and its dependencies.
+import importlib
+
+_SUBMODULES = {
+    "api",
+    "base",
+    "mock",
+    "protocol",
+    "subnet_links",
+    "utils",
+    "validator",
+}
+_ATTRIBUTES = {"SUBNET_LINKS": "subnet_links"}
+
+__all__ = sorted(_SUBMODULES | set(_ATTRIBUTES))
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _ATTRIBUTES:
+        module = importlib.import_module(f".{_ATTRIBUTES[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
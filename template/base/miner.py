@@ -15,18 +15,24 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 
-import time
 import asyncio
+import functools
+import inspect
 import threading
 import argparse
 import traceback
 
 import bittensor as bt
+import numpy as np
 
 from template.base.neuron import BaseNeuron
+from template.base.utils.admission import AdmissionTable
+from template.base.utils.batching import MicroBatcher
+from template.base.utils.offload import Offloader
+from template.base.utils.rate_limit import RateLimiter
 from template.utils.config import add_miner_args
 
-from typing import Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 
 class BaseMinerNeuron(BaseNeuron):
@@ -53,27 +59,71 @@ class BaseMinerNeuron(BaseNeuron):
             bt.logging.warning(
                 "You are allowing non-registered entities to send requests to your miner. This is a security risk."
             )
+        # Per-caller rate limits and load shedding, applied before requests are deserialized.
+        self.rate_limiter = RateLimiter(
+            rate=self.config.blacklist.rate_limit,
+            stake_scale=self.config.blacklist.rate_limit_stake_scale,
+            burst=self.config.blacklist.rate_limit_burst,
+            max_inflight=self.config.blacklist.max_inflight,
+        )
+
+        # Index of the metagraph used to handle requests, rebuilt on every resync.
+        self.index_metagraph()
+
         # The axon handles request processing, allowing validators to send this miner requests.
         self.axon = bt.axon(
             wallet=self.wallet,
             config=self.config() if callable(self.config) else self.config,
         )
 
+        # Pool running the work passed to `offload` outside of the axon event loop.
+        self.offloader = Offloader(
+            mode=self.config.neuron.offload,
+            max_workers=self.config.neuron.offload_workers,
+            queue_size=self.config.neuron.offload_queue_size,
+        )
+
+        # Optionally group concurrent requests into batches handled by `forward_batch`.
+        self.batcher: Optional[MicroBatcher] = None
+        forward_fn = self.forward
+        if self.config.neuron.max_batch_size > 0:
+            self.batcher = MicroBatcher(
+                self.forward_batch,
+                max_batch_size=self.config.neuron.max_batch_size,
+                max_delay=self.config.neuron.max_batch_delay,
+            )
+            forward_fn = self.batch_forward(self.forward)
+
         # Attach determiners which functions are called when servicing a request.
         bt.logging.info(f"Attaching forward function to miner axon.")
         self.axon.attach(
-            forward_fn=self.forward,
-            blacklist_fn=self.blacklist,
+            forward_fn=self.limit_forward(forward_fn),
+            blacklist_fn=self.limit_blacklist(self.blacklist),
             priority_fn=self.priority,
         )
         bt.logging.info(f"Axon created: {self.axon}")
 
         # Instantiate runners
+        self.exit_event = threading.Event()
+        self.last_sync_block: int = 0
         self.should_exit: bool = False
         self.is_running: bool = False
         self.thread: Union[threading.Thread, None] = None
         self.lock = asyncio.Lock()
 
+    @property
+    def should_exit(self) -> bool:
+        return self.exit_event.is_set()
+
+    @should_exit.setter
+    def should_exit(self, should_exit: bool):
+        if should_exit:
+            self.exit_event.set()
+            # Wakes up the main loop waiting for the next sync block.
+            self.block_clock.stop()
+        else:
+            self.exit_event.clear()
+
     def run(self):
         """
         Initiates and manages the main loop for the miner on the Bittensor network. The main loop handles graceful shutdown on keyboard interrupts and logs unforeseen errors.
@@ -84,9 +134,10 @@ class BaseMinerNeuron(BaseNeuron):
         3. Periodically resynchronizes with the chain; updating the metagraph with the latest network state and setting weights.
 
         The miner continues its operations until `should_exit` is set to True or an external interruption occurs.
-        During each epoch of its operation, the miner waits for new blocks on the Bittensor network, updates its
-        knowledge of the network (metagraph), and sets its weights. This process ensures the miner remains active
-        and up-to-date with the network's latest state.
+        During each epoch of its operation, the miner sleeps until the block at which its next sync is due, updates
+        its knowledge of the network (metagraph), and sets its weights. The wait is driven by the block clock, so an
+        idle miner makes no chain calls beyond tracking the current block, and stopping the miner wakes it up
+        immediately. This process ensures the miner remains active and up-to-date with the network's latest state.
 
         Note:
             - The function leverages the global configurations set during the initialization of the miner.
@@ -100,6 +151,10 @@ class BaseMinerNeuron(BaseNeuron):
         # Check that miner is registered on the network.
         self.sync()
 
+        # A warm started miner restored its metagraph from a snapshot, bring it up to date.
+        if self.warm_started:
+            self.resync_metagraph()
+
         # Serve passes the axon information to the network + netuid we are hosting on.
         # This will auto-update if the axon port of external ip have changed.
         bt.logging.info(
@@ -110,29 +165,48 @@ class BaseMinerNeuron(BaseNeuron):
         # Start  starts the miner's axon, making it active on the network.
         self.axon.start()
 
-        bt.logging.info(f"Miner starting at block: {self.block}")
+        self.block_clock.start()
+
+        self.last_sync_block = self.block
+        bt.logging.info(f"Miner starting at block: {self.last_sync_block}")
 
         # This loop maintains the miner's operations until intentionally stopped.
         try:
             while not self.should_exit:
-                while (
-                    self.block - self.metagraph.last_update[self.uid]
-                    < self.config.neuron.epoch_length
-                ):
-                    # Wait before checking again.
-                    time.sleep(1)
-
-                    # Check if we should exit.
-                    if self.should_exit:
-                        break
-
-                # Sync metagraph and potentially set weights.
-                self.sync()
+                # Sleep until an epoch has elapsed since the last sync, or since the last weights were set.
+                next_sync_block = (
+                    max(
+                        int(self.metagraph.last_update[self.uid]),
+                        self.last_sync_block,
+                    )
+                    + self.config.neuron.epoch_length
+                )
+                if not self.block_clock.wait_for_block_sync(next_sync_block):
+                    # Woken up by a shutdown, or the clock was stopped without one.
+                    if not self.should_exit:
+                        self.block_clock.start()
+                    continue
+
+                # Sync metagraph and potentially set weights. A failed sync, e.g. a chain timeout, is retried at
+                # the next epoch instead of ending the loop.
+                try:
+                    self.chain.run_sync(self.sync)
+                except Exception as err:
+                    bt.logging.error(
+                        f"Failed to sync at block {next_sync_block}: {err!r}"
+                    )
+                    bt.logging.debug(traceback.format_exc())
+                self.last_sync_block = self.block
                 self.step += 1
+                bt.logging.debug(f"Requests: {self.rate_limiter.stats()}")
+                if self.batcher is not None:
+                    bt.logging.debug(f"Batches: {self.batcher.stats()}")
+                bt.logging.debug(f"Offload: {self.offloader.stats()}")
 
         # If someone intentionally stops the miner, it'll safely terminate operations.
         except KeyboardInterrupt:
             self.axon.stop()
+            self.offloader.shutdown(wait=False)
             bt.logging.success("Miner killed by keyboard interrupt.")
             exit()
 
@@ -186,7 +260,16 @@ class BaseMinerNeuron(BaseNeuron):
             traceback: A traceback object encoding the stack trace.
                        None if the context was exited without an exception.
         """
+        self.close()
+
+    def close(self):
+        """
+        Stops the miner's background operations and releases its threads, including the offload pool. The miner
+        cannot be run again afterwards.
+        """
         self.stop_run_thread()
+        self.offloader.shutdown(wait=False)
+        super().close()
 
     def resync_metagraph(self):
         """Resyncs the metagraph and updates the hotkeys and moving averages based on the new metagraph."""
@@ -194,3 +277,150 @@ class BaseMinerNeuron(BaseNeuron):
 
         # Sync the metagraph.
         self.metagraph.sync(subtensor=self.subtensor)
+
+        # Keep a snapshot of the metagraph for the next warm start.
+        self.save_metagraph_snapshot()
+
+        self.index_metagraph()
+
+    def index_metagraph(self):
+        """
+        Builds the per-request view of the metagraph: a dict from hotkey to uid, and the validator permit and stake
+        of every uid as arrays, so requests are handled in constant time instead of scanning `metagraph.hotkeys`.
+
+        It also precomputes the admission decision of every hotkey from the blacklist config, see `AdmissionTable`,
+        so the blacklist and priority of a request are a single lookup in `self.admission`.
+
+        The axon reads this view from its own thread. The arrays are replaced before the dict, so a request always
+        looks up a uid within the arrays it reads.
+        """
+        self.admission: AdmissionTable = AdmissionTable.build(
+            self.metagraph.hotkeys,
+            self.metagraph.validator_permit,
+            self.metagraph.S,
+            force_validator_permit=self.config.blacklist.force_validator_permit,
+            allow_non_registered=self.config.blacklist.allow_non_registered,
+            minimum_stake=self.config.blacklist.minimum_stake,
+        )
+        self.validator_permits: np.ndarray = np.array(
+            self.metagraph.validator_permit, dtype=bool
+        )
+        self.stakes: np.ndarray = np.array(self.metagraph.S, dtype=np.float64)
+        self.hotkey_to_uid: Dict[str, int] = {
+            hotkey: uid for uid, hotkey in enumerate(self.metagraph.hotkeys)
+        }
+        self.rate_limiter.set_stakes(self.metagraph.hotkeys, self.stakes)
+
+    async def offload(
+        self, fn: Callable, *args, synapse: Optional[bt.Synapse] = None
+    ) -> Any:
+        """
+        Runs blocking work from a forward on the pool selected with `--neuron.offload`, so it does not stall the
+        axon event loop, which also handles the blacklist and priority of every other request.
+
+        In process mode the work can use every core, but `fn` must be defined at module level and `args` must be
+        picklable, so pass the fields of the synapse rather than the synapse itself. See `Offloader`.
+
+        Example:
+            >>> synapse.dummy_output = await self.offload(run_model, synapse.dummy_input, synapse=synapse)
+
+        Args:
+            fn (Callable): Function to run.
+            *args: Arguments of `fn`.
+            synapse (bt.Synapse): Request the work belongs to. The work is abandoned once `synapse.timeout` has
+                elapsed, since the caller stopped waiting for the response.
+        Returns:
+            The result of `fn(*args)`.
+        Raises:
+            asyncio.QueueFull: If too many offloaded tasks are pending.
+            asyncio.TimeoutError: If the work did not finish within `synapse.timeout`.
+        """
+        timeout = synapse.timeout if synapse is not None else None
+        return await self.offloader.run(fn, *args, timeout=timeout)
+
+    async def forward_batch(
+        self, synapses: List[bt.Synapse]
+    ) -> List[bt.Synapse]:
+        """
+        Handles a batch of requests when batching is enabled with `--neuron.max_batch_size`, returning one synapse
+        per request in the same order.
+
+        Override it to process the batch at once, e.g. with a single model inference over all the inputs, which is
+        where batching pays off. By default, each request is handled by `forward` concurrently.
+
+        Args:
+            synapses (List[bt.Synapse]): Requests received concurrently, up to `--neuron.max_batch_size`.
+        Returns:
+            List[bt.Synapse]: The responses, or None if the synapses were updated in place.
+        """
+        return list(
+            await asyncio.gather(
+                *(self.forward(synapse) for synapse in synapses)
+            )
+        )
+
+    def batch_forward(
+        self, forward_fn: Callable[[bt.Synapse], Awaitable[bt.Synapse]]
+    ) -> Callable[[bt.Synapse], Awaitable[bt.Synapse]]:
+        """
+        Replaces the forward attached to the axon, keeping its signature, so requests are queued in `self.batcher`
+        and handled by `forward_batch` together with the requests received at the same time.
+        """
+
+        @functools.wraps(forward_fn)
+        async def forward(synapse: bt.Synapse) -> bt.Synapse:
+            return await self.batcher.submit(synapse)
+
+        return forward
+
+    def limit_blacklist(
+        self, blacklist_fn: Callable[[bt.Synapse], Tuple[bool, str]]
+    ) -> Callable[[bt.Synapse], Awaitable[Tuple[bool, str]]]:
+        """
+        Wraps the blacklist attached to the axon, so requests it lets through are also rejected when their caller
+        exceeds its rate limit or too many requests are in flight, before their body is deserialized.
+
+        Note:
+            The axon rejects blacklisted requests with a 403 status, including rate limited ones.
+        """
+
+        @functools.wraps(blacklist_fn)
+        async def blacklist(synapse: bt.Synapse) -> Tuple[bool, str]:
+            result = blacklist_fn(synapse)
+            if inspect.isawaitable(result):
+                result = await result
+            if result[0]:
+                return result
+            limited = self.rate_limiter.check(synapse.dendrite.hotkey)
+            if limited[0]:
+                bt.logging.trace(
+                    f"Rate limiting hotkey {synapse.dendrite.hotkey}: {limited[1]}"
+                )
+                return limited
+            return result
+
+        return blacklist
+
+    def limit_forward(
+        self, forward_fn: Callable[[bt.Synapse], Awaitable[bt.Synapse]]
+    ) -> Callable[[bt.Synapse], Awaitable[bt.Synapse]]:
+        """
+        Wraps the forward attached to the axon, so each verified request takes a token from its caller's rate limit
+        and counts as in flight while it is handled.
+        """
+
+        @functools.wraps(forward_fn)
+        async def forward(synapse: bt.Synapse) -> bt.Synapse:
+            self.rate_limiter.acquire(synapse.dendrite.hotkey)
+            try:
+                return await forward_fn(synapse)
+            finally:
+                self.rate_limiter.release()
+
+        return forward
+
+    def caller_uid(self, synapse: bt.Synapse) -> Optional[int]:
+        """Returns the uid of the hotkey that sent `synapse`, or None if it is missing or not registered."""
+        if synapse.dendrite is None or synapse.dendrite.hotkey is None:
+            return None
+        return self.hotkey_to_uid.get(synapse.dendrite.hotkey)
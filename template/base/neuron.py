@@ -16,6 +16,7 @@
 # DEALINGS IN THE SOFTWARE.
 
 import copy
+import time
 import typing
 
 import bittensor as bt
@@ -23,8 +24,15 @@ import bittensor as bt
 from abc import ABC, abstractmethod
 
 # Sync calls set weights and also resyncs the metagraph.
-from template.utils.config import check_config, add_args, config
-from template.utils.misc import ttl_get_block
+from template.utils.config import (
+    check_config,
+    add_args,
+    config,
+    resolve_device,
+)
+from template.base.utils.block_clock import BlockClock
+from template.base.utils.chain import ChainExecutor
+from template.base.utils.snapshot import load_metagraph, save_metagraph
 from template import __spec_version__ as spec_version
 from template.mock import MockSubtensor, MockMetagraph
 
@@ -56,10 +64,30 @@ class BaseNeuron(ABC):
     spec_version: int = spec_version
 
     @property
-    def block(self):
-        return ttl_get_block(self)
+    def block(self) -> int:
+        """Current block, read from the in-memory block clock once the neuron is running."""
+        return self.block_clock.current_block
+
+    _device: typing.Optional[str] = None
+
+    @property
+    def device(self) -> str:
+        """
+        Device to run on, e.g. cpu or cuda:0. Resolved from `neuron.device` on first use, so GPU detection only
+        happens for neurons that need a device.
+        """
+        if self._device is None:
+            self._device = resolve_device(self.config.neuron.device)
+        return self._device
+
+    @device.setter
+    def device(self, device: str):
+        self._device = device
 
     def __init__(self, config=None):
+        # Start of the neuron, used to report the startup time.
+        self.start_time = time.perf_counter()
+
         base_config = copy.deepcopy(config or BaseNeuron.config())
         self.config = self.config()
         self.config.merge(base_config)
@@ -68,9 +96,6 @@ class BaseNeuron(ABC):
         # Set up logging with the provided configuration.
         bt.logging.set_config(config=self.config.logging)
 
-        # If a gpu is required, set the device to cuda:N (e.g. cuda:0)
-        self.device = self.config.neuron.device
-
         # Log the configuration for reference.
         bt.logging.info(self.config)
 
@@ -84,20 +109,43 @@ class BaseNeuron(ABC):
             self.subtensor = MockSubtensor(
                 self.config.netuid, wallet=self.wallet
             )
-            self.metagraph = MockMetagraph(
-                self.config.netuid, subtensor=self.subtensor
-            )
         else:
             self.wallet = bt.wallet(config=self.config)
             self.subtensor = bt.subtensor(config=self.config)
-            self.metagraph = self.subtensor.metagraph(self.config.netuid)
+
+        # On warm start the metagraph is restored from the last local snapshot instead of being fetched from the
+        # chain, and the neuron reconciles with the chain once running.
+        self.warm_started = (
+            self.config.neuron.warm_start and self.load_metagraph_snapshot()
+        )
+        if not self.warm_started:
+            if self.config.mock:
+                self.metagraph = MockMetagraph(
+                    self.config.netuid, subtensor=self.subtensor
+                )
+            else:
+                self.metagraph = self.subtensor.metagraph(self.config.netuid)
 
         bt.logging.info(f"Wallet: {self.wallet}")
         bt.logging.info(f"Subtensor: {self.subtensor}")
         bt.logging.info(f"Metagraph: {self.metagraph}")
 
+        # Blocking chain calls made from async code run here, off the event loop.
+        self.chain = ChainExecutor(
+            max_workers=self.config.neuron.chain_workers,
+            timeout=self.config.neuron.chain_timeout,
+        )
+
+        # Tracks the current block in the background once started, polling through the chain executor.
+        self.block_clock = BlockClock(
+            lambda: self.chain.run_sync(self.subtensor.get_current_block),
+            interval=self.config.neuron.block_poll_interval,
+        )
+
         # Check if the miner is registered on the Bittensor network before proceeding further.
-        self.check_registered()
+        # A warm started neuron was registered in its snapshot, and checks again when reconciling.
+        if not self.warm_started:
+            self.check_registered()
 
         # Each miner gets a unique identity (UID) in the network for differentiation.
         self.uid = self.metagraph.hotkeys.index(
@@ -112,6 +160,14 @@ class BaseNeuron(ABC):
     async def forward(self, synapse: bt.Synapse) -> bt.Synapse:
         ...
 
+    def close(self):
+        """
+        Releases the block clock and chain executor threads once the neuron is no longer used. Stopping the run
+        thread keeps them, so the neuron can be started again, but it cannot be run after `close`.
+        """
+        self.block_clock.stop()
+        self.chain.shutdown()
+
     @abstractmethod
     def run(self):
         ...
@@ -129,7 +185,7 @@ class BaseNeuron(ABC):
         if self.should_set_weights():
             self.set_weights()
 
-        # Always save state.
+        # Save state, neurons throttle their checkpoints in save_state.
         self.save_state()
 
     def check_registered(self):
@@ -168,6 +224,41 @@ class BaseNeuron(ABC):
             and self.neuron_type != "MinerNeuron"
         )  # don't set weights if you're a miner
 
+    @property
+    def metagraph_snapshot_dir(self) -> str:
+        return self.config.neuron.full_path + "/metagraph"
+
+    def load_metagraph_snapshot(self) -> bool:
+        """
+        Restores `self.metagraph` from the local snapshot without any chain call. Returns False, leaving the
+        metagraph unset, if there is no usable snapshot or the wallet hotkey is not registered in it.
+        """
+        metagraph = bt.metagraph(
+            self.config.netuid, network=self.subtensor.network, sync=False
+        )
+        if not load_metagraph(metagraph, self.metagraph_snapshot_dir):
+            bt.logging.info("No metagraph snapshot found, syncing from chain.")
+            return False
+        if self.wallet.hotkey.ss58_address not in metagraph.hotkeys:
+            bt.logging.info(
+                "Hotkey not registered in the metagraph snapshot, syncing from chain."
+            )
+            return False
+        self.metagraph = metagraph
+        bt.logging.info(
+            f"Warm start from metagraph snapshot at block {int(metagraph.block)}."
+        )
+        return True
+
+    def save_metagraph_snapshot(self):
+        """Saves the metagraph for the next warm start."""
+        try:
+            save_metagraph(self.metagraph, self.metagraph_snapshot_dir)
+        except Exception as err:
+            bt.logging.warning(
+                f"Failed to save metagraph snapshot: {str(err)}"
+            )
+
     def save_state(self):
         bt.logging.trace(
             "save_state() not implemented for this neuron. You can implement this function to save model checkpoints or other useful data."
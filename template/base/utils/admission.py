@@ -0,0 +1,92 @@
+from typing import Dict, NamedTuple, Sequence
+
+import numpy as np
+
+
+class Admission(NamedTuple):
+    """Decision for requests from a hotkey: whether they are allowed, why, and their priority."""
+
+    allowed: bool
+    reason: str
+    priority: float
+
+
+class AdmissionTable:
+    """
+    Precomputed admission decisions of a miner, one per registered hotkey plus one for every other hotkey.
+
+    The decisions only depend on the metagraph and the blacklist config, so they are computed once per metagraph
+    resync and the blacklist and priority of every request are a single dict lookup.
+
+    Args:
+        entries (Dict[str, Admission]): Decision of every registered hotkey.
+        default (Admission): Decision of the hotkeys that are not registered.
+    """
+
+    def __init__(self, entries: Dict[str, Admission], default: Admission):
+        self.entries = entries
+        self.default = default
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(self, hotkey: str) -> Admission:
+        """Returns the decision for requests sent by `hotkey`."""
+        return self.entries.get(hotkey, self.default)
+
+    @classmethod
+    def build(
+        cls,
+        hotkeys: Sequence[str],
+        validator_permit: np.ndarray,
+        stake: np.ndarray,
+        force_validator_permit: bool = False,
+        allow_non_registered: bool = False,
+        minimum_stake: float = 0.0,
+    ) -> "AdmissionTable":
+        """
+        Computes the admission decision of every hotkey.
+
+        A registered hotkey is denied if `force_validator_permit` is set and it has no validator permit, or if its
+        stake is below `minimum_stake`. Hotkeys that are not registered are denied unless `allow_non_registered` is
+        set, and otherwise treated as having no permit and no stake. The priority of a hotkey is its stake.
+
+        Args:
+            hotkeys (Sequence[str]): Hotkey of every uid, e.g. `metagraph.hotkeys`.
+            validator_permit (np.ndarray): Validator permit of every uid.
+            stake (np.ndarray): Stake of every uid.
+            force_validator_permit (bool): Deny hotkeys without a validator permit. Defaults to False.
+            allow_non_registered (bool): Allow hotkeys that are not registered. Defaults to False.
+            minimum_stake (float): Deny hotkeys with less stake. Defaults to 0.
+        Returns:
+            AdmissionTable: The decisions.
+        """
+        validator_permit = np.asarray(validator_permit, dtype=bool)
+        stake = np.asarray(stake, dtype=np.float64)
+
+        allowed = np.ones(len(hotkeys), dtype=bool)
+        reasons = np.full(len(hotkeys), "Hotkey recognized!", dtype=object)
+        if minimum_stake > 0:
+            insufficient = stake < minimum_stake
+            allowed &= ~insufficient
+            reasons[insufficient] = "Insufficient stake"
+        if force_validator_permit:
+            allowed &= validator_permit
+            reasons[~validator_permit] = "Non-validator hotkey"
+
+        entries = {
+            hotkey: Admission(bool(allow), reason, float(priority))
+            for hotkey, allow, reason, priority in zip(
+                hotkeys, allowed, reasons, stake
+            )
+        }
+
+        if not allow_non_registered:
+            default = Admission(False, "Unrecognized hotkey", 0.0)
+        elif force_validator_permit:
+            default = Admission(False, "Non-validator hotkey", 0.0)
+        elif minimum_stake > 0:
+            default = Admission(False, "Insufficient stake", 0.0)
+        else:
+            default = Admission(True, "Non-registered hotkey allowed", 0.0)
+        return cls(entries, default)
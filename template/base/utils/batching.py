@@ -0,0 +1,101 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class MicroBatcher:
+    """
+    Groups concurrent calls into batches processed by a single call of `fn`.
+
+    Each `submit` queues an item and waits for its result. The queued items are passed to `fn` together once
+    `max_batch_size` of them are queued, or `max_delay` seconds after the first one was queued, whichever comes
+    first. `fn` returns one result per item, in order, and each caller receives its own. If `fn` raises, every
+    caller of the batch receives the exception.
+
+    Batches are processed concurrently with the following ones, so a slow batch does not stop new items from
+    being queued. The batcher must be used from a single event loop, e.g. the one of the axon.
+
+    Args:
+        fn (Callable[[List[Any]], Awaitable[Optional[List[Any]]]]): Processes a batch of items. It may return
+            None when it updates the items in place, in which case each caller receives its item.
+        max_batch_size (int): Maximum number of items per batch. Defaults to 16.
+        max_delay (float): Maximum seconds an item waits for the batch to fill up. Defaults to 0.01.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[List[Any]], Awaitable[Optional[List[Any]]]],
+        max_batch_size: int = 16,
+        max_delay: float = 0.01,
+    ):
+        self.fn = fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_delay = max_delay
+
+        self.batches: int = 0
+        self.items: int = 0
+        self.largest_batch: int = 0
+
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Queues `item` for the next batch and returns its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of batches and items processed, and the mean and largest batch size."""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches
+            if self.batches
+            else 0.0,
+            "largest_batch": self.largest_batch,
+            "pending": len(self._pending),
+        }
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+
+        # Keep a reference to the task until it is done, the event loop only keeps weak ones.
+        task = asyncio.ensure_future(self._process(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, batch: List[Tuple[Any, asyncio.Future]]):
+        items = [item for item, _ in batch]
+        try:
+            results = await self.fn(items)
+            if results is None:
+                results = items
+            if len(results) != len(items):
+                raise ValueError(
+                    f"Batch function returned {len(results)} results for {len(items)} items"
+                )
+        except Exception as err:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(err)
+            return
+
+        for (_, future), result in zip(batch, results):
+            # The caller may have stopped waiting, e.g. on a timeout.
+            if not future.done():
+                future.set_result(result)
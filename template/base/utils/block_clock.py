@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import bittensor as bt
+
+
+class BlockClock:
+    """
+    Keeps the current chain block in memory, refreshed by a background thread.
+
+    Reading `current_block` never touches the chain, and `wait_for_block` / `wait_for_block_sync` suspend the
+    caller until a given block is reached instead of polling the chain in a loop. The thread polls `fetch` once
+    per `interval` seconds, but after seeing a new block it sleeps until shortly before the next block is
+    expected, so the chain is only queried a few times per block.
+
+    Note:
+        The substrate connection of a subtensor is not thread safe. `fetch` should go through the same
+        `ChainExecutor` as every other chain call of the neuron once the clock is started.
+
+    Args:
+        fetch (Callable[[], int]): Returns the current block from the chain, e.g. `subtensor.get_current_block`.
+        interval (float): Seconds between polls while waiting for a new block. Defaults to 1.
+        block_time (float): Expected seconds between blocks. Defaults to 12.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], int],
+        interval: float = 1.0,
+        block_time: float = 12.0,
+    ):
+        self.fetch = fetch
+        self.interval = interval
+        self.block_time = block_time
+
+        self.polls: int = 0
+        self.failures: int = 0
+
+        self._block: Optional[int] = None
+        self._fetched_at: float = float("-inf")
+        self._condition = threading.Condition()
+        self._waiters: List[
+            Tuple[int, asyncio.AbstractEventLoop, asyncio.Future]
+        ] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def current_block(self) -> int:
+        """
+        The last observed block. While the polling thread is not running, the block is fetched synchronously
+        instead, at most once per `block_time`, so the clock can be used before the neuron starts and routes its
+        chain calls through one thread.
+        """
+        if self._block is None or (
+            not self.running
+            and time.monotonic() - self._fetched_at >= self.block_time
+        ):
+            self.refresh()
+        return self._block
+
+    def refresh(self) -> int:
+        """Fetches the current block from the chain and wakes the waiters it satisfies."""
+        self.polls += 1
+        self._publish(int(self.fetch()))
+        self._fetched_at = time.monotonic()
+        return self._block
+
+    def start(self) -> "BlockClock":
+        """Starts the polling thread, if not started yet."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._poll, name="block-clock", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the polling thread and wakes up every waiter."""
+        self._stop.set()
+        with self._condition:
+            self._condition.notify_all()
+            waiters, self._waiters = self._waiters, []
+        for _, loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future, False)
+
+    def wait_for_block_sync(
+        self, block: int, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Blocks until `block` is reached. Returns False if `timeout` elapsed or the clock was stopped first.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._reached(block) or self._stop.is_set(), timeout
+            ) and self._reached(block)
+
+    async def wait_for_block(
+        self, block: int, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Suspends the calling coroutine until `block` is reached. Returns False if `timeout` elapsed or the clock
+        was stopped first.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._condition:
+            if self._reached(block):
+                return True
+            if self._stop.is_set():
+                return False
+            self._waiters.append((block, loop, future))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._condition:
+                self._waiters = [
+                    waiter
+                    for waiter in self._waiters
+                    if waiter[2] is not future
+                ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the current block and the poll counters."""
+        return {
+            "block": self._block,
+            "polls": self.polls,
+            "failures": self.failures,
+        }
+
+    def _reached(self, block: int) -> bool:
+        return self._block is not None and self._block >= block
+
+    def _publish(self, block: int):
+        with self._condition:
+            if self._block is not None and block <= self._block:
+                return
+            self._block = block
+            self._condition.notify_all()
+            ready = [w for w in self._waiters if w[0] <= block]
+            self._waiters = [w for w in self._waiters if w[0] > block]
+        for _, loop, future in ready:
+            loop.call_soon_threadsafe(_resolve, future, True)
+
+    def _poll(self):
+        while not self._stop.is_set():
+            previous = self._block
+            try:
+                self.refresh()
+            except Exception as err:
+                self.failures += 1
+                bt.logging.warning(f"Failed to fetch current block: {err}")
+
+            delay = self.interval
+            if self._block != previous:
+                # Nothing to do until shortly before the next block is expected.
+                delay = max(self.interval, self.block_time - 2 * self.interval)
+            self._stop.wait(delay)
+
+
+def _resolve(future: asyncio.Future, result: bool):
+    if not future.done():
+        future.set_result(result)
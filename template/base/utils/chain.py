@@ -0,0 +1,150 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import bittensor as bt
+
+
+class ChainExecutor:
+    """
+    Runs blocking chain calls (subtensor RPCs, metagraph syncs, extrinsics) on a dedicated thread pool.
+
+    `run` returns an awaitable bounded by a timeout, so a slow or hung substrate endpoint only delays the
+    caller awaiting it and never freezes the event loop driving the dendrite queries. `run_sync` offers the
+    same pool and timeout to code running outside the event loop.
+
+    Once a neuron starts running, every chain call goes through its executor, including the polls of its
+    `BlockClock`, so the block can be polled in the background without sharing the connection across threads.
+
+    Note:
+        The substrate websocket connection held by a subtensor is not thread safe, so the pool defaults to a
+        single worker which serialises all chain calls. A call that times out keeps running in its worker
+        until the underlying RPC returns; only the caller stops waiting for it.
+
+    Args:
+        max_workers (int): Number of worker threads. Defaults to 1.
+        timeout (float): Default timeout in seconds applied to every call. Non-positive disables the timeout.
+    """
+
+    def __init__(self, max_workers: int = 1, timeout: float = 60.0):
+        self.timeout = timeout
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix="chain",
+            initializer=self._mark_worker,
+        )
+
+    def _mark_worker(self):
+        self._local.worker = True
+
+    def _timeout(self, timeout: Optional[float]) -> Optional[float]:
+        timeout = self.timeout if timeout is None else timeout
+        return timeout if timeout > 0 else None
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Runs `fn(*args, **kwargs)` on the chain thread pool and awaits its result.
+
+        Raises:
+            asyncio.TimeoutError: If the call does not complete within the timeout.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._pool, functools.partial(fn, *args, **kwargs)
+        )
+        return await asyncio.wait_for(future, self._timeout(timeout))
+
+    def run_sync(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Runs `fn(*args, **kwargs)` on the chain thread pool and blocks until its result is available. Called from a
+        chain worker, e.g. by a function already running through `run`, `fn` runs directly to avoid a deadlock.
+
+        Raises:
+            concurrent.futures.TimeoutError: If the call does not complete within the timeout.
+        """
+        if getattr(self._local, "worker", False):
+            return fn(*args, **kwargs)
+        future = self._pool.submit(fn, *args, **kwargs)
+        return future.result(timeout=self._timeout(timeout))
+
+    def shutdown(self, wait: bool = False):
+        """Stops accepting new calls and releases the worker threads once their current call returns."""
+        self._pool.shutdown(wait=wait)
+
+
+class HyperparameterCache:
+    """
+    Block-aware cache of the subnet hyperparameters needed to process weights before setting them.
+
+    The hyperparameters are fetched from the chain on first use and again once `refresh_blocks` blocks have
+    elapsed since the last fetch, so setting weights becomes a local computation plus a single extrinsic.
+    Keys of the returned dictionary match the keyword arguments of `process_weights_for_netuid`.
+
+    Args:
+        subtensor (bt.subtensor): Subtensor to fetch the hyperparameters from.
+        netuid (int): Subnet the hyperparameters belong to.
+        refresh_blocks (int): Number of blocks after which cached values are refreshed. Defaults to 100.
+    """
+
+    def __init__(
+        self,
+        subtensor: "bt.subtensor",
+        netuid: int,
+        refresh_blocks: int = 100,
+    ):
+        self.subtensor = subtensor
+        self.netuid = netuid
+        self.refresh_blocks = refresh_blocks
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.fetched_at: Optional[int] = None
+        self._values: Optional[Dict[str, Any]] = None
+
+    def get(self, block: int) -> Dict[str, Any]:
+        """Returns the hyperparameters, fetching them from the chain if the cached values are stale at `block`."""
+        if (
+            self._values is None
+            or block < self.fetched_at
+            or block - self.fetched_at >= self.refresh_blocks
+        ):
+            self.misses += 1
+            self._values = {
+                "min_allowed_weights": self.subtensor.min_allowed_weights(
+                    netuid=self.netuid
+                ),
+                "max_weight_limit": self.subtensor.max_weight_limit(
+                    netuid=self.netuid
+                ),
+            }
+            self.fetched_at = block
+        else:
+            self.hits += 1
+        return self._values
+
+    def invalidate(self):
+        """Forces the next `get` to fetch the hyperparameters from the chain."""
+        self._values = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the cache hit and miss counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "fetched_at": self.fetched_at,
+        }
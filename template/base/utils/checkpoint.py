@@ -0,0 +1,158 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import bittensor as bt
+import numpy as np
+
+
+class CheckpointManager:
+    """
+    Writes npz checkpoints atomically from a background thread.
+
+    `save` only snapshots the arrays and hands them to a writer thread, so the caller never waits on disk I/O.
+    The writer saves to a temporary file next to the checkpoint, fsyncs it and renames it over the checkpoint, so
+    a crash mid-write leaves the previous checkpoint intact. If saves arrive faster than they are written, only
+    the latest pending one is written.
+
+    Saves are throttled: one is written once `interval` seconds or `steps` steps have elapsed since the last
+    write, whichever comes first, and only if the arrays changed since the last write. The clock starts when the
+    manager is created, so a neuron can load its previous checkpoint before the first write replaces it.
+
+    Args:
+        path (str): Path of the checkpoint file.
+        interval (float): Minimum seconds between writes. Defaults to 60.
+        steps (int): Number of steps after which a write is due regardless of `interval`. 0 disables it.
+    """
+
+    def __init__(self, path: str, interval: float = 60.0, steps: int = 0):
+        self.path = path
+        self.interval = interval
+        self.steps = steps
+
+        self.writes: int = 0
+        self.skipped: int = 0
+        self.failures: int = 0
+        self.last_duration: float = 0.0
+
+        self._last_time = time.monotonic()
+        self._last_step = 0
+        self._last_digest: Optional[bytes] = None
+
+        self._condition = threading.Condition()
+        self._pending: Optional[Dict[str, Any]] = None
+        self._writing = False
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._writer, name="checkpoint", daemon=True
+        )
+        self._thread.start()
+
+    def due(self, step: int) -> bool:
+        """Returns whether a save at `step` would pass the throttle."""
+        if time.monotonic() - self._last_time >= self.interval:
+            return True
+        return self.steps > 0 and step - self._last_step >= self.steps
+
+    def save(self, step: int, force: bool = False, **arrays) -> bool:
+        """
+        Schedules a checkpoint of `arrays` at `step` if it is due and the arrays changed since the last write.
+
+        Args:
+            step (int): Current step, saved alongside the arrays.
+            force (bool): Bypasses the throttle, unchanged arrays are still skipped. Defaults to False.
+            **arrays: Arrays to save, copied before this method returns.
+        Returns:
+            bool: True if a write was scheduled.
+        """
+        if not force and not self.due(step):
+            return False
+
+        arrays = {key: np.array(value) for key, value in arrays.items()}
+        digest = hashlib.blake2b(digest_size=16)
+        for key in sorted(arrays):
+            digest.update(key.encode())
+            digest.update(str(arrays[key].dtype).encode())
+            digest.update(arrays[key].tobytes())
+        digest = digest.digest()
+
+        self._last_time = time.monotonic()
+        self._last_step = step
+        if digest == self._last_digest:
+            self.skipped += 1
+            return False
+        self._last_digest = digest
+
+        with self._condition:
+            self._pending = dict(arrays, step=step)
+            self._condition.notify_all()
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until scheduled checkpoints are written. Returns False if `timeout` elapsed first."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._pending is None and not self._writing, timeout
+            )
+
+    def close(self, timeout: Optional[float] = None):
+        """Writes the pending checkpoint, if any, and stops the writer thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the write, skip and failure counters and the duration of the last write."""
+        return {
+            "writes": self.writes,
+            "skipped": self.skipped,
+            "failures": self.failures,
+            "last_duration": self.last_duration,
+        }
+
+    def _writer(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._pending is not None or self._closed
+                )
+                if self._pending is None:
+                    return
+                arrays, self._pending = self._pending, None
+                self._writing = True
+
+            start = time.perf_counter()
+            try:
+                self._write(arrays)
+                self.writes += 1
+            except Exception as err:
+                self.failures += 1
+                # Forget the digest so the same state is retried on the next save.
+                self._last_digest = None
+                bt.logging.error(f"Failed to write checkpoint: {str(err)}")
+            self.last_duration = time.perf_counter() - start
+
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def _write(self, arrays: Dict[str, Any]):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        # Persist the rename itself.
+        if hasattr(os, "O_DIRECTORY"):
+            fd = os.open(
+                os.path.dirname(os.path.abspath(self.path)), os.O_DIRECTORY
+            )
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
@@ -0,0 +1,211 @@
+import json
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+import bittensor as bt
+import numpy as np
+
+# Dtype of the index file stored next to every history log, one entry per row.
+INDEX_DTYPE = np.dtype([("step", "<i8"), ("time", "<f8")])
+
+
+class HistoryLog:
+    """
+    Append-only on-disk log of fixed-width float32 rows indexed by uid, readable as a memory map.
+
+    Rows are appended to `<path>.f32` with a single write each, and the step and wall time of every row to
+    `<path>.index`. A row is `width` float32 values where column `uid` holds the value of that uid, NaN when
+    unknown. Because rows have a fixed width, the log can be opened offline with `np.memmap` and sliced by step
+    or uid without loading it into memory, see `load_history`.
+
+    The log is opened for appending on creation. A partially written last row, left by a crash, is truncated when
+    the log is reopened.
+
+    Args:
+        path (str): Path of the log, without extension.
+        width (int): Number of uids per row.
+    """
+
+    def __init__(self, path: str, width: int):
+        self.path = path
+        self.width = width
+        self._row_bytes = width * np.dtype(np.float32).itemsize
+        self._row = np.empty(width, dtype=np.float32)
+        self._values = None
+        self._index = None
+        self.open()
+
+    @property
+    def closed(self) -> bool:
+        return self._values is None or self._values.closed
+
+    def open(self):
+        """Opens the log for appending, unless it is open already."""
+        if not self.closed:
+            return
+        rows = min(
+            _whole_rows(self.path + ".f32", self._row_bytes),
+            _whole_rows(self.path + ".index", INDEX_DTYPE.itemsize),
+        )
+        _truncate(self.path + ".f32", rows * self._row_bytes)
+        _truncate(self.path + ".index", rows * INDEX_DTYPE.itemsize)
+        self.rows = rows
+
+        self._values = open(self.path + ".f32", "ab")
+        self._index = open(self.path + ".index", "ab")
+
+    def append(self, values: np.ndarray, step: int):
+        """Appends a row holding `values` for uids 0 to len(values), NaN for the other uids."""
+        n = min(len(values), self.width)
+        self._row[:n] = values[:n]
+        self._row[n:] = np.nan
+        self._write(step)
+
+    def append_sparse(self, uids: np.ndarray, values: np.ndarray, step: int):
+        """Appends a row holding `values` at `uids`, NaN for the other uids."""
+        uids = np.asarray(uids)
+        keep = uids < self.width
+        self._row[:] = np.nan
+        self._row[uids[keep]] = np.asarray(values)[keep]
+        self._write(step)
+
+    def _write(self, step: int):
+        self._values.write(self._row.tobytes())
+        self._index.write(
+            np.array((step, time.time()), dtype=INDEX_DTYPE).tobytes()
+        )
+        self.rows += 1
+
+    def flush(self):
+        """Flushes the appended rows to the operating system."""
+        if not self.closed:
+            self._values.flush()
+            self._index.flush()
+
+    def close(self):
+        if not self.closed:
+            self._values.close()
+            self._index.close()
+
+    def read(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the index and rows written so far as read-only memory maps, see `load_log`."""
+        self.flush()
+        return load_log(self.path, self.width)
+
+
+class ScoreHistory:
+    """
+    Persists the full scoring history of a validator under `directory`: one `rewards` row per forward, holding the
+    rewards of the queried uids, and one `scores` row per score flush, holding the moving average scores.
+
+    Args:
+        directory (str): Directory of the history, created if missing.
+        width (int): Number of uids per row, typically `neuron.max_uids`. Uids beyond it are not recorded.
+    """
+
+    def __init__(self, directory: str, width: int):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.width = _check_metadata(directory, width)
+
+        self.rewards = HistoryLog(os.path.join(directory, "rewards"), width)
+        self.scores = HistoryLog(os.path.join(directory, "scores"), width)
+
+    @property
+    def closed(self) -> bool:
+        return self.rewards.closed or self.scores.closed
+
+    def open(self):
+        """Reopens the logs for appending after `close`."""
+        self.rewards.open()
+        self.scores.open()
+
+    def flush(self):
+        self.rewards.flush()
+        self.scores.flush()
+
+    def close(self):
+        self.rewards.close()
+        self.scores.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of rows in each log."""
+        return {"rewards": self.rewards.rows, "scores": self.scores.rows}
+
+
+def load_log(path: str, width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Opens a history log as read-only memory maps.
+
+    Args:
+        path (str): Path of the log, without extension.
+        width (int): Number of uids per row.
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The index, a structured array with fields `step` and `time` of shape [rows],
+            and the values of shape [rows, width].
+    """
+    row_bytes = width * np.dtype(np.float32).itemsize
+    rows = min(
+        _whole_rows(path + ".f32", row_bytes),
+        _whole_rows(path + ".index", INDEX_DTYPE.itemsize),
+    )
+    if rows == 0:
+        return np.zeros(0, dtype=INDEX_DTYPE), np.zeros(
+            (0, width), dtype=np.float32
+        )
+    index = np.memmap(path + ".index", dtype=INDEX_DTYPE, mode="r")[:rows]
+    values = np.memmap(
+        path + ".f32", dtype=np.float32, mode="r", shape=(rows, width)
+    )
+    return index, values
+
+
+def load_history(directory: str) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Opens the history written by `ScoreHistory` in `directory` for offline analysis, without loading it in memory.
+
+    Example:
+        >>> history = load_history("~/.bittensor/miners/default/default/netuid1/validator/history")
+        >>> index, scores = history["scores"]
+        >>> scores[-1000:, 42]  # Last 1000 scores of uid 42.
+
+    Returns:
+        Dict[str, Tuple[np.ndarray, np.ndarray]]: The index and values of the `rewards` and `scores` logs.
+    """
+    directory = os.path.expanduser(directory)
+    width = _check_metadata(directory)
+    return {
+        name: load_log(os.path.join(directory, name), width)
+        for name in ("rewards", "scores")
+    }
+
+
+def _check_metadata(directory: str, width: Optional[int] = None) -> int:
+    # Records the row width on creation and checks it matches when reopening.
+    path = os.path.join(directory, "metadata.json")
+    if os.path.exists(path):
+        with open(path) as f:
+            stored = json.load(f)["width"]
+        if width is not None and stored != width:
+            raise ValueError(
+                f"History in {directory} has rows of {stored} uids, not {width}. Move it away to start a new history."
+            )
+        return stored
+    if width is None:
+        raise FileNotFoundError(f"No history found in {directory}")
+    with open(path, "w") as f:
+        json.dump({"width": width, "dtype": "float32"}, f)
+    bt.logging.info(f"Recording score history in {directory}")
+    return width
+
+
+def _whole_rows(path: str, row_bytes: int) -> int:
+    if not os.path.exists(path):
+        return 0
+    return os.path.getsize(path) // row_bytes
+
+
+def _truncate(path: str, size: int):
+    if os.path.exists(path) and os.path.getsize(path) != size:
+        os.truncate(path, size)
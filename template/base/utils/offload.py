@@ -0,0 +1,130 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, Callable, Dict, Optional
+
+
+class Offloader:
+    """
+    Runs blocking work outside of the event loop, so a CPU heavy forward does not stall the other requests.
+
+    With `mode="process"`, work runs in a pool of processes and can use every core. The function and its arguments
+    are pickled to the worker, so the function must be defined at module level and the arguments should be plain
+    payloads, e.g. the fields of a synapse rather than the synapse itself. Workers are spawned rather than forked,
+    as forking a process running the axon threads is unsafe. With `mode="thread"`, work runs in a thread pool,
+    which only runs in parallel for code releasing the GIL, e.g. numpy or torch, but avoids pickling. With
+    `mode="none"`, work runs inline in the event loop.
+
+    At most `max_workers + queue_size` tasks are accepted at once, further ones are rejected with
+    `asyncio.QueueFull` instead of piling up. A task that times out is dropped if it has not started yet, otherwise
+    it keeps its worker until it finishes and only the caller stops waiting for it.
+
+    Args:
+        mode (str): One of "none", "thread" or "process". Defaults to "none".
+        max_workers (int): Number of workers. Non-positive uses the number of CPUs. Defaults to 0.
+        queue_size (int): Number of tasks that may wait for a free worker. Defaults to 32.
+    """
+
+    def __init__(
+        self, mode: str = "none", max_workers: int = 0, queue_size: int = 32
+    ):
+        if mode not in ("none", "thread", "process"):
+            raise ValueError(
+                f"Unknown offload mode {mode}, expected none, thread or process"
+            )
+        self.mode = mode
+        self.max_workers = max_workers if max_workers > 0 else os.cpu_count()
+        self.queue_size = max(0, queue_size)
+
+        self.completed: int = 0
+        self.failed: int = 0
+        self.rejected: int = 0
+        self.timeouts: int = 0
+        self.pending: int = 0
+
+        self._lock = threading.Lock()
+        self._executor: Optional[Executor] = None
+        if mode == "thread":
+            self._executor = ThreadPoolExecutor(
+                self.max_workers, thread_name_prefix="offload"
+            )
+        elif mode == "process":
+            self._executor = ProcessPoolExecutor(
+                self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    async def run(
+        self, fn: Callable, *args, timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Runs `fn(*args)` on the pool and returns its result.
+
+        Args:
+            fn (Callable): Function to run, defined at module level in process mode.
+            *args: Arguments of `fn`, picklable in process mode.
+            timeout (float): Seconds to wait for the result. None or non-positive waits indefinitely.
+        Raises:
+            asyncio.QueueFull: If too many tasks are pending.
+            asyncio.TimeoutError: If the result is not available within `timeout`.
+        """
+        if self._executor is None:
+            result = fn(*args)
+            self.completed += 1
+            return result
+
+        with self._lock:
+            if self.pending >= self.max_workers + self.queue_size:
+                self.rejected += 1
+                raise asyncio.QueueFull(
+                    f"{self.pending} offloaded tasks are already pending"
+                )
+            self.pending += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            with self._lock:
+                self.pending -= 1
+            raise
+        # The task leaves the pool when it finishes or is cancelled, not when the caller stops waiting.
+        future.add_done_callback(self._done)
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout if timeout is not None and timeout > 0 else None,
+            )
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise
+
+    def shutdown(self, wait: bool = True):
+        """Stops the workers, dropping the tasks that have not started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of pending, completed, failed, rejected and timed out tasks."""
+        return {
+            "mode": self.mode,
+            "pending": self.pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+        }
+
+    def _done(self, future):
+        with self._lock:
+            self.pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
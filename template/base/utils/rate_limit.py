@@ -0,0 +1,151 @@
+import threading
+import time
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class RateLimiter:
+    """
+    Token bucket rate limits per caller hotkey, scaled by stake, plus a cap on the requests handled concurrently.
+
+    Each registered caller refills its bucket at `rate` requests per second, up to `stake_scale` times that for
+    the caller with the most stake, linearly in between. A bucket holds up to `burst` seconds of requests. Callers
+    that are not registered share a single bucket refilled at `rate`, so memory is bounded by the metagraph size.
+
+    Requests go through two stages:
+
+    - `check`, called from the blacklist before the body is deserialized, rejects the request if its caller's
+      bucket is empty or `max_inflight` requests are being handled. It takes nothing from the bucket, because the
+      caller's hotkey is not verified yet, so spoofed requests cannot drain the budget of another hotkey.
+    - `acquire`, called once the request is verified and about to be forwarded, takes a token and counts the
+      request as in flight until `release`. Requests that passed `check` concurrently may overdraw the bucket,
+      which then rejects requests until the debt is repaid, so a caller never exceeds its rate in the long run.
+
+    Args:
+        rate (float): Requests per second of a caller without stake. Non-positive disables the rate limit.
+        stake_scale (float): Rate of the caller with the most stake, as a multiple of `rate`. Defaults to 10.
+        burst (float): Seconds of requests a bucket holds. Defaults to 1.
+        max_inflight (int): Maximum number of requests handled concurrently. Non-positive disables the cap.
+        timer (Callable[[], float]): Clock used to refill the buckets. Defaults to `time.monotonic`.
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        stake_scale: float = 10.0,
+        burst: float = 1.0,
+        max_inflight: int = 0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.stake_scale = stake_scale
+        self.burst = burst
+        self.max_inflight = max_inflight
+        self.timer = timer
+
+        self.inflight: int = 0
+
+        self._rates: Dict[str, float] = {}
+        # Tokens and last refill time of every caller, keyed by hotkey or None for non-registered callers.
+        self._buckets: Dict[Optional[str], list] = {}
+        # Admitted and rejected requests of every caller.
+        self._counts: Dict[Optional[str], list] = {}
+        self._lock = threading.Lock()
+
+    def set_stakes(self, hotkeys: Sequence[str], stakes: np.ndarray):
+        """
+        Sets the rate of every registered caller from its stake. Buckets of hotkeys that are no longer registered
+        are dropped, the others keep their tokens.
+
+        Args:
+            hotkeys (Sequence[str]): Hotkey of every uid, e.g. `metagraph.hotkeys`.
+            stakes (np.ndarray): Stake of every uid.
+        """
+        stakes = np.asarray(stakes, dtype=np.float64)
+        share = (
+            stakes / stakes.max()
+            if stakes.size and stakes.max() > 0
+            else stakes
+        )
+        rates = self.rate * (1 + (self.stake_scale - 1) * share)
+        rates = dict(zip(hotkeys, rates.tolist()))
+
+        with self._lock:
+            self._rates = rates
+            for table in (self._buckets, self._counts):
+                for caller in [c for c in table if c is not None]:
+                    if caller not in rates:
+                        del table[caller]
+
+    def check(self, hotkey: str) -> Tuple[bool, str]:
+        """
+        Returns whether a request from `hotkey` should be rejected, and why, without taking a token.
+
+        Returns:
+            Tuple[bool, str]: True and the reason if the request is rejected, in the format of a blacklist.
+        """
+        caller = hotkey if hotkey in self._rates else None
+        with self._lock:
+            if self.max_inflight > 0 and self.inflight >= self.max_inflight:
+                self._count(caller)[1] += 1
+                return True, "Too many requests in flight"
+            if self.rate > 0 and self._refill(caller) < 1:
+                self._count(caller)[1] += 1
+                return True, "Rate limit exceeded"
+        return False, "Within rate limit"
+
+    def acquire(self, hotkey: str):
+        """Takes a token from the bucket of `hotkey` and counts its request as in flight until `release`."""
+        caller = hotkey if hotkey in self._rates else None
+        with self._lock:
+            if self.rate > 0:
+                self._refill(caller)
+                self._buckets[caller][0] -= 1
+            self._count(caller)[0] += 1
+            self.inflight += 1
+
+    def release(self):
+        """Marks a request counted by `acquire` as handled."""
+        with self._lock:
+            self.inflight -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of requests in flight, admitted and rejected across all callers."""
+        with self._lock:
+            counts = list(self._counts.values())
+            return {
+                "inflight": self.inflight,
+                "admitted": sum(count[0] for count in counts),
+                "rejected": sum(count[1] for count in counts),
+                "callers": len(counts),
+            }
+
+    def caller_stats(self) -> Dict[Optional[str], Dict[str, int]]:
+        """Returns the number of admitted and rejected requests of every caller, None for non-registered ones."""
+        with self._lock:
+            return {
+                caller: {"admitted": count[0], "rejected": count[1]}
+                for caller, count in self._counts.items()
+            }
+
+    def _capacity(self, caller: Optional[str]) -> float:
+        return max(1.0, self._rates.get(caller, self.rate) * self.burst)
+
+    def _refill(self, caller: Optional[str]) -> float:
+        now = self.timer()
+        bucket = self._buckets.get(caller)
+        capacity = self._capacity(caller)
+        if bucket is None:
+            bucket = self._buckets[caller] = [capacity, now]
+        else:
+            rate = self._rates.get(caller, self.rate)
+            bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+        return bucket[0]
+
+    def _count(self, caller: Optional[str]) -> list:
+        count = self._counts.get(caller)
+        if count is None:
+            count = self._counts[caller] = [0, 0]
+        return count
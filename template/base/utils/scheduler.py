@@ -0,0 +1,111 @@
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class StepScheduler:
+    """
+    Paces validator forward passes without blocking the event loop.
+
+    Every forward is admitted through three asynchronous gates:
+        1. A query budget: if `target_qps` is positive, each forward reserves
+           `num_queries / target_qps` seconds of budget and sleeps until its reservation starts.
+        2. An in-flight cap: at most `max_inflight` forwards (dendrite batches) are awaited at once.
+        3. An inter-step delay: after a forward completes, the calling lane sleeps for `step_delay`
+           seconds before it may schedule the next one.
+
+    All waits are `asyncio.sleep` calls, so while one forward is waiting on the network or on its
+    pacing delay the others keep running. The scheduler also keeps counters describing how saturated
+    its in-flight slots are, see `stats`.
+
+    Args:
+        step_delay (float): Seconds a lane waits after each forward. Defaults to 0.
+        target_qps (float): Target miner queries per second across all lanes. Non-positive disables the limit.
+        max_inflight (int): Maximum number of concurrently awaited forwards. Defaults to 1.
+    """
+
+    def __init__(
+        self,
+        step_delay: float = 0.0,
+        target_qps: float = 0.0,
+        max_inflight: int = 1,
+    ):
+        self.step_delay = max(0.0, step_delay)
+        self.target_qps = target_qps
+        self.max_inflight = max(1, max_inflight)
+
+        self.inflight: int = 0
+        self.completed: int = 0
+        self.failed: int = 0
+        self.queries: int = 0
+        self.busy_time: float = 0.0
+        self.started_at: float = time.monotonic()
+        self._next_slot: float = 0.0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _slots(self) -> asyncio.Semaphore:
+        # Created lazily so the semaphore binds to the loop that actually runs the forwards.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_inflight)
+        return self._semaphore
+
+    async def throttle(self, num_queries: int = 1):
+        """Waits until the query budget allows `num_queries` more queries to be sent."""
+        if self.target_qps <= 0:
+            return
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_slot)
+        self._next_slot = start + num_queries / self.target_qps
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def run(
+        self,
+        forward: Callable[[], Awaitable[Any]],
+        num_queries: int = 1,
+    ) -> Any:
+        """
+        Runs a single forward under the scheduler's pacing rules.
+
+        Args:
+            forward (Callable[[], Awaitable]): Coroutine function performing one validator step.
+            num_queries (int): Number of miner queries the forward will send, used for the query budget.
+
+        Returns:
+            The result of `forward()`.
+        """
+        await self.throttle(num_queries)
+        async with self._slots():
+            self.inflight += 1
+            start = time.monotonic()
+            try:
+                result = await forward()
+                self.completed += 1
+                self.queries += num_queries
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                self.busy_time += time.monotonic() - start
+                self.inflight -= 1
+        if self.step_delay > 0:
+            await asyncio.sleep(self.step_delay)
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the scheduler counters.
+
+        `utilisation` is the fraction of available slot time (max_inflight * elapsed wall time) that was
+        spent awaiting forwards; a value close to 1 means the pipeline is saturated.
+        """
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "inflight": self.inflight,
+            "max_inflight": self.max_inflight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "queries": self.queries,
+            "queries_per_second": self.queries / elapsed,
+            "utilisation": self.busy_time / (self.max_inflight * elapsed),
+        }
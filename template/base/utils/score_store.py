@@ -0,0 +1,310 @@
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import bittensor as bt
+import numpy as np
+
+from template.base.utils.history import ScoreHistory
+from template.utils.uids import get_hotkey_fingerprint
+
+
+class ScoreStore:
+    """
+    Owns the per-uid score array of a validator with a fixed dtype.
+
+    Scores live in a buffer preallocated to `capacity` uids and `scores` is a view of its first `n` entries, so
+    the subnet growing or shrinking only moves `n` and zeroes the affected entries instead of reallocating and
+    copying the array. Entries beyond `n` are always zero, so a uid added back later starts from a zero score.
+
+    Moving average updates are applied in place. `update` decays every uid toward zero as the original update
+    did, while `update_sparse` only touches the sampled uids and optionally decays each of them by the number of
+    steps since it was last updated, so a miner is not penalised for not being sampled.
+
+    Args:
+        n (int): Initial number of uids.
+        capacity (int): Number of uids to preallocate. Raised to `n` if smaller. Defaults to 256.
+        dtype (np.dtype): Dtype of the scores. Defaults to float32.
+    """
+
+    def __init__(
+        self, n: int, capacity: int = 256, dtype: np.dtype = np.float32
+    ):
+        self.dtype = np.dtype(dtype)
+        self.n = int(n)
+        self._buffer = np.zeros(max(int(capacity), self.n), dtype=self.dtype)
+        # Step at which each uid was last updated by `update_sparse`, -1 if never.
+        self._last_update = np.full(self._buffer.size, -1, dtype=np.int64)
+
+    @property
+    def capacity(self) -> int:
+        return self._buffer.size
+
+    @property
+    def scores(self) -> np.ndarray:
+        """View of the scores of the current uids. Writes to the view update the store."""
+        return self._buffer[: self.n]
+
+    def __len__(self) -> int:
+        return self.n
+
+    def resize(self, n: int):
+        """
+        Resizes the scores to n uids. Scores of the remaining uids are kept, uids added start from zero and
+        scores of removed uids are cleared.
+        """
+        n = int(n)
+        if n > self.capacity:
+            bt.logging.warning(
+                f"Subnet grew to {n} uids, beyond the {self.capacity} preallocated scores. Reallocating."
+            )
+            buffer = np.zeros(max(n, 2 * self.capacity), dtype=self.dtype)
+            buffer[: self.n] = self.scores
+            last_update = np.full(buffer.size, -1, dtype=np.int64)
+            last_update[: self.n] = self._last_update[: self.n]
+            self._buffer = buffer
+            self._last_update = last_update
+        elif n < self.n:
+            self._buffer[n : self.n] = 0
+            self._last_update[n : self.n] = -1
+        self.n = n
+
+    def set(self, scores: np.ndarray):
+        """Replaces all scores, casting them to the store dtype and resizing to their length."""
+        scores = np.asarray(scores)
+        self.resize(scores.size)
+        self._buffer[: self.n] = scores
+
+    def reset(self, uids: np.ndarray):
+        """Zeroes the scores of `uids`."""
+        self._buffer[: self.n][uids] = 0
+        self._last_update[: self.n][uids] = -1
+
+    def update(self, uids: np.ndarray, rewards: np.ndarray, alpha: float):
+        """
+        Exponential moving average of all scores in place: `scores = alpha * scattered_rewards + (1 - alpha) *
+        scores`, where `scattered_rewards` is zero for uids not in `uids`. Costs O(n) but allocates only O(k).
+        """
+        scores = self.scores
+        scores *= 1 - alpha
+        scores[uids] += alpha * np.asarray(rewards, dtype=self.dtype)
+
+    def update_many(
+        self,
+        batches: Sequence[Tuple[np.ndarray, np.ndarray]],
+        alpha: float,
+    ):
+        """
+        Applies several dense `update`s in one vectorised pass. Since the dense moving average is linear, m
+        successive updates equal decaying all scores by `(1 - alpha) ** m` and adding each batch's rewards weighted
+        by `alpha * (1 - alpha) ** (m - 1 - j)`, j being the batch index. Uids are assumed distinct within a batch
+        but may repeat across batches.
+        """
+        m = len(batches)
+        if m == 0:
+            return
+        if m == 1:
+            self.update(*batches[0], alpha)
+            return
+        uids = np.concatenate([np.asarray(uids) for uids, _ in batches])
+        rewards = np.concatenate(
+            [
+                alpha
+                * (1 - alpha) ** (m - 1 - j)
+                * np.asarray(rewards, dtype=self.dtype)
+                for j, (_, rewards) in enumerate(batches)
+            ]
+        )
+        scores = self.scores
+        scores *= (1 - alpha) ** m
+        np.add.at(scores, uids, rewards)
+
+    def update_sparse(
+        self,
+        uids: np.ndarray,
+        rewards: np.ndarray,
+        alpha: float,
+        step: int = 0,
+        decay: float = 0.0,
+    ):
+        """
+        Exponential moving average of the scores of `uids` only, in place: `scores[uids] += alpha * (rewards -
+        scores[uids])`. Costs O(k) and leaves the scores of other uids untouched.
+
+        Args:
+            uids (np.ndarray): Uids to update.
+            rewards (np.ndarray): Rewards of `uids`.
+            alpha (float): Moving average factor.
+            step (int): Current validator step, used to compute the steps elapsed since each uid was last updated.
+            decay (float): Per-step decay applied to a score for every step since its last update before updating it.
+                0 disables the decay.
+        """
+        scores = self.scores
+        if decay > 0:
+            scores[uids] *= self.decay_factors(uids, step, decay)
+        self._last_update[uids] = step
+        rewards = np.asarray(rewards, dtype=self.dtype)
+        scores[uids] += alpha * (rewards - scores[uids])
+
+    def decay_factors(
+        self, uids: np.ndarray, step: int, decay: float
+    ) -> np.ndarray:
+        """Returns `(1 - decay) ** elapsed` for `uids`, elapsed being the steps since the uid's last sparse update."""
+        last_update = self._last_update[: self.n][uids]
+        elapsed = np.where(last_update < 0, 0, step - last_update)
+        return ((1 - decay) ** np.maximum(elapsed, 0)).astype(self.dtype)
+
+    def decayed(self, step: int, decay: float) -> np.ndarray:
+        """Returns the scores with the decay accumulated since each uid's last sparse update applied."""
+        if decay <= 0:
+            return self.scores
+        return self.scores * self.decay_factors(slice(None), step, decay)
+
+    def sync(self, hotkeys: List[str], new_hotkeys: List[str]) -> np.ndarray:
+        """
+        Updates the scores after a metagraph sync: zeroes the scores of uids whose hotkey was replaced and resizes
+        the scores to the new number of uids.
+
+        Args:
+            hotkeys (List[str]): Hotkeys the current scores belong to, indexed by uid.
+            new_hotkeys (List[str]): Hotkeys of the synced metagraph, indexed by uid.
+        Returns:
+            np.ndarray: The uids whose hotkey was replaced.
+        """
+        previous = get_hotkey_fingerprint(hotkeys)
+        current = get_hotkey_fingerprint(new_hotkeys)
+        common = min(previous.size, current.size, self.n)
+        replaced = np.flatnonzero(previous[:common] != current[:common])
+        self.reset(replaced)
+        self.resize(current.size)
+        return replaced
+
+
+class ScoreAccumulator:
+    """
+    Collects the rewards of concurrent forwards and applies them to a `ScoreStore` in a single flush.
+
+    Forwards only append their `(uids, rewards)` batch to a queue, which never blocks. `flush` drains the queue and
+    applies every pending batch under `lock`, the lock also taken by anything else reading or resizing the scores
+    (metagraph resync, setting weights, checkpoints), so no update is lost to a concurrent resize. Dense batches
+    are applied in one vectorised pass with `ScoreStore.update_many`, sparse batches in order. If a `history` is
+    given, every flush appends the rewards of each batch and the resulting scores to it while it is open.
+
+    Uids are only meaningful for the metagraph they were sampled from. Every batch is tagged with the `generation`
+    current when its forward started, and `advance` starts a new generation once a resync reassigned uids, so
+    batches of forwards in flight across the resync are dropped instead of crediting the new hotkeys or
+    indexing past a shrunk subnet. Uids beyond the current number of scores are dropped as well.
+
+    Args:
+        store (ScoreStore): Scores to update.
+        alpha (float): Moving average factor.
+        mode (str): "dense" or "sparse", see `ScoreStore.update` and `ScoreStore.update_sparse`. Defaults to "dense".
+        decay (float): Per-step decay of the sparse mode. Defaults to 0.
+        lock (threading.RLock): Lock guarding the scores. Defaults to a new reentrant lock.
+        history (ScoreHistory): Optional on-disk history the rewards and scores are recorded to.
+    """
+
+    def __init__(
+        self,
+        store: ScoreStore,
+        alpha: float,
+        mode: str = "dense",
+        decay: float = 0.0,
+        lock: Optional[threading.RLock] = None,
+        history: Optional[ScoreHistory] = None,
+    ):
+        self.store = store
+        self.history = history
+        self.alpha = alpha
+        self.mode = mode
+        self.decay = decay
+        self.lock = lock if lock is not None else threading.RLock()
+
+        self._pending: deque = deque()
+        self.generation: int = 0
+        self.flushes: int = 0
+        self.batches: int = 0
+        self.dropped: int = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(
+        self,
+        uids: np.ndarray,
+        rewards: np.ndarray,
+        step: int = 0,
+        generation: Optional[int] = None,
+    ):
+        """
+        Queues the rewards of `uids` obtained at `step`. Safe to call from any thread or coroutine.
+
+        Args:
+            uids (np.ndarray): Rewarded uids.
+            rewards (np.ndarray): Rewards of `uids`.
+            step (int): Step the rewards were obtained at.
+            generation (int): Generation the uids were sampled in. Defaults to the current one.
+        """
+        if generation is None:
+            generation = self.generation
+        self._pending.append((uids, rewards, step, generation))
+
+    def advance(self):
+        """
+        Applies the pending batches and starts a new generation, so batches sampled before are dropped. Called
+        under `lock` once the uids were reassigned.
+        """
+        with self.lock:
+            self.flush()
+            self.generation += 1
+
+    def flush(self) -> int:
+        """Applies all queued batches to the store. Returns the number of batches applied."""
+        with self.lock:
+            batches = []
+            while self._pending:
+                uids, rewards, step, generation = self._pending.popleft()
+                if generation != self.generation:
+                    self.dropped += 1
+                    continue
+                uids = np.asarray(uids)
+                valid = (uids >= 0) & (uids < self.store.n)
+                if not valid.all():
+                    uids = uids[valid]
+                    rewards = np.asarray(rewards)[valid]
+                batches.append((uids, rewards, step))
+            if not batches:
+                return 0
+
+            if self.mode == "sparse":
+                for uids, rewards, step in batches:
+                    self.store.update_sparse(
+                        uids, rewards, self.alpha, step=step, decay=self.decay
+                    )
+            else:
+                self.store.update_many(
+                    [(uids, rewards) for uids, rewards, _ in batches],
+                    self.alpha,
+                )
+
+            if self.history is not None and not self.history.closed:
+                for uids, rewards, step in batches:
+                    self.history.rewards.append_sparse(uids, rewards, step)
+                self.history.scores.append(
+                    self.store.scores, max(step for _, _, step in batches)
+                )
+                self.history.flush()
+
+            self.flushes += 1
+            self.batches += len(batches)
+            return len(batches)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of pending batches, of batches applied so far and of stale batches dropped."""
+        return {
+            "pending": len(self._pending),
+            "generation": self.generation,
+            "flushes": self.flushes,
+            "batches": self.batches,
+            "dropped": self.dropped,
+        }
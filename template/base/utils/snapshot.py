@@ -0,0 +1,63 @@
+import os
+import pickle
+
+import bittensor as bt
+
+
+def save_metagraph(metagraph: "bt.metagraph", directory: str) -> str:
+    """
+    Saves a snapshot of the metagraph to `directory`, in the format read by `bt.metagraph.load_from_path`.
+
+    Unlike `metagraph.save`, the snapshot is written atomically and replaces the previous one instead of adding a
+    file per block, so the directory always holds a single, complete snapshot.
+
+    Args:
+        metagraph (bt.metagraph): Metagraph to save.
+        directory (str): Directory of the snapshot, created if missing.
+    Returns:
+        str: Path of the snapshot file.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"block-{int(metagraph.block)}.pt")
+    state_dict = metagraph.state_dict()
+    state_dict["axons"] = metagraph.axons
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(state_dict, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    # Remove previous snapshots.
+    for filename in os.listdir(directory):
+        if filename.startswith("block-") and filename != os.path.basename(
+            path
+        ):
+            os.remove(os.path.join(directory, filename))
+    return path
+
+
+def load_metagraph(metagraph: "bt.metagraph", directory: str) -> bool:
+    """
+    Restores the metagraph from the snapshot saved by `save_metagraph` in `directory`, without any chain call.
+
+    Args:
+        metagraph (bt.metagraph): Metagraph to restore, typically created with `sync=False`.
+        directory (str): Directory of the snapshot.
+    Returns:
+        bool: True if a snapshot was loaded, False if there is none or it could not be read.
+    """
+    if not os.path.isdir(directory) or not any(
+        filename.startswith("block-") and filename.endswith(".pt")
+        for filename in os.listdir(directory)
+    ):
+        return False
+    try:
+        metagraph.load_from_path(directory)
+    except Exception as err:
+        bt.logging.warning(
+            f"Failed to load metagraph snapshot from {directory}: {str(err)}"
+        )
+        return False
+    return True
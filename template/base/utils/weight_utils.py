@@ -1,11 +1,16 @@
 import numpy as np
-from typing import Tuple, List, Union, Any
+from typing import Tuple, List, Union, Any, Optional
 import bittensor
 from numpy import ndarray, dtype, floating, complexfloating
 
+from template.utils.logging import is_debug_enabled
+
 U32_MAX = 4294967295
 U16_MAX = 65535
 
+# Number of weights normalize_max_weight_batch processes at once.
+_BATCH_BLOCK_SIZE = 1 << 16
+
 
 def normalize_max_weight(x: np.ndarray, limit: float = 0.1) -> np.ndarray:
     r"""Normalizes the numpy array x so that sum(x) = 1 and the max value is not greater than the limit.
@@ -35,9 +40,9 @@ def normalize_max_weight(x: np.ndarray, limit: float = 0.1) -> np.ndarray:
         cumsum = np.cumsum(estimation, 0)
 
         # Determine the index of cutoff
-        estimation_sum = np.array(
-            [(len(values) - i - 1) * estimation[i] for i in range(len(values))]
-        )
+        estimation_sum = (
+            len(values) - np.arange(len(values)) - 1
+        ) * estimation
         n_values = (
             estimation / (estimation_sum + cumsum + epsilon) < limit
         ).sum()
@@ -56,34 +61,106 @@ def normalize_max_weight(x: np.ndarray, limit: float = 0.1) -> np.ndarray:
         return y
 
 
+def normalize_max_weight_batch(
+    x: np.ndarray, limit: float = 0.1
+) -> np.ndarray:
+    r"""Row-wise normalize_max_weight: normalizes every row of the 2-D array x so that it sums to 1 and its max
+    value is not greater than the limit, vectorized across rows.
+    Args:
+        x (:obj:`np.ndarray`):
+            Array of shape [num_vectors, n] whose rows are max_value normalized.
+        limit: float:
+            Max value after normalization.
+    Returns:
+        y (:obj:`np.ndarray`):
+            Normalized x array, each row equal to normalize_max_weight(row, limit).
+    """
+    weights = np.array(x, copy=True)
+    if weights.ndim != 2:
+        raise ValueError(
+            "Expected a 2-D array of weight vectors, got shape {}".format(
+                weights.shape
+            )
+        )
+    # Normalize blocks of rows small enough to stay in cache, the per-row temporaries would not otherwise.
+    block = max(1, _BATCH_BLOCK_SIZE // max(weights.shape[1], 1))
+    return np.concatenate(
+        [
+            _normalize_max_weight_rows(weights[i : i + block], limit)
+            for i in range(0, max(len(weights), 1), block)
+        ]
+    )
+
+
+def _normalize_max_weight_rows(
+    weights: np.ndarray, limit: float
+) -> np.ndarray:
+    epsilon = 1e-7  # For numerical stability after normalization
+
+    n = weights.shape[1]
+    values = np.sort(weights, axis=1)
+    totals = values.sum(axis=1)
+
+    # Rows normalized uniformly, and rows whose max (the last sorted value) exceeds the limit.
+    uniform = (totals == 0) | (n * limit <= 1)
+    safe_totals = np.where(uniform, 1, totals)
+    capped = ~uniform & (values[:, -1] / safe_totals > limit)
+
+    # Only the capped rows need a cutoff.
+    rows = np.flatnonzero(capped)
+    if rows.size > 0:
+        estimation = values[rows] / safe_totals[rows, None]
+
+        # Find the cumulative sum and sorted array
+        cumsum = np.cumsum(estimation, axis=1)
+
+        # Determine the index of cutoff
+        estimation_sum = (n - np.arange(n) - 1) * estimation
+        n_values = (
+            estimation / (estimation_sum + cumsum + epsilon) < limit
+        ).sum(axis=1)
+        cutoff_index = np.where(n_values > 0, n_values - 1, n - 1)
+
+        # Determine the cutoff based on the index
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cutoff_scale = (
+                limit * cumsum[np.arange(rows.size), cutoff_index] - epsilon
+            ) / (1 - (limit * (n - n_values)))
+        cutoff = (cutoff_scale * totals[rows]).astype(weights.dtype)
+
+        # Applying the cutoff
+        weights[rows] = np.minimum(weights[rows], cutoff[:, None])
+
+    row_sums = weights.sum(axis=1, keepdims=True)
+    y = weights / np.where(uniform[:, None], 1, row_sums)
+    y[uniform] = 1 / max(n, 1)
+
+    return y
+
+
 def convert_weights_and_uids_for_emit(
     uids: np.ndarray, weights: np.ndarray
-) -> Tuple[List[int], List[int]]:
-    r"""Converts weights into integer u32 representation that sum to MAX_INT_WEIGHT.
+) -> Tuple[np.ndarray, np.ndarray]:
+    r"""Converts weights into integer u16 representation, max-upscaled so the largest weight maps to U16_MAX.
     Args:
         uids (:obj:`np.ndarray,`):
             Array of uids as destinations for passed weights.
         weights (:obj:`np.ndarray,`):
             Array of weights.
     Returns:
-        weight_uids (List[int]):
-            Uids as a list.
-        weight_vals (List[int]):
-            Weights as a list.
+        weight_uids (np.ndarray):
+            Uids with a non-zero integer weight, as uint16.
+        weight_vals (np.ndarray):
+            Non-zero integer weights, as uint16.
     """
     # Checks.
     uids = np.asarray(uids)
     weights = np.asarray(weights)
 
-    # Get non-zero weights and corresponding uids
-    non_zero_weights = weights[weights > 0]
-    non_zero_weight_uids = uids[weights > 0]
-
-    # Debugging information
-    bittensor.logging.debug(f"weights: {weights}")
-    bittensor.logging.debug(f"non_zero_weights: {non_zero_weights}")
-    bittensor.logging.debug(f"uids: {uids}")
-    bittensor.logging.debug(f"non_zero_weight_uids: {non_zero_weight_uids}")
+    # Debugging information, only formatted when debug logging is on.
+    if is_debug_enabled():
+        bittensor.logging.debug(f"weights: {weights}")
+        bittensor.logging.debug(f"uids: {uids}")
 
     if np.min(weights) < 0:
         raise ValueError(
@@ -95,6 +172,12 @@ def convert_weights_and_uids_for_emit(
         raise ValueError(
             "Passed uid is negative cannot exist on chain {}".format(uids)
         )
+    if np.max(uids) > U16_MAX:
+        raise ValueError(
+            "Passed uid is larger than {} cannot exist on chain {}".format(
+                U16_MAX, uids
+            )
+        )
     if len(uids) != len(weights):
         raise ValueError(
             "Passed weights and uids must have the same length, got {} and {}".format(
@@ -103,28 +186,24 @@ def convert_weights_and_uids_for_emit(
         )
     if np.sum(weights) == 0:
         bittensor.logging.debug("nothing to set on chain")
-        return [], []  # Nothing to set on chain.
-    else:
-        max_weight = float(np.max(weights))
-        weights = [
-            float(value) / max_weight for value in weights
-        ]  # max-upscale values (max_weight = 1).
+        # Nothing to set on chain.
+        return np.array([], dtype=np.uint16), np.array([], dtype=np.uint16)
+
+    # Max-upscale values (max_weight = 1) and convert to int representation.
+    max_weight = float(np.max(weights))
+    uint16_vals = np.rint(
+        weights.astype(np.float64) / max_weight * int(U16_MAX)
+    )
+
+    # Filter zeros
+    non_zero = uint16_vals != 0
+    weight_uids = np.compress(non_zero, uids).astype(np.uint16)
+    weight_vals = np.compress(non_zero, uint16_vals).astype(np.uint16)
+
+    if is_debug_enabled():
         bittensor.logging.debug(
-            f"setting on chain max: {max_weight} and weights: {weights}"
+            f"setting on chain max: {max_weight}, final params: {weight_uids} : {weight_vals}"
         )
-
-    weight_vals = []
-    weight_uids = []
-    for i, (weight_i, uid_i) in enumerate(list(zip(weights, uids))):
-        uint16_val = round(
-            float(weight_i) * int(U16_MAX)
-        )  # convert to int representation.
-
-        # Filter zeros
-        if uint16_val != 0:  # Filter zeros
-            weight_vals.append(uint16_val)
-            weight_uids.append(uid_i)
-    bittensor.logging.debug(f"final params: {weight_uids} : {weight_vals}")
     return weight_uids, weight_vals
 
 
@@ -135,6 +214,8 @@ def process_weights_for_netuid(
     subtensor: "bittensor.subtensor",
     metagraph: "bittensor.metagraph" = None,
     exclude_quantile: int = 0,
+    min_allowed_weights: Optional[int] = None,
+    max_weight_limit: Optional[float] = None,
 ) -> Union[
     tuple[
         ndarray[Any, dtype[Any]],
@@ -163,11 +244,13 @@ def process_weights_for_netuid(
     if not isinstance(weights, np.ndarray) or weights.dtype != np.float32:
         weights = weights.astype(np.float32)
 
-    # Network configuration parameters from an subtensor.
+    # Network configuration parameters from an subtensor, unless the caller already has them.
     # These parameters determine the range of acceptable weights for each neuron.
     quantile = exclude_quantile / U16_MAX
-    min_allowed_weights = subtensor.min_allowed_weights(netuid=netuid)
-    max_weight_limit = subtensor.max_weight_limit(netuid=netuid)
+    if min_allowed_weights is None:
+        min_allowed_weights = subtensor.min_allowed_weights(netuid=netuid)
+    if max_weight_limit is None:
+        max_weight_limit = subtensor.max_weight_limit(netuid=netuid)
     bittensor.logging.debug("quantile", quantile)
     bittensor.logging.debug("min_allowed_weights", min_allowed_weights)
     bittensor.logging.debug("max_weight_limit", max_weight_limit)
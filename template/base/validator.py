@@ -18,14 +18,15 @@
 # DEALINGS IN THE SOFTWARE.
 
 
-import copy
+import os
+import time
 import numpy as np
 import asyncio
 import argparse
 import threading
 import bittensor as bt
 
-from typing import List, Union
+from typing import List, Optional, Union
 from traceback import print_exception
 
 from template.base.neuron import BaseNeuron
@@ -33,8 +34,19 @@ from template.base.utils.weight_utils import (
     process_weights_for_netuid,
     convert_weights_and_uids_for_emit,
 )  # TODO: Replace when bittensor switches to numpy
+from template.base.utils.chain import HyperparameterCache
+from template.base.utils.checkpoint import CheckpointManager
+from template.base.utils.history import ScoreHistory
+from template.base.utils.scheduler import StepScheduler
+from template.base.utils.score_store import ScoreAccumulator, ScoreStore
 from template.mock import MockDendrite
 from template.utils.config import add_validator_args
+from template.utils.logging import is_debug_enabled
+from template.utils.uids import (
+    build_sampler,
+    get_available_uids_mask,
+    get_axon_fingerprint,
+)
 
 
 class BaseValidatorNeuron(BaseNeuron):
@@ -53,7 +65,20 @@ class BaseValidatorNeuron(BaseNeuron):
         super().__init__(config=config)
 
         # Save a copy of the hotkeys to local memory.
-        self.hotkeys = copy.deepcopy(self.metagraph.hotkeys)
+        self.hotkeys = list(self.metagraph.hotkeys)
+
+        # Per-uid axon hashes of the last synced metagraph, compared on resync to find the changed uids.
+        self.axon_fingerprint = get_axon_fingerprint(self.metagraph.axons)
+        self.resync_stats = {"duration": 0.0, "changed_uids": 0, "n": 0}
+
+        # Random generator and uid availability mask used to sample miners, the mask is refreshed on every metagraph sync.
+        self.rng = np.random.default_rng()
+        self.update_available_uids()
+
+        # Policy deciding which of the available miners are queried each step.
+        self.sampler = build_sampler(
+            self.config.neuron.sampling_policy, rng=self.rng
+        )
 
         # Dendrite lets us send messages to other nodes (axons) in the network.
         if self.config.mock:
@@ -62,27 +87,99 @@ class BaseValidatorNeuron(BaseNeuron):
             self.dendrite = bt.dendrite(wallet=self.wallet)
         bt.logging.info(f"Dendrite: {self.dendrite}")
 
+        # Subnet hyperparameters used when setting weights, refreshed once per epoch by default.
+        self.hyperparameters = HyperparameterCache(
+            self.subtensor,
+            self.config.netuid,
+            refresh_blocks=self.config.neuron.hyperparameters_refresh_blocks
+            or self.config.neuron.epoch_length,
+        )
+
         # Set up initial scoring weights for validation
         bt.logging.info("Building validation weights.")
-        self.scores = np.zeros(self.metagraph.n, dtype=np.float32)
+        self.score_store = ScoreStore(
+            self.metagraph.n, capacity=self.config.neuron.max_uids
+        )
 
-        # Init sync with the network. Updates the metagraph.
-        self.sync()
+        # Rewards of concurrent forwards are queued and applied to the scores in batches. The lock guards every
+        # read, update and resize of the scores across the forwards and the chain sync thread.
+        self.lock = threading.RLock()
 
-        # Serve axon to enable external connections.
-        if not self.config.neuron.axon_off:
-            self.serve_axon()
-        else:
-            bt.logging.warning("axon off, not serving ip to chain.")
+        # Optionally record every reward and score to memory-mappable files for offline analysis.
+        self.history = None
+        if self.config.neuron.record_history:
+            self.history = ScoreHistory(
+                self.config.neuron.full_path + "/history",
+                width=self.config.neuron.max_uids,
+            )
+
+        self.score_accumulator = ScoreAccumulator(
+            self.score_store,
+            alpha=self.config.neuron.moving_average_alpha,
+            mode=self.config.neuron.score_update_mode,
+            decay=self.config.neuron.score_decay,
+            lock=self.lock,
+            history=self.history,
+        )
+
+        # Writes the validator state in the background, at most once per checkpoint interval or step count.
+        self.checkpoints = CheckpointManager(
+            self.config.neuron.full_path + "/state.npz",
+            interval=self.config.neuron.checkpoint_interval,
+            steps=self.config.neuron.checkpoint_steps,
+        )
+
+        # Init sync with the network and serve the axon. Updates the metagraph.
+        # On warm start both are deferred to `reconcile`, which runs in the background once queries started.
+        self.time_to_first_query: Union[float, None] = None
+        if not self.warm_started:
+            self.sync()
+            self.save_metagraph_snapshot()
+            self.serve()
 
         # Create asyncio event loop to manage async tasks.
         self.loop = asyncio.get_event_loop()
 
+        # Paces forwards asynchronously so concurrent forwards overlap their network wait time.
+        self.scheduler = StepScheduler(
+            step_delay=self.config.neuron.step_delay,
+            target_qps=self.config.neuron.target_qps,
+            max_inflight=self.config.neuron.max_inflight_batches
+            or self.config.neuron.num_concurrent_forwards,
+        )
+
         # Instantiate runners
         self.should_exit: bool = False
         self.is_running: bool = False
         self.thread: Union[threading.Thread, None] = None
-        self.lock = asyncio.Lock()
+
+    @property
+    def scores(self) -> np.ndarray:
+        """Moving average score of every uid, backed by `self.score_store`. Pending rewards are applied first."""
+        self.score_accumulator.flush()
+        return self.score_store.scores
+
+    @scores.setter
+    def scores(self, scores: np.ndarray):
+        with self.lock:
+            self.score_store.set(scores)
+
+    def serve(self):
+        """Serves the axon to enable external connections, unless the axon is off."""
+        if not self.config.neuron.axon_off:
+            self.serve_axon()
+        else:
+            bt.logging.warning("axon off, not serving ip to chain.")
+
+    async def reconcile(self):
+        """
+        Catches up with the chain after a warm start: checks the registration, resyncs the metagraph restored from
+        the snapshot and serves the axon. Chain calls run on `self.chain`, the forwards keep running meanwhile.
+        """
+        bt.logging.info("Reconciling warm started validator with the chain.")
+        await self.chain.run(self.check_registered)
+        await self.resync_metagraph_async()
+        await self.chain.run(self.serve)
 
     def serve_axon(self):
         """Serve axon to enable external connections."""
@@ -109,54 +206,164 @@ class BaseValidatorNeuron(BaseNeuron):
             )
             pass
 
-    async def concurrent_forward(self):
-        coroutines = [
-            self.forward()
-            for _ in range(self.config.neuron.num_concurrent_forwards)
+    async def forward_lane(self):
+        """
+        Runs forwards back to back until the validator is asked to exit. Several lanes run concurrently so a
+        slot is refilled as soon as the forward occupying it completes, instead of waiting for a whole round.
+        """
+        while not self.should_exit:
+            if self.time_to_first_query is None:
+                self.time_to_first_query = (
+                    time.perf_counter() - self.start_time
+                )
+                bt.logging.info(
+                    f"Time to first query: {self.time_to_first_query:.2f}s ({'warm' if self.warm_started else 'cold'} start)"
+                )
+            try:
+                await self.scheduler.run(
+                    self.forward, num_queries=self.config.neuron.sample_size
+                )
+            except Exception as err:
+                bt.logging.error(f"Error during forward: {str(err)}")
+                bt.logging.debug(
+                    str(print_exception(type(err), err, err.__traceback__))
+                )
+            self.step += 1
+
+            # Cheap unless a checkpoint is due, the write itself happens in the background.
+            try:
+                self.save_state()
+            except Exception as err:
+                bt.logging.error(f"Error saving validator state: {str(err)}")
+
+    async def chain_sync_loop(self):
+        """
+        Periodically checks registration, resyncs the metagraph and sets weights, independently of the forwards.
+
+        Every blocking chain call is awaited through `self.chain`, so a slow or hung substrate endpoint never
+        freezes in-flight miner queries.
+        """
+        while not self.should_exit:
+            await asyncio.sleep(self.config.neuron.sync_interval)
+            try:
+                await self.chain.run(self.check_registered)
+
+                if await self.chain.run(self.should_sync_metagraph):
+                    await self.resync_metagraph_async()
+
+                if await self.chain.run(self.should_set_weights):
+                    await self.chain.run(self.set_weights)
+            except asyncio.TimeoutError:
+                bt.logging.warning(
+                    f"Chain sync timed out after {self.chain.timeout}s, retrying in {self.config.neuron.sync_interval}s."
+                )
+            except Exception as err:
+                bt.logging.error(f"Error during chain sync: {str(err)}")
+                bt.logging.debug(
+                    str(print_exception(type(err), err, err.__traceback__))
+                )
+            bt.logging.debug(
+                f"Pipeline stats: {self.pipeline_stats}, block clock: {self.block_clock.stats()}, hyperparameter cache: {self.hyperparameters.stats()}, resync: {self.resync_stats}, scores: {self.score_accumulator.stats()}, checkpoints: {self.checkpoints.stats()}"
+            )
+
+    async def reconcile_task(self):
+        """Runs `reconcile` in the background, logging its failures instead of stopping the pipeline."""
+        try:
+            await self.reconcile()
+        except asyncio.TimeoutError:
+            bt.logging.warning(
+                f"Reconciling with the chain timed out after {self.chain.timeout}s, relying on the periodic chain sync."
+            )
+        except Exception as err:
+            bt.logging.error(f"Error reconciling with the chain: {str(err)}")
+
+    async def score_flush_loop(self):
+        """
+        Applies the rewards queued by the forwards to the scores once per `neuron.score_flush_interval`.
+        """
+        while not self.should_exit:
+            await asyncio.sleep(self.config.neuron.score_flush_interval)
+            try:
+                self.score_accumulator.flush()
+            except Exception as err:
+                bt.logging.error(f"Error applying rewards: {str(err)}")
+                bt.logging.debug(
+                    str(print_exception(type(err), err, err.__traceback__))
+                )
+
+    async def run_pipeline(self):
+        """
+        Runs the forward lanes alongside the chain sync and score flush tasks until the validator exits.
+        """
+        # Closed when the pipeline exits, so the logs are not held open while the validator is stopped.
+        if self.history is not None:
+            self.history.open()
+        self.block_clock.start()
+        background = [
+            asyncio.ensure_future(self.chain_sync_loop()),
+            asyncio.ensure_future(self.score_flush_loop()),
         ]
-        await asyncio.gather(*coroutines)
+        if self.warm_started:
+            background.append(asyncio.ensure_future(self.reconcile_task()))
+        try:
+            await asyncio.gather(
+                *[
+                    self.forward_lane()
+                    for _ in range(self.config.neuron.num_concurrent_forwards)
+                ]
+            )
+        finally:
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+            self.save_state(force=True)
+            self.checkpoints.wait()
+            if self.history is not None:
+                with self.lock:
+                    self.history.close()
+            # Nothing waits for blocks once the pipeline stopped, it is started again with the pipeline.
+            self.block_clock.stop()
+
+    @property
+    def pipeline_stats(self) -> dict:
+        """Slot utilisation and throughput counters of the forward pipeline."""
+        return self.scheduler.stats()
 
     def run(self):
         """
-        Initiates and manages the main loop for the miner on the Bittensor network. The main loop handles graceful shutdown on keyboard interrupts and logs unforeseen errors.
+        Initiates and manages the main loop for the validator on the Bittensor network. The main loop handles graceful shutdown on keyboard interrupts and logs unforeseen errors.
 
         This function performs the following primary tasks:
         1. Check for registration on the Bittensor network.
         2. Continuously forwards queries to the miners on the network, rewarding their responses and updating the scores accordingly.
         3. Periodically resynchronizes with the chain; updating the metagraph with the latest network state and setting weights.
 
-        The essence of the validator's operations is in the forward function, which is called every step. The forward function is responsible for querying the network and scoring the responses.
+        The essence of the validator's operations is in the forward function. `neuron.num_concurrent_forwards` lanes run
+        forwards back to back, while chain syncing and checkpointing run as separate background tasks on their own
+        cadence (`neuron.sync_interval` and `neuron.checkpoint_interval`), so a slow miner batch never stalls the rest.
 
         Note:
-            - The function leverages the global configurations set during the initialization of the miner.
-            - The miner's axon serves as its interface to the Bittensor network, handling incoming and outgoing requests.
+            - The function leverages the global configurations set during the initialization of the validator.
+            - The validator's axon serves as its interface to the Bittensor network, handling incoming and outgoing requests.
 
         Raises:
-            KeyboardInterrupt: If the miner is stopped by a manual interruption.
-            Exception: For unforeseen errors during the miner's operation, which are logged for diagnosis.
+            KeyboardInterrupt: If the validator is stopped by a manual interruption.
+            Exception: For unforeseen errors during the validator's operation, which are logged for diagnosis.
         """
 
         # Check that validator is registered on the network.
-        self.sync()
-
-        bt.logging.info(f"Validator starting at block: {self.block}")
+        # A warm started validator checks in the background instead, see `reconcile`.
+        if not self.warm_started:
+            self.sync()
+            bt.logging.info(f"Validator starting at block: {self.block}")
+        else:
+            bt.logging.info(
+                f"Validator starting from snapshot at block: {int(self.metagraph.block)}"
+            )
 
-        # This loop maintains the validator's operations until intentionally stopped.
+        # Run the pipeline until intentionally stopped.
         try:
-            while True:
-                bt.logging.info(f"step({self.step}) block({self.block})")
-
-                # Run multiple forwards concurrently.
-                self.loop.run_until_complete(self.concurrent_forward())
-
-                # Check if we should exit.
-                if self.should_exit:
-                    break
-
-                # Sync metagraph and potentially set weights.
-                self.sync()
-
-                self.step += 1
+            self.loop.run_until_complete(self.run_pipeline())
 
         # If someone intentionally stops the validator, it'll safely terminate operations.
         except KeyboardInterrupt:
@@ -212,20 +419,36 @@ class BaseValidatorNeuron(BaseNeuron):
             traceback: A traceback object encoding the stack trace.
                        None if the context was exited without an exception.
         """
-        if self.is_running:
-            bt.logging.debug("Stopping validator in background thread.")
-            self.should_exit = True
-            self.thread.join(5)
-            self.is_running = False
-            bt.logging.debug("Stopped")
+        self.close()
+
+    def close(self):
+        """
+        Stops the validator's background operations and releases its threads. The validator cannot be run again
+        afterwards.
+        """
+        self.stop_run_thread()
+        super().close()
+        self.checkpoints.close()
 
     def set_weights(self):
         """
         Sets the validator weights to the metagraph hotkeys based on the scores it has received from the miners. The weights determine the trust and incentive level the validator assigns to miner nodes on the network.
         """
-
-        # Check if self.scores contains any NaN values and log a warning if it does.
-        if np.isnan(self.scores).any():
+        # Apply pending rewards and snapshot the scores, so forwards can keep updating them meanwhile.
+        # In sparse mode, scores of uids not sampled recently are decayed by the steps elapsed since their last update.
+        # The metagraph is read under the same lock, so it matches the scores even if a resync swaps it meanwhile.
+        with self.lock:
+            metagraph = self.metagraph
+            self.score_accumulator.flush()
+            if self.config.neuron.score_update_mode == "sparse":
+                scores = self.score_store.decayed(
+                    self.step, self.config.neuron.score_decay
+                ).copy()
+            else:
+                scores = self.score_store.scores.copy()
+
+        # Check if scores contains any NaN values and log a warning if it does.
+        if np.isnan(scores).any():
             bt.logging.warning(
                 f"Scores contain NaN values. This may be due to a lack of responses from miners, or a bug in your reward functions."
             )
@@ -233,30 +456,33 @@ class BaseValidatorNeuron(BaseNeuron):
         # Calculate the average reward for each uid across non-zero values.
         # Replace any NaN values with 0.
         # Compute the norm of the scores
-        norm = np.linalg.norm(self.scores, ord=1, axis=0, keepdims=True)
+        norm = np.linalg.norm(scores, ord=1, axis=0, keepdims=True)
 
         # Check if the norm is zero or contains NaN values
         if np.any(norm == 0) or np.isnan(norm).any():
             norm = np.ones_like(norm)  # Avoid division by zero or NaN
 
         # Compute raw_weights safely
-        raw_weights = self.scores / norm
+        raw_weights = scores / norm
 
-        bt.logging.debug("raw_weights", raw_weights)
-        bt.logging.debug("raw_weight_uids", str(self.metagraph.uids.tolist()))
+        if is_debug_enabled():
+            bt.logging.debug("raw_weights", raw_weights)
+            bt.logging.debug("raw_weight_uids", str(metagraph.uids.tolist()))
         # Process the raw weights to final_weights via subtensor limitations.
         (
             processed_weight_uids,
             processed_weights,
         ) = process_weights_for_netuid(
-            uids=self.metagraph.uids,
+            uids=metagraph.uids,
             weights=raw_weights,
             netuid=self.config.netuid,
             subtensor=self.subtensor,
-            metagraph=self.metagraph,
+            metagraph=metagraph,
+            **self.hyperparameters.get(self.block),
         )
-        bt.logging.debug("processed_weights", processed_weights)
-        bt.logging.debug("processed_weight_uids", processed_weight_uids)
+        if is_debug_enabled():
+            bt.logging.debug("processed_weights", processed_weights)
+            bt.logging.debug("processed_weight_uids", processed_weight_uids)
 
         # Convert to uint16 weights and uids.
         (
@@ -265,10 +491,12 @@ class BaseValidatorNeuron(BaseNeuron):
         ) = convert_weights_and_uids_for_emit(
             uids=processed_weight_uids, weights=processed_weights
         )
-        bt.logging.debug("uint_weights", uint_weights)
-        bt.logging.debug("uint_uids", uint_uids)
+        if is_debug_enabled():
+            bt.logging.debug("uint_weights", uint_weights)
+            bt.logging.debug("uint_uids", uint_uids)
 
         # Set the weights on chain via our subtensor connection.
+        # The uint16 arrays are passed as is, subtensor converts them for the extrinsic.
         result, msg = self.subtensor.set_weights(
             wallet=self.wallet,
             netuid=self.config.netuid,
@@ -284,41 +512,123 @@ class BaseValidatorNeuron(BaseNeuron):
             bt.logging.error("set_weights failed", msg)
 
     def resync_metagraph(self):
-        """Resyncs the metagraph and updates the hotkeys and moving averages based on the new metagraph."""
+        """
+        Resyncs the metagraph and updates the hotkeys and moving averages based on the new metagraph.
+
+        Blocking: used by `sync` before the pipeline starts. The running pipeline uses `resync_metagraph_async`,
+        which fetches the metagraph on the chain executor and applies it on the event loop.
+        """
+        start = time.perf_counter()
+        metagraph = self.fetch_metagraph()
+        self.apply_metagraph(metagraph, start)
+
+        # Keep a snapshot of the metagraph for the next warm start.
+        self.save_metagraph_snapshot()
+
+    async def resync_metagraph_async(self):
+        """
+        Resyncs the metagraph without the forwards ever seeing a partially synced one: the new metagraph is fetched
+        on `self.chain` into a copy, then swapped in on the event loop between two forward steps.
+        """
+        start = time.perf_counter()
+        metagraph = await self.chain.run(self.fetch_metagraph)
+        self.apply_metagraph(metagraph, start)
+        await self.chain.run(self.save_metagraph_snapshot)
+
+    def fetch_metagraph(self) -> "bt.metagraph":
+        """
+        Returns a new metagraph synced with the chain, leaving `self.metagraph` untouched.
+
+        The metagraph is synced into a fresh instance rather than a copy, since a copy may share state with the
+        original, e.g. the parameters of the torch metagraph, and the forwards keep reading the current one.
+        """
         bt.logging.info("resync_metagraph()")
+        metagraph = bt.metagraph(
+            self.config.netuid, network=self.subtensor.network, sync=False
+        )
+        metagraph.sync(subtensor=self.subtensor)
+        return metagraph
 
-        # Copies state of metagraph before syncing.
-        previous_metagraph = copy.deepcopy(self.metagraph)
+    def apply_metagraph(self, metagraph: "bt.metagraph", start: float):
+        """
+        Replaces `self.metagraph` with `metagraph` and updates the hotkeys and moving averages accordingly.
 
-        # Sync the metagraph.
-        self.metagraph.sync(subtensor=self.subtensor)
+        Instead of deep copying the metagraph, only a per-uid hash of every axon is kept between syncs. Changed
+        uids are found by comparing the hashes, and `self.score_store` resets the scores of replaced hotkeys and
+        follows the subnet growing or shrinking. The duration of the resync since `start` and the number of changed
+        uids are kept in `self.resync_stats`.
+        """
+        # Find the uids whose axon info has changed, and the uids added or removed.
+        previous_axons = self.axon_fingerprint
+        axon_fingerprint = get_axon_fingerprint(metagraph.axons)
+        common = min(previous_axons.size, axon_fingerprint.size)
+        changed = np.flatnonzero(
+            previous_axons[:common] != axon_fingerprint[:common]
+        )
+        num_changed = changed.size + abs(
+            axon_fingerprint.size - previous_axons.size
+        )
 
-        # Check if the metagraph axon info has changed.
-        if previous_metagraph.axons == self.metagraph.axons:
-            return
+        with self.lock:
+            if num_changed > 0:
+                bt.logging.info(
+                    "Metagraph updated, re-syncing hotkeys, dendrite pool and moving averages"
+                )
+                # Apply pending rewards to the uids they were computed for before any is replaced.
+                self.score_accumulator.flush()
 
+                # Zero out the scores of replaced hotkeys and resize the scores to the new number of uids.
+                shrunk = len(metagraph.hotkeys) < len(self.hotkeys)
+                replaced = self.score_store.sync(
+                    self.hotkeys, metagraph.hotkeys
+                )
+
+                # Rewards of forwards still querying replaced or removed uids no longer match them, drop them.
+                if replaced.size or shrunk:
+                    self.score_accumulator.advance()
+
+                # Update the hotkeys.
+                self.hotkeys = list(metagraph.hotkeys)
+
+            self.metagraph = metagraph
+            self.axon_fingerprint = axon_fingerprint
+
+        # Serving status, permits and stake may change without any axon changing.
+        self.update_available_uids()
+
+        self.resync_stats = {
+            "duration": time.perf_counter() - start,
+            "changed_uids": int(num_changed),
+            "n": int(metagraph.n),
+        }
         bt.logging.info(
-            "Metagraph updated, re-syncing hotkeys, dendrite pool and moving averages"
+            f"Resynced metagraph in {self.resync_stats['duration']:.3f}s, {num_changed} changed uids"
+        )
+
+    def update_available_uids(self):
+        """Recomputes the mask of uids available for querying from the current metagraph."""
+        self.available_uids_mask = get_available_uids_mask(
+            self.metagraph, self.config.neuron.vpermit_tao_limit
         )
-        # Zero out all hotkeys that have been replaced.
-        for uid, hotkey in enumerate(self.hotkeys):
-            if hotkey != self.metagraph.hotkeys[uid]:
-                self.scores[uid] = 0  # hotkey has been replaced
-
-        # Check to see if the metagraph has changed size.
-        # If so, we need to add new hotkeys and moving averages.
-        if len(self.hotkeys) < len(self.metagraph.hotkeys):
-            # Update the size of the moving average scores.
-            new_moving_average = np.zeros((self.metagraph.n))
-            min_len = min(len(self.hotkeys), len(self.scores))
-            new_moving_average[:min_len] = self.scores[:min_len]
-            self.scores = new_moving_average
-
-        # Update the hotkeys.
-        self.hotkeys = copy.deepcopy(self.metagraph.hotkeys)
-
-    def update_scores(self, rewards: np.ndarray, uids: List[int]):
-        """Performs exponential moving average on the scores based on the rewards received from the miners."""
+
+    def update_scores(
+        self,
+        rewards: np.ndarray,
+        uids: List[int],
+        step: Optional[int] = None,
+        generation: Optional[int] = None,
+    ):
+        """
+        Performs exponential moving average on the scores based on the rewards received from the miners.
+
+        `step` and `generation` are the step and the `self.score_accumulator.generation` the rewarded forward
+        started at, defaulting to the current ones. Forwards run concurrently, so `self.step` may have advanced
+        while the miners were queried, and a resync may have reassigned the queried uids, in which case the
+        rewards are dropped.
+
+        Rewards are queued on `self.score_accumulator` and applied in batches under `self.lock`, in dense or sparse
+        mode depending on `neuron.score_update_mode`. Reading `self.scores` applies any pending rewards.
+        """
 
         # Check if rewards contains NaN values.
         if np.isnan(rewards).any():
@@ -350,38 +660,49 @@ class BaseValidatorNeuron(BaseNeuron):
                 f"cannot be broadcast to uids array of shape {uids_array.shape}"
             )
 
-        # Compute forward pass rewards, assumes uids are mutually exclusive.
-        # shape: [ metagraph.n ]
-        scattered_rewards: np.ndarray = np.zeros_like(self.scores)
-        scattered_rewards[uids_array] = rewards
-        bt.logging.debug(f"Scattered rewards: {rewards}")
-
-        # Update scores with rewards produced by this step.
-        # shape: [ metagraph.n ]
-        alpha: float = self.config.neuron.moving_average_alpha
-        self.scores: np.ndarray = (
-            alpha * scattered_rewards + (1 - alpha) * self.scores
+        # Queue the rewards produced by this step, they are applied to the scores in place at the next flush.
+        self.score_accumulator.add(
+            uids_array,
+            rewards,
+            step=self.step if step is None else step,
+            generation=generation,
         )
-        bt.logging.debug(f"Updated moving avg scores: {self.scores}")
+        if is_debug_enabled():
+            bt.logging.debug(f"Queued rewards: {rewards}")
 
-    def save_state(self):
-        """Saves the state of the validator to a file."""
-        bt.logging.info("Saving validator state.")
+    def save_state(self, force: bool = False):
+        """
+        Saves the state of the validator to a file.
 
-        # Save the state of the validator to file.
-        np.savez(
-            self.config.neuron.full_path + "/state.npz",
-            step=self.step,
-            scores=self.scores,
-            hotkeys=self.hotkeys,
-        )
+        The state is snapshotted here and written by `self.checkpoints` in the background, atomically. Saves are
+        throttled by `neuron.checkpoint_interval` and `neuron.checkpoint_steps` unless `force` is set, and skipped
+        when the state did not change since the last write.
+        """
+        if not force and not self.checkpoints.due(self.step):
+            return
+
+        with self.lock:
+            scores = self.scores
+            hotkeys = self.hotkeys
+            if self.checkpoints.save(
+                self.step, force=force, scores=scores, hotkeys=hotkeys
+            ):
+                bt.logging.info("Saving validator state.")
 
     def load_state(self):
         """Loads the state of the validator from a file."""
         bt.logging.info("Loading validator state.")
 
+        # Wait for pending writes so the latest state is loaded.
+        self.checkpoints.wait()
+        if not os.path.exists(self.checkpoints.path):
+            bt.logging.warning(
+                f"No validator state found at {self.checkpoints.path}, starting from scratch."
+            )
+            return
+
         # Load the state of the validator from file.
-        state = np.load(self.config.neuron.full_path + "/state.npz")
-        self.step = state["step"]
+        state = np.load(self.checkpoints.path)
+        self.step = int(state["step"])
         self.scores = state["scores"]
-        self.hotkeys = state["hotkeys"]
+        self.hotkeys = state["hotkeys"].tolist()
@@ -6,6 +6,8 @@ import bittensor as bt
 
 from typing import List
 
+from template.base.utils.block_clock import BlockClock
+
 
 class MockSubtensor(bt.MockSubtensor):
     def __init__(self, netuid, n=16, wallet=None, network="mock"):
@@ -51,6 +53,31 @@ class MockMetagraph(bt.metagraph):
         bt.logging.info(f"Axons: {self.axons}")
 
 
+class MockBlockClock(BlockClock):
+    """
+    Block clock driven by a MockSubtensor. No polling thread is started, blocks only advance when `advance` is
+    called, which steps the mock chain and wakes the waiters.
+    """
+
+    def __init__(self, subtensor: bt.MockSubtensor):
+        super().__init__(subtensor.get_current_block)
+        self.subtensor = subtensor
+
+    @property
+    def running(self) -> bool:
+        return True
+
+    def start(self) -> "MockBlockClock":
+        self._stop.clear()
+        return self
+
+    def advance(self, blocks: int = 1) -> int:
+        """Produces `blocks` new blocks on the mock chain and returns the new current block."""
+        for _ in range(blocks):
+            self.subtensor.do_block_step()
+        return self.refresh()
+
+
 class MockDendrite(bt.dendrite):
     """
     Replaces a real bittensor network request with a mock request that just returns some static response for all axons that are passed and adds some random delay.
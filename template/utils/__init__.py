@@ -1,3 +1,10 @@
-from . import config
-from . import misc
-from . import uids
+# Submodules are imported lazily on first access, see template/__init__.py.
+import importlib
+
+__all__ = ["config", "misc", "uids"]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -17,30 +17,42 @@
 # DEALINGS IN THE SOFTWARE.
 
 import os
-import subprocess
+import sys
+import glob
 import argparse
+import functools
 import bittensor as bt
 from .logging import setup_events_logger
 
 
+@functools.lru_cache(maxsize=None)
 def is_cuda_available():
-    try:
-        output = subprocess.check_output(
-            ["nvidia-smi", "-L"], stderr=subprocess.STDOUT
-        )
-        if "NVIDIA" in output.decode("utf-8"):
-            return "cuda"
-    except Exception:
-        pass
-    try:
-        output = subprocess.check_output(["nvcc", "--version"]).decode("utf-8")
-        if "release" in output:
-            return "cuda"
-    except Exception:
-        pass
+    """
+    Returns "cuda" if an NVIDIA GPU is usable by this process and "cpu" otherwise.
+
+    Only cheap, in-process checks are used and the result is cached for the lifetime of the process: torch is
+    asked if it is already imported, `CUDA_VISIBLE_DEVICES` hiding every GPU means cpu, and otherwise a GPU is
+    assumed usable when the NVIDIA driver exposes its device files.
+    """
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    if os.environ.get("CUDA_VISIBLE_DEVICES", None) in ("", "-1"):
+        return "cpu"
+    if os.path.exists("/proc/driver/nvidia/version") or glob.glob(
+        "/dev/nvidia[0-9]*"
+    ):
+        return "cuda"
     return "cpu"
 
 
+def resolve_device(device: str) -> str:
+    """Resolves the `--neuron.device` value "auto" to the detected device, other values are returned as is."""
+    if device == "auto":
+        return is_cuda_available()
+    return device
+
+
 def check_config(cls, config: "bt.Config"):
     r"""Checks/validates the config namespace object."""
     bt.logging.check_config(config)
@@ -77,8 +89,22 @@ def add_args(cls, parser):
     parser.add_argument(
         "--neuron.device",
         type=str,
-        help="Device to run on.",
-        default=is_cuda_available(),
+        help="Device to run on. auto uses cuda if a GPU is detected when the device is first needed, cpu otherwise.",
+        default="auto",
+    )
+
+    parser.add_argument(
+        "--neuron.block_poll_interval",
+        type=float,
+        help="Seconds between polls of the current block while a new block is expected.",
+        default=1.0,
+    )
+
+    parser.add_argument(
+        "--neuron.warm_start",
+        action="store_true",
+        help="Starts from the last local metagraph snapshot and state, and reconciles with the chain in the background.",
+        default=False,
     )
 
     parser.add_argument(
@@ -88,6 +114,20 @@ def add_args(cls, parser):
         default=100,
     )
 
+    parser.add_argument(
+        "--neuron.chain_timeout",
+        type=float,
+        help="Timeout in seconds for blocking chain calls made off the event loop. 0 disables the timeout.",
+        default=60,
+    )
+
+    parser.add_argument(
+        "--neuron.chain_workers",
+        type=int,
+        help="Number of threads used for blocking chain calls. Keep at 1 unless each call uses its own connection.",
+        default=1,
+    )
+
     parser.add_argument(
         "--mock",
         action="store_true",
@@ -141,6 +181,42 @@ def add_miner_args(cls, parser):
         default="miner",
     )
 
+    parser.add_argument(
+        "--neuron.max_batch_size",
+        type=int,
+        help="Maximum number of concurrent requests passed together to forward_batch. 0 handles each request with forward.",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--neuron.max_batch_delay",
+        type=float,
+        help="Maximum seconds a request waits for its batch to fill up.",
+        default=0.01,
+    )
+
+    parser.add_argument(
+        "--neuron.offload",
+        type=str,
+        choices=["none", "thread", "process"],
+        help="Where work passed to offload() runs: inline in the axon event loop, in a thread pool for code releasing the GIL, or in a process pool.",
+        default="none",
+    )
+
+    parser.add_argument(
+        "--neuron.offload_workers",
+        type=int,
+        help="Number of offload workers. 0 uses the number of CPUs.",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--neuron.offload_queue_size",
+        type=int,
+        help="Number of offloaded tasks that may wait for a free worker, further tasks are rejected.",
+        default=32,
+    )
+
     parser.add_argument(
         "--blacklist.force_validator_permit",
         action="store_true",
@@ -155,6 +231,41 @@ def add_miner_args(cls, parser):
         default=False,
     )
 
+    parser.add_argument(
+        "--blacklist.minimum_stake",
+        type=float,
+        help="Minimum stake required to send requests to the miner. 0 disables the check.",
+        default=0.0,
+    )
+
+    parser.add_argument(
+        "--blacklist.rate_limit",
+        type=float,
+        help="Requests per second allowed from a caller without stake. 0 disables rate limiting.",
+        default=0.0,
+    )
+
+    parser.add_argument(
+        "--blacklist.rate_limit_stake_scale",
+        type=float,
+        help="Requests per second allowed from the caller with the most stake, as a multiple of --blacklist.rate_limit. Other callers scale linearly with their stake.",
+        default=10.0,
+    )
+
+    parser.add_argument(
+        "--blacklist.rate_limit_burst",
+        type=float,
+        help="Seconds worth of requests a caller can send in a burst above its rate limit.",
+        default=1.0,
+    )
+
+    parser.add_argument(
+        "--blacklist.max_inflight",
+        type=int,
+        help="Maximum number of requests handled concurrently, requests beyond it are rejected. 0 disables the cap.",
+        default=0,
+    )
+
     parser.add_argument(
         "--wandb.project_name",
         type=str,
@@ -194,6 +305,48 @@ def add_validator_args(cls, parser):
         default=1,
     )
 
+    parser.add_argument(
+        "--neuron.step_delay",
+        type=float,
+        help="Seconds each forward lane waits after completing a forward before starting the next one.",
+        default=5,
+    )
+
+    parser.add_argument(
+        "--neuron.target_qps",
+        type=float,
+        help="Target number of miner queries per second across all concurrent forwards. 0 disables the limit.",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--neuron.max_inflight_batches",
+        type=int,
+        help="Maximum number of dendrite batches awaited at once. 0 uses --neuron.num_concurrent_forwards.",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--neuron.sync_interval",
+        type=float,
+        help="Seconds between background chain syncs (registration check, metagraph resync and weight setting).",
+        default=12,
+    )
+
+    parser.add_argument(
+        "--neuron.checkpoint_interval",
+        type=float,
+        help="Minimum seconds between background validator state checkpoints.",
+        default=60,
+    )
+
+    parser.add_argument(
+        "--neuron.checkpoint_steps",
+        type=int,
+        help="Number of steps after which a checkpoint is written even if --neuron.checkpoint_interval has not elapsed. 0 disables it.",
+        default=0,
+    )
+
     parser.add_argument(
         "--neuron.sample_size",
         type=int,
@@ -201,6 +354,14 @@ def add_validator_args(cls, parser):
         default=50,
     )
 
+    parser.add_argument(
+        "--neuron.sampling_policy",
+        type=str,
+        choices=["uniform", "round_robin", "staleness", "latency"],
+        help="How miners are selected each step: uniformly, round robin epochs, oldest score first, or fastest first.",
+        default="uniform",
+    )
+
     parser.add_argument(
         "--neuron.disable_set_weights",
         action="store_true",
@@ -208,6 +369,13 @@ def add_validator_args(cls, parser):
         default=False,
     )
 
+    parser.add_argument(
+        "--neuron.hyperparameters_refresh_blocks",
+        type=int,
+        help="Number of blocks the subnet hyperparameters used to set weights are cached for. 0 uses --neuron.epoch_length.",
+        default=0,
+    )
+
     parser.add_argument(
         "--neuron.moving_average_alpha",
         type=float,
@@ -215,6 +383,42 @@ def add_validator_args(cls, parser):
         default=0.1,
     )
 
+    parser.add_argument(
+        "--neuron.score_update_mode",
+        type=str,
+        choices=["dense", "sparse"],
+        help="dense decays every uid's score each step, sparse only updates the scores of the sampled uids.",
+        default="dense",
+    )
+
+    parser.add_argument(
+        "--neuron.score_decay",
+        type=float,
+        help="In sparse mode, per-step decay applied to a score for every step since its uid was last sampled. 0 disables it.",
+        default=0.0,
+    )
+
+    parser.add_argument(
+        "--neuron.score_flush_interval",
+        type=float,
+        help="Seconds between applying the rewards queued by concurrent forwards to the scores.",
+        default=1.0,
+    )
+
+    parser.add_argument(
+        "--neuron.record_history",
+        action="store_true",
+        help="Appends every reward and score to memory-mappable files under the neuron directory, see template.base.utils.history.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--neuron.max_uids",
+        type=int,
+        help="Number of uids the score array is preallocated for, so subnet growth up to it never reallocates.",
+        default=256,
+    )
+
     parser.add_argument(
         "--neuron.axon_off",
         "--axon_off",
@@ -33,3 +33,8 @@ def setup_events_logger(full_path, events_retention_size):
     logger.addHandler(file_handler)
 
     return logger
+
+
+def is_debug_enabled() -> bool:
+    """Returns True if bittensor debug (or trace) logging is on. Use it to skip formatting large debug messages."""
+    return logging.getLogger("bittensor").isEnabledFor(logging.DEBUG)
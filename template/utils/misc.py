@@ -18,10 +18,117 @@
 
 import time
 import math
+import asyncio
+import inspect
+import threading
 import hashlib as rpccheckhealth
-from math import floor
-from typing import Callable, Any
-from functools import lru_cache, update_wrapper
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Any, Dict, Hashable, Optional, Tuple
+from functools import update_wrapper
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread safe least recently used cache whose entries expire individually, `ttl` seconds after being stored.
+
+    Expired entries are dropped when they are looked up, and before any live entry is evicted when the cache is
+    full, so stale values never linger and never push out fresh ones.
+
+    Args:
+        maxsize (int): Maximum number of entries, the least recently used entry is evicted beyond it. None for
+            an unbounded cache. Defaults to 128.
+        ttl (float): Seconds an entry stays valid. Non-positive values make entries permanent. Defaults to -1.
+        timer (Callable[[], float]): Clock used to expire entries. Defaults to `time.monotonic`.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = 128,
+        ttl: float = -1,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl if ttl > 0 else math.inf
+        self.timer = timer
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the value stored under `key`, or `default` if it is missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > self.timer():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any):
+        """Stores `value` under `key` for `ttl` seconds."""
+        with self._lock:
+            now = self.timer()
+            self._data[key] = (now + self.ttl, value)
+            self._data.move_to_end(key)
+            if self.maxsize is not None and len(self._data) > self.maxsize:
+                self._expire(now)
+            while self.maxsize is not None and len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Removes `key` and returns its value, or `default` if it is missing."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the hit, miss, eviction and expiration counters and the current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+    def _expire(self, now: float):
+        expired = [
+            key for key, (expiry, _) in self._data.items() if expiry <= now
+        ]
+        for key in expired:
+            del self._data[key]
+        self.expirations += len(expired)
+
+
+def _make_key(args: tuple, kwargs: dict, typed: bool) -> Hashable:
+    key = args
+    if kwargs:
+        key += (_MISSING,) + tuple(sorted(kwargs.items()))
+    if typed:
+        key += tuple(type(value) for value in args)
+        key += tuple(type(value) for value in kwargs.values())
+    return key
 
 
 # LRU Cache with TTL
@@ -33,11 +140,11 @@ def ttl_cache(maxsize: int = 128, typed: bool = False, ttl: int = -1):
 
     Args:
         maxsize (int): Maximum size of the cache. Once the cache grows to this size, subsequent entries
-                       replace the least recently used ones. Defaults to 128.
+                       replace the least recently used ones. None makes the cache unbounded. Defaults to 128.
         typed (bool): If set to True, arguments of different types will be cached separately. For example,
                       f(3) and f(3.0) will be treated as distinct calls with distinct results. Defaults to False.
-        ttl (int): The time-to-live for each cache entry, measured in seconds. If set to a non-positive value,
-                   the TTL is set to a very large number, effectively making the cache entries permanent. Defaults to -1.
+        ttl (int): The time-to-live for each cache entry, measured in seconds from when the entry was stored. If set
+                   to a non-positive value, cache entries are permanent. Defaults to -1.
 
     Returns:
         Callable: A decorator that can be applied to functions to cache their return values.
@@ -46,67 +153,103 @@ def ttl_cache(maxsize: int = 128, typed: bool = False, ttl: int = -1):
     with the same arguments frequently within short periods of time. The TTL feature helps in ensuring
     that the cached values are not stale.
 
+    Coroutine functions are supported and cache their awaited result. Concurrent calls with the same arguments
+    are coalesced: while one call computes a missing value, the others wait for its result instead of computing it
+    again. Exceptions are propagated to every waiting caller and are not cached.
+
+    The decorated function exposes its `TTLCache` as `cache`, along with `cache_info()` returning its statistics
+    and `cache_clear()`.
+
     Example:
         @ttl_cache(ttl=10)
         def get_data(param):
             # Expensive data retrieval operation
             return data
     """
-    if ttl <= 0:
-        ttl = 65536
-    hash_gen = _ttl_hash_gen(ttl)
+    cache = TTLCache(maxsize=maxsize, ttl=ttl)
 
     def wrapper(func: Callable) -> Callable:
-        @lru_cache(maxsize, typed)
-        def ttl_func(ttl_hash, *args, **kwargs):
-            return func(*args, **kwargs)
-
-        def wrapped(*args, **kwargs) -> Any:
-            th = next(hash_gen)
-            return ttl_func(th, *args, **kwargs)
-
+        inflight: Dict[Hashable, Any] = {}
+        inflight_lock = threading.Lock()
+
+        if inspect.iscoroutinefunction(func):
+
+            async def wrapped(*args, **kwargs) -> Any:
+                key = _make_key(args, kwargs, typed)
+                value = cache.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+
+                task = inflight.get(key)
+                if task is None:
+                    task = asyncio.ensure_future(func(*args, **kwargs))
+                    inflight[key] = task
+                    task.add_done_callback(
+                        lambda task: _store_result(cache, inflight, key, task)
+                    )
+                return await asyncio.shield(task)
+
+        else:
+
+            def wrapped(*args, **kwargs) -> Any:
+                key = _make_key(args, kwargs, typed)
+                value = cache.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+
+                with inflight_lock:
+                    future = inflight.get(key)
+                    leader = future is None
+                    if leader:
+                        future = inflight[key] = Future()
+                if not leader:
+                    return future.result()
+
+                try:
+                    value = func(*args, **kwargs)
+                except BaseException as err:
+                    future.set_exception(err)
+                    raise
+                else:
+                    cache.set(key, value)
+                    future.set_result(value)
+                    return value
+                finally:
+                    with inflight_lock:
+                        inflight.pop(key, None)
+
+        wrapped.cache = cache
+        wrapped.cache_info = cache.stats
+        wrapped.cache_clear = cache.clear
         return update_wrapper(wrapped, func)
 
     return wrapper
 
 
-def _ttl_hash_gen(seconds: int):
-    """
-    Internal generator function used by the `ttl_cache` decorator to generate a new hash value at regular
-    time intervals specified by `seconds`.
-
-    Args:
-        seconds (int): The number of seconds after which a new hash value will be generated.
-
-    Yields:
-        int: A hash value that represents the current time interval.
+def _store_result(
+    cache: TTLCache,
+    inflight: Dict[Hashable, Any],
+    key: Hashable,
+    task: "asyncio.Future",
+):
+    # Caches the result of a finished coroutine call, unless it failed or was cancelled.
+    inflight.pop(key, None)
+    if not task.cancelled() and task.exception() is None:
+        cache.set(key, task.result())
 
-    This generator is used to create time-based hash values that enable the `ttl_cache` to determine
-    whether cached entries are still valid or if they have expired and should be recalculated.
-    """
-    start_time = time.time()
-    while True:
-        yield floor((time.time() - start_time) / seconds)
 
-
-# 12 seconds updating block.
-@ttl_cache(maxsize=1, ttl=12)
 def ttl_get_block(self) -> int:
     """
-    Retrieves the current block number from the blockchain. This method is cached with a time-to-live (TTL)
-    of 12 seconds, meaning that it will only refresh the block number from the blockchain at most every 12 seconds,
+    Retrieves the current block number from the blockchain, as tracked by the neuron's block clock. The clock
+    refreshes the block in the background while the neuron runs, and at most once per block time otherwise,
     reducing the number of calls to the underlying blockchain interface.
 
     Returns:
         int: The current block number on the blockchain.
 
-    This method is useful for applications that need to access the current block number frequently and can
-    tolerate a delay of up to 12 seconds for the latest information. By using a cache with TTL, the method
-    efficiently reduces the workload on the blockchain interface.
-
     Example:
         current_block = ttl_get_block(self)
 
     Note: self here is the miner or validator instance
     """
-    return self.subtensor.get_current_block()
+    return self.block_clock.current_block
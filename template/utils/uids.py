@@ -1,7 +1,6 @@
-import random
 import bittensor as bt
 import numpy as np
-from typing import List
+from typing import Dict, List, Optional, Type
 
 
 def check_uid_availability(
@@ -26,37 +25,326 @@ def check_uid_availability(
     return True
 
 
-def get_random_uids(self, k: int, exclude: List[int] = None) -> np.ndarray:
-    """Returns k available random uids from the metagraph.
+def get_available_uids_mask(
+    metagraph: "bt.metagraph.Metagraph", vpermit_tao_limit: int
+) -> np.ndarray:
+    """Computes the availability of every uid at once. Vectorised equivalent of `check_uid_availability`, meant to be
+    computed once per metagraph sync rather than once per forward.
+    Args:
+        metagraph (:obj: bt.metagraph.Metagraph): Metagraph object
+        vpermit_tao_limit (int): Validator permit tao limit
+    Returns:
+        np.ndarray: Boolean mask of shape [metagraph.n], True where the uid is available.
+    """
+    n = int(metagraph.n)
+    # Filter non serving axons.
+    serving = np.fromiter(
+        (axon.is_serving for axon in metagraph.axons), dtype=bool, count=n
+    )
+    # Filter validator permit > vpermit_tao_limit stake.
+    permit = np.asarray(metagraph.validator_permit, dtype=bool)[:n]
+    stake = np.asarray(metagraph.S, dtype=np.float64)[:n]
+    return serving & ~(permit & (stake > vpermit_tao_limit))
+
+
+def get_hotkey_fingerprint(hotkeys: List[str]) -> np.ndarray:
+    """Hashes every hotkey into a compact per-uid fingerprint, so hotkey changes are found by comparing two arrays.
+    Args:
+        hotkeys (List[str]): Hotkeys indexed by uid.
+    Returns:
+        np.ndarray: int64 hash of each hotkey, of shape [len(hotkeys)].
+    Notes:
+        Hashes are only comparable within a process, they are not meant to be persisted.
+    """
+    return np.fromiter(map(hash, hotkeys), dtype=np.int64, count=len(hotkeys))
+
+
+def get_axon_fingerprint(axons: List["bt.AxonInfo"]) -> np.ndarray:
+    """Hashes every axon into a compact per-uid fingerprint. Two axons have the same hash when they compare equal,
+    which lets a resync detect changed axons without keeping a deep copy of the previous metagraph.
+    Args:
+        axons (List[bt.AxonInfo]): Axons indexed by uid.
+    Returns:
+        np.ndarray: int64 hash of each axon, of shape [len(axons)].
+    """
+    return np.fromiter(
+        (
+            hash(
+                (
+                    axon.version,
+                    axon.ip,
+                    axon.port,
+                    axon.ip_type,
+                    axon.coldkey,
+                    axon.hotkey,
+                )
+            )
+            for axon in axons
+        ),
+        dtype=np.int64,
+        count=len(axons),
+    )
+
+
+def sample_uids(
+    available: np.ndarray,
+    k: int,
+    exclude: Optional[List[int]] = None,
+    rng: Optional[np.random.Generator] = None,
+    weights: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Draws k distinct uids from an availability mask.
     Args:
+        available (np.ndarray): Boolean availability mask indexed by uid.
         k (int): Number of uids to return.
         exclude (List[int]): List of uids to exclude from the random sampling.
+        rng (np.random.Generator): Random generator to draw with. Defaults to a fresh generator.
+        weights (np.ndarray): Optional positive sampling weights indexed by uid. Uniform if None.
     Returns:
         uids (np.ndarray): Randomly sampled available uids.
     Notes:
         If `k` is larger than the number of available `uids`, set `k` to the number of available `uids`.
+        If fewer than `k` available uids are not excluded, excluded available uids are used to fill the sample.
     """
-    candidate_uids = []
-    avail_uids = []
+    rng = rng if rng is not None else np.random.default_rng()
 
-    for uid in range(self.metagraph.n.item()):
-        uid_is_available = check_uid_availability(
-            self.metagraph, uid, self.config.neuron.vpermit_tao_limit
-        )
-        uid_is_not_excluded = exclude is None or uid not in exclude
+    candidates = available.copy()
+    if exclude is not None and len(exclude) > 0:
+        exclude = np.asarray(exclude, dtype=np.int64)
+        exclude = exclude[(exclude >= 0) & (exclude < available.size)]
+        candidates[exclude] = False
 
-        if uid_is_available:
-            avail_uids.append(uid)
-            if uid_is_not_excluded:
-                candidate_uids.append(uid)
     # If k is larger than the number of available uids, set k to the number of available uids.
-    k = min(k, len(avail_uids))
-    # Check if candidate_uids contain enough for querying, if not grab all avaliable uids
-    available_uids = candidate_uids
-    if len(candidate_uids) < k:
-        available_uids += random.sample(
-            [uid for uid in avail_uids if uid not in candidate_uids],
-            k - len(candidate_uids),
+    k = min(k, int(np.count_nonzero(available)))
+    candidate_uids = np.flatnonzero(candidates)
+    if candidate_uids.size >= k:
+        return _choice(candidate_uids, k, rng, weights)
+
+    # Not enough candidates for querying, fill up with excluded available uids.
+    fill_uids = _choice(
+        np.flatnonzero(available & ~candidates),
+        k - candidate_uids.size,
+        rng,
+        weights,
+    )
+    return rng.permutation(np.concatenate([candidate_uids, fill_uids]))
+
+
+def _choice(
+    uids: np.ndarray,
+    k: int,
+    rng: np.random.Generator,
+    weights: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    if weights is None or uids.size == 0:
+        return rng.choice(uids, size=k, replace=False)
+    p = weights[uids].astype(np.float64)
+    return rng.choice(uids, size=k, replace=False, p=p / p.sum())
+
+
+def _fit(values: np.ndarray, n: int, fill) -> np.ndarray:
+    # Grows or shrinks a per-uid array to the current number of uids.
+    if values.size == n:
+        return values
+    fitted = np.full(n, fill, dtype=values.dtype)
+    fitted[: min(n, values.size)] = values[:n]
+    return fitted
+
+
+class UidSampler:
+    """
+    Uniform sampling policy and base class of all sampling policies.
+
+    A policy draws the uids to query with `sample` and learns from the scored uids passed to `observe`.
+    Subclasses either override `weights` to bias the draw, or `sample` to change how uids are drawn.
+
+    Args:
+        rng (np.random.Generator): Random generator to draw with. Defaults to a fresh generator.
+    """
+
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def weights(self, n: int) -> Optional[np.ndarray]:
+        """Returns positive sampling weights for n uids, or None for uniform sampling."""
+        return None
+
+    def sample(
+        self,
+        available: np.ndarray,
+        k: int,
+        exclude: Optional[List[int]] = None,
+    ) -> np.ndarray:
+        """Draws k distinct uids from the availability mask, see `sample_uids`."""
+        return sample_uids(
+            available, k, exclude, self.rng, self.weights(available.size)
+        )
+
+    def observe(
+        self, uids: np.ndarray, latencies: Optional[np.ndarray] = None
+    ):
+        """Records that `uids` were queried and scored, with their response latencies in seconds if known."""
+        pass
+
+
+class RoundRobinSampler(UidSampler):
+    """
+    Samples without replacement across epochs: no uid is drawn twice before every available uid was drawn once.
+    Full-subnet coverage is reached after ceil(n / k) forwards.
+    """
+
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        super().__init__(rng)
+        self.seen = np.zeros(0, dtype=bool)
+        self.epoch = 0
+
+    def sample(
+        self,
+        available: np.ndarray,
+        k: int,
+        exclude: Optional[List[int]] = None,
+    ) -> np.ndarray:
+        self.seen = _fit(self.seen, available.size, False)
+        uids = sample_uids(available & ~self.seen, k, exclude, self.rng)
+
+        # Every available uid has been drawn, start a new epoch with the remainder.
+        remaining = min(k, int(np.count_nonzero(available))) - uids.size
+        if remaining > 0:
+            self.seen[:] = False
+            self.epoch += 1
+            rest = available.copy()
+            rest[uids] = False
+            uids = np.concatenate(
+                [uids, sample_uids(rest, remaining, exclude, self.rng)]
+            )
+
+        self.seen[uids] = True
+        return uids
+
+
+class StalenessSampler(UidSampler):
+    """
+    Prioritises uids whose last score is the oldest. A uid is drawn with weight (age + 1) ** power, where age is the
+    number of forwards since it was last observed. Uids never observed are treated as the stalest.
+
+    Args:
+        power (float): Strength of the staleness bias, 0 is uniform. Defaults to 2.
+    """
+
+    def __init__(
+        self, rng: Optional[np.random.Generator] = None, power: float = 2.0
+    ):
+        super().__init__(rng)
+        self.power = power
+        self.tick = 0
+        self.last_observed = np.zeros(0, dtype=np.int64)
+
+    def weights(self, n: int) -> np.ndarray:
+        self.last_observed = _fit(self.last_observed, n, -1)
+        never = self.last_observed < 0
+        age = (self.tick - self.last_observed).astype(np.float64)
+        if never.any():
+            age[never] = age.max() + 1
+        return (age + 1) ** self.power
+
+    def observe(
+        self, uids: np.ndarray, latencies: Optional[np.ndarray] = None
+    ):
+        self.tick += 1
+        uids = np.asarray(uids, dtype=np.int64)
+        if uids.size > 0:
+            self.last_observed = _fit(
+                self.last_observed,
+                max(self.last_observed.size, int(uids.max()) + 1),
+                -1,
+            )
+            self.last_observed[uids] = self.tick
+
+
+class LatencySampler(UidSampler):
+    """
+    Prefers miners that answer quickly so fewer queries are spent waiting on timeouts. Keeps an exponential moving
+    average of each uid's latency and draws uids with weight 1 / (latency + floor). Uids without a measured latency
+    have latency 0, so they are explored first.
+
+    Args:
+        alpha (float): Moving average factor of the latency estimate. Defaults to 0.3.
+        floor (float): Latency in seconds added to every estimate to bound the preference for fast uids. Defaults to 0.5.
+    """
+
+    def __init__(
+        self,
+        rng: Optional[np.random.Generator] = None,
+        alpha: float = 0.3,
+        floor: float = 0.5,
+    ):
+        super().__init__(rng)
+        self.alpha = alpha
+        self.floor = floor
+        self.latency = np.zeros(0, dtype=np.float32)
+
+    def weights(self, n: int) -> np.ndarray:
+        self.latency = _fit(self.latency, n, 0.0)
+        return 1.0 / (self.latency + self.floor)
+
+    def observe(
+        self, uids: np.ndarray, latencies: Optional[np.ndarray] = None
+    ):
+        if latencies is None:
+            return
+        uids = np.asarray(uids, dtype=np.int64)
+        latencies = np.asarray(latencies, dtype=np.float32)
+        if uids.size == 0:
+            return
+        self.latency = _fit(
+            self.latency, max(self.latency.size, int(uids.max()) + 1), 0.0
+        )
+        known = self.latency[uids] > 0
+        self.latency[uids] = np.where(
+            known,
+            self.alpha * latencies + (1 - self.alpha) * self.latency[uids],
+            latencies,
+        )
+
+
+SAMPLING_POLICIES: Dict[str, Type[UidSampler]] = {
+    "uniform": UidSampler,
+    "round_robin": RoundRobinSampler,
+    "staleness": StalenessSampler,
+    "latency": LatencySampler,
+}
+
+
+def build_sampler(
+    policy: str, rng: Optional[np.random.Generator] = None
+) -> UidSampler:
+    """Instantiates the sampling policy registered under `policy` in `SAMPLING_POLICIES`."""
+    if policy not in SAMPLING_POLICIES:
+        raise ValueError(
+            f"Unknown sampling policy {policy}, expected one of {list(SAMPLING_POLICIES)}"
+        )
+    return SAMPLING_POLICIES[policy](rng=rng)
+
+
+def get_random_uids(self, k: int, exclude: List[int] = None) -> np.ndarray:
+    """Returns k available random uids from the metagraph.
+    Args:
+        k (int): Number of uids to return.
+        exclude (List[int]): List of uids to exclude from the random sampling.
+    Returns:
+        uids (np.ndarray): Randomly sampled available uids.
+    Notes:
+        If `k` is larger than the number of available `uids`, set `k` to the number of available `uids`.
+        Uses the availability mask cached on `self.available_uids_mask` at metagraph sync when it matches
+        the current metagraph, and computes it otherwise. Uids are drawn by the sampling policy `self.sampler`
+        if the neuron has one, and uniformly otherwise.
+    """
+    available = getattr(self, "available_uids_mask", None)
+    if available is None or available.size != int(self.metagraph.n):
+        available = get_available_uids_mask(
+            self.metagraph, self.config.neuron.vpermit_tao_limit
         )
-    uids = np.array(random.sample(available_uids, k))
-    return uids
+    sampler = getattr(self, "sampler", None)
+    if sampler is not None:
+        return sampler.sample(available, k, exclude)
+    return sample_uids(available, k, exclude, getattr(self, "rng", None))
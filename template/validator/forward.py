@@ -17,7 +17,6 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 
-import time
 import bittensor as bt
 
 from template.protocol import Dummy
@@ -35,6 +34,11 @@ async def forward(self):
         self (:obj:`bittensor.neuron.Neuron`): The neuron object which contains all the necessary state for the validator.
 
     """
+    # Other forwards advance `self.step` while this one awaits the miners, and a resync may reassign the uids it
+    # queries. Keep the step and the score generation it was started at.
+    step = self.step
+    generation = self.score_accumulator.generation
+
     # TODO(developer): Define how the validator selects a miner to query, how often, etc.
     # get_random_uids is an example method, but you can replace it with your own.
     miner_uids = get_random_uids(self, k=self.config.neuron.sample_size)
@@ -44,20 +48,32 @@ async def forward(self):
         # Send the query to selected miner axons in the network.
         axons=[self.metagraph.axons[uid] for uid in miner_uids],
         # Construct a dummy query. This simply contains a single integer.
-        synapse=Dummy(dummy_input=self.step),
-        # All responses have the deserialize function called on them before returning.
-        # You are encouraged to define your own deserialization function.
-        deserialize=True,
+        synapse=Dummy(dummy_input=step),
+        # Keep the full synapses so the response latencies can be read before deserializing.
+        deserialize=False,
     )
 
+    # Measure how long each miner took to respond, unanswered queries count as a full timeout.
+    latencies = [
+        float(response.dendrite.process_time)
+        if response.dendrite.process_time is not None
+        else self.config.neuron.timeout
+        for response in responses
+    ]
+    # All responses have the deserialize function called on them.
+    # You are encouraged to define your own deserialization function.
+    responses = [response.deserialize() for response in responses]
+
     # Log the results for monitoring purposes.
     bt.logging.info(f"Received responses: {responses}")
 
     # TODO(developer): Define how the validator scores responses.
     # Adjust the scores based on responses from miners.
-    rewards = get_rewards(self, query=self.step, responses=responses)
+    rewards = get_rewards(self, query=step, responses=responses)
 
     bt.logging.info(f"Scored responses: {rewards}")
     # Update the scores based on the rewards. You may want to define your own update_scores function for custom behavior.
-    self.update_scores(rewards, miner_uids)
-    time.sleep(5)
+    self.update_scores(rewards, miner_uids, step=step, generation=generation)
+
+    # Let the sampling policy know which miners were scored and how fast they answered.
+    self.sampler.observe(miner_uids, latencies)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from template.base.utils.admission import Admission, AdmissionTable
+
+HOTKEYS = ["validator", "small-validator", "miner"]
+PERMIT = np.array([True, True, False])
+STAKE = np.array([1000.0, 5.0, 20.0], dtype=np.float32)
+
+
+def build(**kwargs):
+    return AdmissionTable.build(HOTKEYS, PERMIT, STAKE, **kwargs)
+
+
+def test_allows_registered_hotkeys_by_default():
+    table = build()
+    assert len(table) == 3
+    assert table.lookup("validator") == Admission(
+        True, "Hotkey recognized!", 1000.0
+    )
+    assert table.lookup("miner") == Admission(True, "Hotkey recognized!", 20.0)
+    assert table.lookup("unknown") == Admission(
+        False, "Unrecognized hotkey", 0.0
+    )
+
+
+def test_force_validator_permit():
+    table = build(force_validator_permit=True)
+    assert table.lookup("small-validator").allowed
+    assert table.lookup("miner") == Admission(
+        False, "Non-validator hotkey", 20.0
+    )
+
+
+def test_minimum_stake():
+    table = build(minimum_stake=10.0)
+    assert table.lookup("validator").allowed
+    assert table.lookup("miner").allowed
+    assert table.lookup("small-validator") == Admission(
+        False, "Insufficient stake", 5.0
+    )
+
+
+def test_permit_reason_takes_precedence():
+    table = build(force_validator_permit=True, minimum_stake=100.0)
+    assert [table.lookup(hotkey).reason for hotkey in HOTKEYS] == [
+        "Hotkey recognized!",
+        "Insufficient stake",
+        "Non-validator hotkey",
+    ]
+
+
+@pytest.mark.parametrize(
+    "kwargs, allowed, reason",
+    [
+        ({}, False, "Unrecognized hotkey"),
+        (
+            {"allow_non_registered": True},
+            True,
+            "Non-registered hotkey allowed",
+        ),
+        (
+            {"allow_non_registered": True, "force_validator_permit": True},
+            False,
+            "Non-validator hotkey",
+        ),
+        (
+            {"allow_non_registered": True, "minimum_stake": 1.0},
+            False,
+            "Insufficient stake",
+        ),
+    ],
+)
+def test_non_registered_hotkeys(kwargs, allowed, reason):
+    assert build(**kwargs).lookup("unknown") == Admission(allowed, reason, 0.0)
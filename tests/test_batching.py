@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from template.base.utils.batching import MicroBatcher
+
+
+class Recorder:
+    def __init__(self, delay=0.0, fail=False):
+        self.batches = []
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self, items):
+        self.batches.append(list(items))
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ValueError("boom")
+        return [item * 2 for item in items]
+
+
+def test_full_batches_are_processed_at_once():
+    fn = Recorder()
+    batcher = MicroBatcher(fn, max_batch_size=4, max_delay=10.0)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(8)))
+
+    assert asyncio.run(main()) == [i * 2 for i in range(8)]
+    assert fn.batches == [[0, 1, 2, 3], [4, 5, 6, 7]]
+    assert batcher.stats()["mean_batch_size"] == 4
+
+
+def test_partial_batch_is_processed_after_max_delay():
+    fn = Recorder()
+    batcher = MicroBatcher(fn, max_batch_size=16, max_delay=0.02)
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+        return results, loop.time() - start
+
+    results, elapsed = asyncio.run(main())
+    assert results == [0, 2, 4]
+    assert fn.batches == [[0, 1, 2]]
+    assert 0.015 <= elapsed < 0.5
+
+
+def test_items_arriving_during_a_batch_start_the_next_one():
+    fn = Recorder(delay=0.05)
+    batcher = MicroBatcher(fn, max_batch_size=2, max_delay=0.01)
+
+    async def main():
+        first = asyncio.gather(batcher.submit(0), batcher.submit(1))
+        await asyncio.sleep(0.01)
+        second = await asyncio.gather(batcher.submit(2), batcher.submit(3))
+        return await first, second
+
+    assert asyncio.run(main()) == ([0, 2], [4, 6])
+    assert batcher.stats()["batches"] == 2
+
+
+def test_in_place_batch_function():
+    async def fn(items):
+        for item in items:
+            item.append("done")
+
+    batcher = MicroBatcher(fn, max_batch_size=2)
+
+    async def main():
+        return await asyncio.gather(batcher.submit([1]), batcher.submit([2]))
+
+    assert asyncio.run(main()) == [[1, "done"], [2, "done"]]
+
+
+@pytest.mark.parametrize(
+    "fn, error",
+    [
+        (Recorder(fail=True), "boom"),
+        (lambda items: asyncio.sleep(0, result=[]), "returned 0 results"),
+    ],
+)
+def test_errors_reach_every_caller(fn, error):
+    batcher = MicroBatcher(fn, max_batch_size=2)
+
+    async def main():
+        return await asyncio.gather(
+            batcher.submit(1), batcher.submit(2), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert len(results) == 2
+    assert all(error in str(result) for result in results)
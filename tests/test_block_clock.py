@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+
+import bittensor as bt
+import pytest
+
+from template.base.utils.block_clock import BlockClock
+from template.mock import MockBlockClock
+
+
+class Chain:
+    def __init__(self):
+        self.block = 10
+        self.calls = 0
+
+    def get_current_block(self):
+        self.calls += 1
+        return self.block
+
+
+@pytest.fixture(scope="module")
+def mock_clock():
+    return MockBlockClock(bt.MockSubtensor())
+
+
+def test_current_block_is_cached_while_running():
+    chain = Chain()
+    clock = BlockClock(chain.get_current_block, interval=0.01)
+
+    # Not running: the block is fetched on the first read only.
+    assert clock.current_block == 10
+    assert clock.current_block == 10
+    assert chain.calls == 1
+
+    clock.start()
+    assert clock.wait_for_block_sync(10, timeout=1)
+    calls = chain.calls
+    for _ in range(1000):
+        assert clock.current_block >= 10
+    assert chain.calls - calls < 100
+    clock.stop()
+
+
+def test_current_block_is_refetched_once_per_block_while_stopped():
+    chain = Chain()
+    clock = BlockClock(chain.get_current_block, block_time=0.05)
+
+    assert clock.current_block == 10
+    chain.block = 11
+    assert clock.current_block == 10
+    time.sleep(0.05)
+    assert clock.current_block == 11
+    assert chain.calls == 2
+
+
+def test_wait_for_block_sync_wakes_on_new_block():
+    chain = Chain()
+    clock = BlockClock(
+        chain.get_current_block, interval=0.01, block_time=0.05
+    ).start()
+
+    assert not clock.wait_for_block_sync(12, timeout=0.05)
+    threading.Timer(0.05, lambda: setattr(chain, "block", 12)).start()
+    assert clock.wait_for_block_sync(12, timeout=2)
+    clock.stop()
+
+
+def test_stop_wakes_waiters():
+    chain = Chain()
+    clock = BlockClock(chain.get_current_block, interval=0.01).start()
+
+    threading.Timer(0.05, clock.stop).start()
+    assert not clock.wait_for_block_sync(100, timeout=2)
+
+
+def test_wait_for_block_async(mock_clock):
+    async def main():
+        start = mock_clock.current_block
+        waiter = asyncio.ensure_future(mock_clock.wait_for_block(start + 2))
+        await asyncio.sleep(0)
+        mock_clock.advance()
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        mock_clock.advance()
+        assert await asyncio.wait_for(waiter, 1)
+        assert await mock_clock.wait_for_block(start)
+        assert not await mock_clock.wait_for_block(start + 10, timeout=0.01)
+
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from template.base.utils.chain import ChainExecutor, HyperparameterCache
+from template.mock import MockSubtensor
+
+
+class HungSubtensor(MockSubtensor):
+    """MockSubtensor whose block query hangs for up to `delay` seconds, until `release` is set."""
+
+    def __init__(self, *args, delay: float = 30, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+        self.release = threading.Event()
+
+    def get_current_block(self) -> int:
+        self.release.wait(self.delay)
+        return super().get_current_block()
+
+
+@pytest.fixture(scope="module")
+def hung_subtensor():
+    return HungSubtensor(netuid=1, n=4, delay=30)
+
+
+@pytest.fixture
+def subtensor(hung_subtensor):
+    hung_subtensor.release.clear()
+    yield hung_subtensor
+    hung_subtensor.release.set()
+
+
+def test_forwards_progress_during_slow_chain_call(subtensor):
+    chain = ChainExecutor(max_workers=1, timeout=60)
+    forwards_completed = 0
+
+    async def forward():
+        nonlocal forwards_completed
+        await asyncio.sleep(0.01)
+        forwards_completed += 1
+
+    async def main():
+        chain_call = asyncio.ensure_future(
+            chain.run(subtensor.get_current_block)
+        )
+        start = time.monotonic()
+        while time.monotonic() - start < 0.5:
+            await forward()
+        assert not chain_call.done()
+        completed_while_hung = forwards_completed
+
+        subtensor.release.set()
+        block = await chain_call
+        return completed_while_hung, block
+
+    completed_while_hung, block = asyncio.run(main())
+    chain.shutdown()
+
+    assert completed_while_hung >= 10
+    assert isinstance(block, int)
+
+
+def test_slow_chain_call_times_out_without_blocking(subtensor):
+    chain = ChainExecutor(max_workers=1, timeout=0.1)
+
+    async def main():
+        start = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await chain.run(subtensor.get_current_block)
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(main())
+    subtensor.release.set()
+    chain.shutdown()
+
+    assert elapsed < 5
+
+
+def test_run_sync_returns_result():
+    chain = ChainExecutor()
+    assert chain.run_sync(lambda x, y=1: x + y, 1, y=2) == 3
+    chain.shutdown()
+
+
+def test_nested_run_sync_does_not_deadlock():
+    chain = ChainExecutor(timeout=1)
+    assert chain.run_sync(lambda: chain.run_sync(lambda: 42)) == 42
+    chain.shutdown()
+
+
+class CountingSubtensor:
+    def __init__(self):
+        self.calls = 0
+
+    def min_allowed_weights(self, netuid):
+        self.calls += 1
+        return 8
+
+    def max_weight_limit(self, netuid):
+        self.calls += 1
+        return 0.1
+
+
+def test_hyperparameter_cache_refreshes_per_interval():
+    subtensor = CountingSubtensor()
+    cache = HyperparameterCache(subtensor, netuid=1, refresh_blocks=10)
+
+    for block in range(100, 110):
+        assert cache.get(block) == {
+            "min_allowed_weights": 8,
+            "max_weight_limit": 0.1,
+        }
+    assert subtensor.calls == 2
+    assert cache.stats()["hits"] == 9
+    assert cache.stats()["misses"] == 1
+
+    cache.get(110)
+    assert subtensor.calls == 4
+
+    cache.invalidate()
+    cache.get(110)
+    assert cache.stats()["misses"] == 3
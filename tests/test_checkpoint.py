@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+
+from template.base.utils.checkpoint import CheckpointManager
+
+
+def test_save_writes_atomically(tmp_path):
+    path = str(tmp_path / "state.npz")
+    manager = CheckpointManager(path, interval=0)
+
+    assert manager.save(1, scores=np.arange(4, dtype=np.float32))
+    assert manager.wait(5)
+
+    state = np.load(path)
+    assert int(state["step"]) == 1
+    assert state["scores"].tolist() == [0, 1, 2, 3]
+    assert not os.path.exists(path + ".tmp")
+    manager.close()
+
+
+def test_save_skips_unchanged_state(tmp_path):
+    manager = CheckpointManager(str(tmp_path / "state.npz"), interval=0)
+    scores = np.ones(4, dtype=np.float32)
+
+    assert manager.save(1, scores=scores, hotkeys=["a", "b"])
+    assert not manager.save(2, scores=scores, hotkeys=["a", "b"])
+    scores[0] = 2
+    assert manager.save(3, scores=scores, hotkeys=["a", "b"])
+    manager.wait(5)
+
+    assert manager.stats()["skipped"] == 1
+    manager.close()
+
+
+def test_save_is_throttled(tmp_path):
+    manager = CheckpointManager(
+        str(tmp_path / "state.npz"), interval=3600, steps=10
+    )
+
+    assert not manager.due(5)
+    assert not manager.save(5, scores=np.ones(2))
+    assert manager.save(10, scores=np.ones(2))
+    assert not manager.save(15, scores=np.zeros(2))
+    assert manager.save(15, force=True, scores=np.zeros(2))
+    manager.close()
+
+
+def test_failed_write_keeps_previous_checkpoint(tmp_path, monkeypatch):
+    path = str(tmp_path / "state.npz")
+    manager = CheckpointManager(path, interval=0)
+    manager.save(1, scores=np.ones(2))
+    manager.wait(5)
+
+    def crash(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "fsync", crash)
+    manager.save(2, scores=np.zeros(2))
+    manager.wait(5)
+
+    assert manager.stats()["failures"] == 1
+    assert np.load(path)["scores"].tolist() == [1, 1]
+    manager.close()
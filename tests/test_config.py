@@ -0,0 +1,47 @@
+import subprocess
+import sys
+
+import pytest
+
+from template.base.miner import BaseMinerNeuron
+from template.base.validator import BaseValidatorNeuron
+from template.utils.config import config, is_cuda_available, resolve_device
+
+
+@pytest.fixture
+def no_subprocess(monkeypatch):
+    spawned = []
+
+    def record(self, args, *rest, **kwargs):
+        spawned.append(args)
+        raise OSError(f"Unexpected subprocess: {args}")
+
+    monkeypatch.setattr(subprocess.Popen, "__init__", record)
+    monkeypatch.setattr(sys, "argv", ["neuron"])
+    yield
+    assert spawned == []
+
+
+@pytest.mark.parametrize("cls", [BaseMinerNeuron, BaseValidatorNeuron])
+def test_config_spawns_no_subprocess(no_subprocess, cls):
+    is_cuda_available.cache_clear()
+
+    neuron_config = config(cls)
+
+    assert neuron_config.neuron.device == "auto"
+
+
+def test_device_detection_is_cheap_and_cached(no_subprocess, monkeypatch):
+    is_cuda_available.cache_clear()
+    monkeypatch.setenv("CUDA_VISIBLE_DEVICES", "")
+
+    assert resolve_device("auto") == "cpu"
+    assert is_cuda_available.cache_info().misses == 1
+    assert resolve_device("auto") == "cpu"
+    assert is_cuda_available.cache_info().hits == 1
+    is_cuda_available.cache_clear()
+
+
+def test_resolve_explicit_device():
+    assert resolve_device("cuda:1") == "cuda:1"
+    assert resolve_device("cpu") == "cpu"
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from template.base.utils.history import ScoreHistory, load_history
+from template.base.utils.score_store import ScoreAccumulator, ScoreStore
+
+
+def test_history_round_trip(tmp_path):
+    history = ScoreHistory(str(tmp_path), width=8)
+    history.scores.append(np.arange(4, dtype=np.float32), step=1)
+    history.rewards.append_sparse(np.array([2, 9]), np.array([0.5, 1.0]), 2)
+    history.flush()
+
+    loaded = load_history(str(tmp_path))
+    index, scores = loaded["scores"]
+    assert index["step"].tolist() == [1]
+    np.testing.assert_array_equal(scores[0, :4], [0, 1, 2, 3])
+    assert np.isnan(scores[0, 4:]).all()
+
+    index, rewards = loaded["rewards"]
+    assert rewards.shape == (1, 8)
+    assert rewards[0, 2] == 0.5
+    assert np.isnan(rewards[0]).sum() == 7
+
+
+def test_history_appends_after_reopen_and_truncates_partial_rows(tmp_path):
+    history = ScoreHistory(str(tmp_path), width=4)
+    history.scores.append(np.ones(4), step=1)
+    history.close()
+
+    # Simulate a crash in the middle of writing a row.
+    with open(tmp_path / "scores.f32", "ab") as f:
+        f.write(b"\x00" * 6)
+
+    history = ScoreHistory(str(tmp_path), width=4)
+    assert history.scores.rows == 1
+    history.scores.append(np.zeros(4), step=2)
+    history.flush()
+
+    index, scores = load_history(str(tmp_path))["scores"]
+    assert index["step"].tolist() == [1, 2]
+    assert scores.tolist() == [[1] * 4, [0] * 4]
+
+    with pytest.raises(ValueError):
+        ScoreHistory(str(tmp_path), width=8)
+
+
+def test_accumulator_records_history(tmp_path):
+    history = ScoreHistory(str(tmp_path), width=8)
+    store = ScoreStore(4, capacity=8)
+    accumulator = ScoreAccumulator(store, alpha=0.5, history=history)
+
+    accumulator.add(np.array([0, 1]), np.array([1.0, 1.0]), step=1)
+    accumulator.add(np.array([2]), np.array([1.0]), step=2)
+    accumulator.flush()
+
+    assert history.stats() == {"rewards": 2, "scores": 1}
+    index, scores = history.scores.read()
+    assert index["step"].tolist() == [2]
+    np.testing.assert_allclose(scores[0, :4], store.scores)
+
+
+def test_history_reopens_after_close(tmp_path):
+    history = ScoreHistory(str(tmp_path), width=4)
+    store = ScoreStore(4)
+    accumulator = ScoreAccumulator(store, alpha=0.5, history=history)
+    accumulator.add(np.array([0]), np.array([1.0]), step=1)
+    accumulator.flush()
+    history.close()
+    assert history.closed
+
+    # Rewards applied while closed update the scores without being recorded.
+    accumulator.add(np.array([1]), np.array([1.0]), step=2)
+    assert accumulator.flush() == 1
+    assert history.stats() == {"rewards": 1, "scores": 1}
+
+    history.open()
+    assert not history.closed
+    accumulator.add(np.array([2]), np.array([1.0]), step=3)
+    accumulator.flush()
+    index, _ = history.rewards.read()
+    assert index["step"].tolist() == [1, 3]
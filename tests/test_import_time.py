@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time budget of `import template`, in microseconds.
+IMPORT_BUDGET_US = 50_000
+
+
+def import_times(statement):
+    """Runs `statement` with -X importtime and returns the cumulative import time in microseconds of each module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def loaded_modules(statement):
+    """Runs `statement` in a fresh interpreter and returns the names of the modules it loaded."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"{statement}\nimport sys\nprint('\\n'.join(sys.modules))",
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+def test_import_template_is_lazy():
+    times = import_times("import template")
+
+    assert times["template"] < IMPORT_BUDGET_US
+    for module in ("bittensor", "numpy", "template.base", "template.api"):
+        assert module not in times
+
+
+@pytest.mark.parametrize(
+    "statement, expected",
+    [
+        ("import template.protocol", "template.protocol"),
+        ("from template import SUBNET_LINKS", "template.subnet_links"),
+    ],
+)
+def test_submodule_import_does_not_load_package(statement, expected):
+    modules = loaded_modules(statement)
+
+    assert expected in modules
+    for module in ("template.base", "template.validator", "template.api"):
+        assert module not in modules
+
+
+def test_lazy_attributes():
+    import template
+
+    assert template.protocol.Dummy is not None
+    assert isinstance(template.SUBNET_LINKS, list)
+    with pytest.raises(AttributeError):
+        template.missing
@@ -0,0 +1,197 @@
+import asyncio
+import inspect
+import threading
+from types import SimpleNamespace
+
+import bittensor as bt
+import numpy as np
+import pytest
+
+from neurons.miner import Miner
+from template.base.utils.batching import MicroBatcher
+from template.base.utils.offload import Offloader
+from template.base.utils.rate_limit import RateLimiter
+from template.protocol import Dummy
+
+
+def make_miner(
+    force_validator_permit=True,
+    allow_non_registered=False,
+    minimum_stake=0.0,
+    rate_limit=0.0,
+):
+    """Miner with only the state used to handle requests, without wallet, axon or network."""
+    miner = Miner.__new__(Miner)
+    miner.config = SimpleNamespace(
+        blacklist=SimpleNamespace(
+            force_validator_permit=force_validator_permit,
+            allow_non_registered=allow_non_registered,
+            minimum_stake=minimum_stake,
+        )
+    )
+    miner.metagraph = SimpleNamespace(
+        hotkeys=["validator", "miner"],
+        validator_permit=np.array([True, False]),
+        S=np.array([100.0, 1.0]),
+    )
+    miner.rate_limiter = RateLimiter(rate=rate_limit, max_inflight=1)
+    miner.index_metagraph()
+    return miner
+
+
+def request(hotkey):
+    return Dummy(dummy_input=1, dendrite=bt.TerminalInfo(hotkey=hotkey))
+
+
+def test_index_metagraph():
+    miner = make_miner()
+    assert miner.hotkey_to_uid == {"validator": 0, "miner": 1}
+    assert miner.validator_permits.tolist() == [True, False]
+    assert miner.stakes.tolist() == [100.0, 1.0]
+    assert miner.caller_uid(request("miner")) == 1
+    assert miner.caller_uid(request("unknown")) is None
+    assert miner.caller_uid(Dummy(dummy_input=1)) is None
+
+
+def test_index_follows_metagraph_changes():
+    miner = make_miner()
+    miner.metagraph.hotkeys = ["validator", "new", "other"]
+    miner.metagraph.validator_permit = np.array([True, True, False])
+    miner.metagraph.S = np.array([100.0, 50.0, 0.0])
+    miner.index_metagraph()
+
+    assert miner.caller_uid(request("miner")) is None
+    assert miner.caller_uid(request("new")) == 1
+    assert miner.validator_permits[1]
+
+
+@pytest.mark.parametrize(
+    "hotkey, force_validator_permit, allow_non_registered, blacklisted",
+    [
+        ("validator", True, False, False),
+        ("miner", True, False, True),
+        ("miner", False, False, False),
+        ("unknown", True, False, True),
+        ("unknown", False, False, True),
+        ("unknown", True, True, True),
+        ("unknown", False, True, False),
+    ],
+)
+def test_blacklist(
+    hotkey, force_validator_permit, allow_non_registered, blacklisted
+):
+    miner = make_miner(force_validator_permit, allow_non_registered)
+    result, _ = asyncio.run(miner.blacklist(request(hotkey)))
+    assert result == blacklisted
+
+
+def test_priority_is_stake():
+    miner = make_miner()
+    assert asyncio.run(miner.priority(request("validator"))) == 100.0
+    assert asyncio.run(miner.priority(request("miner"))) == 1.0
+    assert asyncio.run(miner.priority(request("unknown"))) == 0.0
+
+
+def test_blacklist_minimum_stake():
+    miner = make_miner(force_validator_permit=False, minimum_stake=10.0)
+    assert asyncio.run(miner.blacklist(request("validator"))) == (
+        False,
+        "Hotkey recognized!",
+    )
+    assert asyncio.run(miner.blacklist(request("miner"))) == (
+        True,
+        "Insufficient stake",
+    )
+
+
+def test_limited_blacklist_rejects_after_admission():
+    miner = make_miner(rate_limit=1.0)
+    blacklist = miner.limit_blacklist(miner.blacklist)
+    forward = miner.limit_forward(miner.forward)
+
+    # Rejected by the admission table, without touching the rate limiter.
+    assert asyncio.run(blacklist(request("miner"))) == (
+        True,
+        "Non-validator hotkey",
+    )
+    assert asyncio.run(blacklist(request("validator"))) == (
+        False,
+        "Hotkey recognized!",
+    )
+
+    # The top validator holds 10 tokens, spent by verified requests only.
+    for _ in range(10):
+        asyncio.run(forward(request("validator")))
+    assert asyncio.run(blacklist(request("validator"))) == (
+        True,
+        "Rate limit exceeded",
+    )
+    assert miner.rate_limiter.caller_stats()["validator"] == {
+        "admitted": 10,
+        "rejected": 1,
+    }
+    assert miner.rate_limiter.inflight == 0
+
+
+def test_limited_forward_sheds_load():
+    miner = make_miner()
+    blacklist = miner.limit_blacklist(miner.blacklist)
+
+    async def main():
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow(synapse):
+            started.set()
+            await release.wait()
+            return synapse
+
+        forward = miner.limit_forward(slow)
+        task = asyncio.ensure_future(forward(request("validator")))
+        await started.wait()
+        shed = await blacklist(request("validator"))
+        release.set()
+        await task
+        return shed, await blacklist(request("validator"))
+
+    shed, admitted = asyncio.run(main())
+    assert shed == (True, "Too many requests in flight")
+    assert admitted == (False, "Hotkey recognized!")
+
+
+def test_limited_functions_keep_signatures():
+    miner = make_miner()
+    assert inspect.signature(
+        miner.limit_blacklist(miner.blacklist)
+    ) == inspect.signature(miner.blacklist)
+    assert inspect.signature(
+        miner.limit_forward(miner.forward)
+    ) == inspect.signature(miner.forward)
+
+
+def test_batched_forward():
+    miner = make_miner()
+    miner.batcher = MicroBatcher(miner.forward_batch, max_batch_size=3)
+    forward = miner.limit_forward(miner.batch_forward(miner.forward))
+    assert inspect.signature(forward) == inspect.signature(miner.forward)
+
+    async def main():
+        return await asyncio.gather(
+            *(forward(request("validator")) for _ in range(3))
+        )
+
+    assert [synapse.dummy_output for synapse in asyncio.run(main())] == [2] * 3
+    assert miner.batcher.stats()["batches"] == 1
+
+
+def test_offload_is_bounded_by_synapse_timeout():
+    miner = make_miner()
+    miner.offloader = Offloader("thread", max_workers=1)
+    release = threading.Event()
+    synapse = request("validator")
+    synapse.timeout = 0.05
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(miner.offload(release.wait, synapse=synapse))
+    release.set()
+    miner.offloader.shutdown()
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import bittensor as bt
+import numpy as np
+import pytest
+
+from template.base.miner import BaseMinerNeuron
+from template.base.utils.chain import ChainExecutor
+from template.base.utils.offload import Offloader
+from template.base.utils.rate_limit import RateLimiter
+from template.mock import MockBlockClock
+
+EPOCH_LENGTH = 5
+
+
+class LoopMiner(BaseMinerNeuron):
+    """Miner with only the state used by the main loop, without wallet, axon or network."""
+
+    def __init__(self, block_clock):
+        self.config = SimpleNamespace(
+            netuid=1,
+            neuron=SimpleNamespace(epoch_length=EPOCH_LENGTH),
+            subtensor=SimpleNamespace(chain_endpoint="mock"),
+        )
+        self.block_clock = block_clock
+        self.chain = ChainExecutor()
+        self.subtensor = None
+        self.axon = SimpleNamespace(
+            serve=lambda **kwargs: None,
+            start=lambda: None,
+            stop=lambda: None,
+        )
+        self.metagraph = SimpleNamespace(last_update=np.zeros(1))
+        self.rate_limiter = RateLimiter()
+        self.batcher = None
+        self.offloader = Offloader()
+        self.uid = 0
+        self.step = 0
+        self.warm_started = False
+        self.syncs = []
+        self.failures = 0
+        self.is_running = False
+        self.thread = None
+        self.last_sync_block = 0
+        self.exit_event = threading.Event()
+        self.should_exit = False
+
+    def sync(self):
+        self.syncs.append(self.block)
+        if self.failures:
+            self.failures -= 1
+            raise TimeoutError("Chain call timed out")
+
+    async def forward(self, synapse):
+        return synapse
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture(scope="module")
+def block_clock():
+    return MockBlockClock(bt.MockSubtensor())
+
+
+def test_miner_syncs_once_per_epoch_and_stops_immediately(block_clock):
+    miner = LoopMiner(block_clock)
+    miner.run_in_background_thread()
+
+    # Initial sync on start.
+    assert wait_until(lambda: len(miner.syncs) == 1)
+    start = miner.last_sync_block
+
+    # No further sync until an epoch has elapsed since the last one.
+    block_clock.advance(EPOCH_LENGTH - 1)
+    time.sleep(0.1)
+    assert len(miner.syncs) == 1
+
+    block_clock.advance(1)
+    assert wait_until(lambda: len(miner.syncs) == 2)
+    assert miner.syncs[-1] == start + EPOCH_LENGTH
+    assert miner.step == 1
+
+    # Stale last_update does not cause a sync on every block.
+    block_clock.advance(1)
+    time.sleep(0.1)
+    assert len(miner.syncs) == 2
+
+    begin = time.monotonic()
+    miner.stop_run_thread()
+    assert time.monotonic() - begin < 1
+    assert not miner.thread.is_alive()
+
+
+def test_failed_sync_is_retried_at_next_epoch(block_clock):
+    miner = LoopMiner(block_clock)
+    miner.run_in_background_thread()
+    assert wait_until(lambda: len(miner.syncs) == 1)
+    start = miner.last_sync_block
+
+    # The next sync times out, the loop keeps running.
+    miner.failures = 1
+    block_clock.advance(EPOCH_LENGTH)
+    assert wait_until(lambda: len(miner.syncs) == 2)
+    assert wait_until(lambda: miner.last_sync_block == start + EPOCH_LENGTH)
+    assert miner.thread.is_alive()
+
+    # Retried one epoch later.
+    block_clock.advance(EPOCH_LENGTH - 1)
+    time.sleep(0.1)
+    assert len(miner.syncs) == 2
+    block_clock.advance(1)
+    assert wait_until(lambda: len(miner.syncs) == 3)
+    assert miner.syncs[-1] == start + 2 * EPOCH_LENGTH
+
+    miner.stop_run_thread()
+    assert not miner.thread.is_alive()
+
+
+def test_offload_pool_survives_restart(block_clock):
+    miner = LoopMiner(block_clock)
+    miner.offloader = Offloader("thread", max_workers=1)
+    for _ in range(2):
+        miner.run_in_background_thread()
+        assert wait_until(lambda: miner.last_sync_block > 0)
+        miner.stop_run_thread()
+        assert asyncio.run(miner.offload(sum, [1, 2])) == 3
+
+    miner.close()
+    with pytest.raises(RuntimeError):
+        asyncio.run(miner.offload(sum, [1, 2]))
@@ -0,0 +1,213 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from template.utils.misc import TTLCache, ttl_cache
+
+
+class Timer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_individually():
+    timer = Timer()
+    cache = TTLCache(maxsize=8, ttl=10, timer=timer)
+    cache.set("a", 1)
+    timer.now = 5
+    cache.set("b", 2)
+
+    timer.now = 10
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    timer.now = 15
+    assert cache.get("b") is None
+    assert cache.stats()["expirations"] == 2
+
+
+def test_non_positive_ttl_never_expires():
+    timer = Timer()
+    cache = TTLCache(ttl=-1, timer=timer)
+    cache.set("a", 1)
+    timer.now = 1e9
+    assert cache.get("a") == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+    assert len(cache) == 2
+
+
+def test_expired_entries_are_dropped_before_live_ones():
+    timer = Timer()
+    cache = TTLCache(maxsize=2, ttl=10, timer=timer)
+    cache.set("a", 1)
+    timer.now = 5
+    cache.set("b", 2)
+    cache.get("a")
+
+    # "a" is the most recently used but expired, so it goes instead of "b".
+    timer.now = 12
+    cache.set("c", 3)
+    assert cache.get("b") == 2
+    assert cache.stats()["evictions"] == 0
+    assert cache.stats()["expirations"] == 1
+
+
+def test_decorator_caches_and_reports_stats():
+    calls = []
+
+    @ttl_cache(maxsize=4, ttl=60)
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    assert square(3) == 9
+    assert square(3) == 9
+    assert square(x=3) == 9
+    assert calls == [3, 3]
+    assert square.__name__ == "square"
+
+    info = square.cache_info()
+    assert info["hits"] == 1
+    assert info["misses"] == 2
+    assert info["size"] == 2
+
+    square.cache_clear()
+    square(3)
+    assert calls == [3, 3, 3]
+
+
+def test_typed_caches_types_separately():
+    calls = []
+
+    @ttl_cache(typed=True)
+    def identity(x):
+        calls.append(x)
+        return x
+
+    identity(3)
+    identity(3.0)
+    assert len(calls) == 2
+
+
+def test_exceptions_are_not_cached():
+    calls = []
+
+    @ttl_cache()
+    def fail():
+        calls.append(1)
+        raise ValueError("boom")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            fail()
+    assert len(calls) == 2
+
+
+def test_concurrent_calls_are_coalesced():
+    calls = []
+    started = threading.Event()
+
+    @ttl_cache(ttl=60)
+    def slow(x):
+        calls.append(x)
+        started.set()
+        time.sleep(0.1)
+        return x
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(slow(1)))
+        for _ in range(8)
+    ]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == [1] * 8
+
+
+def test_concurrent_calls_share_exceptions():
+    calls = []
+    started = threading.Event()
+
+    @ttl_cache()
+    def fail():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            fail()
+        except ValueError as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(errors) == 4
+
+
+def test_coroutine_functions_are_cached_and_coalesced():
+    calls = []
+
+    @ttl_cache(ttl=60)
+    async def lookup(x):
+        calls.append(x)
+        await asyncio.sleep(0.05)
+        return x * 2
+
+    async def main():
+        results = await asyncio.gather(*(lookup(2) for _ in range(8)))
+        return results + [await lookup(2)]
+
+    assert asyncio.run(main()) == [4] * 9
+    assert calls == [2]
+    assert lookup.cache_info()["hits"] == 1
+
+
+def test_failed_coroutines_are_not_cached():
+    calls = []
+
+    @ttl_cache()
+    async def fail():
+        calls.append(1)
+        raise ValueError("boom")
+
+    async def main():
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await fail()
+
+    asyncio.run(main())
+    assert len(calls) == 2
@@ -0,0 +1,90 @@
+import asyncio
+import math
+import threading
+import time
+
+import pytest
+
+from template.base.utils.offload import Offloader
+
+
+@pytest.fixture(scope="module")
+def process_offloader():
+    offloader = Offloader("process", max_workers=2)
+    yield offloader
+    offloader.shutdown()
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        Offloader("gpu")
+
+
+def test_inline():
+    offloader = Offloader("none")
+    assert asyncio.run(offloader.run(math.factorial, 5)) == 120
+    assert offloader.stats()["completed"] == 1
+
+
+def test_process_pool(process_offloader):
+    async def main():
+        return await asyncio.gather(
+            *(process_offloader.run(math.factorial, n) for n in range(6))
+        )
+
+    assert asyncio.run(main()) == [1, 1, 2, 6, 24, 120]
+    assert process_offloader.stats()["pending"] == 0
+
+
+def test_process_pool_errors(process_offloader):
+    with pytest.raises(ValueError):
+        asyncio.run(process_offloader.run(math.factorial, -1))
+
+
+def test_thread_pool_runs_off_the_event_loop():
+    offloader = Offloader("thread", max_workers=2)
+
+    async def main():
+        return await offloader.run(threading.get_ident)
+
+    assert asyncio.run(main()) != threading.get_ident()
+    offloader.shutdown()
+
+
+def test_timeout_keeps_worker_busy():
+    offloader = Offloader("thread", max_workers=1, queue_size=0)
+    release = threading.Event()
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await offloader.run(release.wait, timeout=0.05)
+        # The timed out task still holds the only worker.
+        with pytest.raises(asyncio.QueueFull):
+            await offloader.run(time.sleep, 0)
+
+    asyncio.run(main())
+    release.set()
+    offloader.shutdown()
+    stats = offloader.stats()
+    assert stats["timeouts"] == 1
+    assert stats["rejected"] == 1
+    assert stats["pending"] == 0
+
+
+def test_queue_is_bounded():
+    offloader = Offloader("thread", max_workers=1, queue_size=2)
+    release = threading.Event()
+
+    async def main():
+        tasks = [
+            asyncio.ensure_future(offloader.run(release.wait))
+            for _ in range(4)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert results[:3] == [True, True, True]
+    assert isinstance(results[3], asyncio.QueueFull)
+    offloader.shutdown()
@@ -0,0 +1,110 @@
+import numpy as np
+
+from template.base.utils.rate_limit import RateLimiter
+
+HOTKEYS = ["whale", "minnow"]
+STAKES = np.array([1000.0, 0.0])
+
+
+class Timer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_limiter(**kwargs):
+    timer = Timer()
+    limiter = RateLimiter(timer=timer, **kwargs)
+    limiter.set_stakes(HOTKEYS, STAKES)
+    return limiter, timer
+
+
+def admit(limiter, hotkey):
+    # A request going through the blacklist, then forwarded.
+    rejected, _ = limiter.check(hotkey)
+    if not rejected:
+        limiter.acquire(hotkey)
+        limiter.release()
+    return not rejected
+
+
+def test_disabled_by_default():
+    limiter, _ = make_limiter()
+    assert all(admit(limiter, "minnow") for _ in range(1000))
+    assert limiter.stats() == {
+        "inflight": 0,
+        "admitted": 1000,
+        "rejected": 0,
+        "callers": 1,
+    }
+
+
+def test_rates_scale_with_stake():
+    limiter, timer = make_limiter(rate=2.0, stake_scale=5.0)
+    assert sum(admit(limiter, "whale") for _ in range(100)) == 10
+    assert sum(admit(limiter, "minnow") for _ in range(100)) == 2
+
+    # Buckets refill at their own rate.
+    timer.now = 0.5
+    assert sum(admit(limiter, "whale") for _ in range(100)) == 5
+    assert sum(admit(limiter, "minnow") for _ in range(100)) == 1
+
+    assert limiter.caller_stats() == {
+        "whale": {"admitted": 15, "rejected": 185},
+        "minnow": {"admitted": 3, "rejected": 197},
+    }
+
+
+def test_burst_caps_refill():
+    limiter, timer = make_limiter(rate=1.0, stake_scale=1.0, burst=3.0)
+    timer.now = 100.0
+    assert sum(admit(limiter, "minnow") for _ in range(10)) == 3
+
+
+def test_non_registered_callers_share_a_bucket():
+    limiter, _ = make_limiter(rate=2.0)
+    assert admit(limiter, "a")
+    assert admit(limiter, "b")
+    assert not admit(limiter, "c")
+    assert limiter.caller_stats() == {None: {"admitted": 2, "rejected": 1}}
+
+
+def test_check_does_not_take_tokens():
+    limiter, _ = make_limiter(rate=1.0, stake_scale=1.0)
+    for _ in range(10):
+        assert limiter.check("minnow") == (False, "Within rate limit")
+
+
+def test_concurrent_requests_overdraw_bucket():
+    limiter, timer = make_limiter(rate=1.0, stake_scale=1.0, burst=2.0)
+    assert not limiter.check("minnow")[0]
+    assert not limiter.check("minnow")[0]
+    for _ in range(5):
+        limiter.acquire("minnow")
+        limiter.release()
+
+    # The 3 extra requests are repaid before the next one is admitted.
+    timer.now = 3.9
+    assert limiter.check("minnow") == (True, "Rate limit exceeded")
+    timer.now = 4.0
+    assert limiter.check("minnow") == (False, "Within rate limit")
+
+
+def test_max_inflight():
+    limiter, _ = make_limiter(max_inflight=2)
+    limiter.acquire("whale")
+    limiter.acquire("minnow")
+    assert limiter.check("whale") == (True, "Too many requests in flight")
+    limiter.release()
+    assert limiter.check("whale") == (False, "Within rate limit")
+    assert limiter.stats()["inflight"] == 1
+
+
+def test_deregistered_callers_are_dropped():
+    limiter, _ = make_limiter(rate=1.0)
+    admit(limiter, "whale")
+    admit(limiter, "unknown")
+    limiter.set_stakes(["minnow"], np.array([1.0]))
+    assert set(limiter.caller_stats()) == {None}
@@ -0,0 +1,216 @@
+from types import MethodType, SimpleNamespace
+
+import bittensor as bt
+import numpy as np
+import pytest
+
+from template.base.utils.score_store import ScoreAccumulator, ScoreStore
+from template.base.validator import BaseValidatorNeuron
+from template.utils.uids import get_axon_fingerprint
+
+
+def make_axon(hotkey, port=8091):
+    return bt.AxonInfo(
+        version=1,
+        ip="1.2.3.4",
+        port=port,
+        ip_type=4,
+        hotkey=hotkey,
+        coldkey="coldkey",
+    )
+
+
+class FakeSubtensor:
+    network = "mock"
+
+    def __init__(self, hotkeys):
+        self.set(hotkeys)
+
+    def set(self, hotkeys, ports=None):
+        self.hotkeys = list(hotkeys)
+        self.ports = ports or [8091] * len(hotkeys)
+
+
+class FakeMetagraph:
+    def __init__(self, netuid, network="mock", sync=True):
+        self.netuid = netuid
+        self.hotkeys = []
+        self.axons = []
+        self.n = np.array(0)
+
+    def sync(self, subtensor=None):
+        self.hotkeys = list(subtensor.hotkeys)
+        self.axons = [
+            make_axon(h, p) for h, p in zip(subtensor.hotkeys, subtensor.ports)
+        ]
+        self.n = np.array(len(self.hotkeys))
+
+
+@pytest.fixture(autouse=True)
+def fake_metagraph(monkeypatch):
+    monkeypatch.setattr(bt, "metagraph", FakeMetagraph)
+
+
+def make_validator(hotkeys):
+    subtensor = FakeSubtensor(hotkeys)
+    metagraph = FakeMetagraph(1)
+    metagraph.sync(subtensor)
+    score_store = ScoreStore(len(hotkeys), capacity=8)
+    score_store.set(np.arange(1, len(hotkeys) + 1))
+    validator = SimpleNamespace(
+        config=SimpleNamespace(netuid=1),
+        metagraph=metagraph,
+        subtensor=subtensor,
+        hotkeys=list(hotkeys),
+        score_store=score_store,
+        score_accumulator=ScoreAccumulator(score_store, alpha=0.1),
+        axon_fingerprint=get_axon_fingerprint(metagraph.axons),
+        update_available_uids=lambda: None,
+        save_metagraph_snapshot=lambda: None,
+    )
+    validator.lock = validator.score_accumulator.lock
+    for name in ("fetch_metagraph", "apply_metagraph"):
+        setattr(
+            validator,
+            name,
+            MethodType(getattr(BaseValidatorNeuron, name), validator),
+        )
+    return validator
+
+
+def resync(validator):
+    BaseValidatorNeuron.resync_metagraph(validator)
+
+
+def test_resync_unchanged_keeps_scores():
+    validator = make_validator([f"hotkey-{uid}" for uid in range(4)])
+    resync(validator)
+
+    assert validator.score_store.scores.tolist() == [1, 2, 3, 4]
+    assert validator.resync_stats["changed_uids"] == 0
+    assert validator.resync_stats["duration"] >= 0
+
+
+def test_resync_resets_only_replaced_hotkeys():
+    hotkeys = [f"hotkey-{uid}" for uid in range(4)]
+    validator = make_validator(hotkeys)
+
+    # uid 1 changes port, uid 2 is replaced by a new hotkey.
+    validator.subtensor.set(
+        ["hotkey-0", "hotkey-1", "new", "hotkey-3"],
+        [8091, 9000, 8091, 8091],
+    )
+    resync(validator)
+
+    assert validator.score_store.scores.tolist() == [1, 2, 0, 4]
+    assert validator.hotkeys[2] == "new"
+    assert validator.resync_stats["changed_uids"] == 2
+
+
+def test_resync_grows_scores():
+    validator = make_validator([f"hotkey-{uid}" for uid in range(4)])
+    validator.subtensor.set([f"hotkey-{uid}" for uid in range(6)])
+    resync(validator)
+
+    assert validator.score_store.scores.dtype == np.float32
+    assert validator.score_store.scores.tolist() == [1, 2, 3, 4, 0, 0]
+    assert len(validator.hotkeys) == 6
+    assert validator.resync_stats["changed_uids"] == 2
+
+
+def test_resync_shrinks_scores():
+    validator = make_validator([f"hotkey-{uid}" for uid in range(4)])
+    validator.subtensor.set(["hotkey-0", "new"])
+    resync(validator)
+
+    assert validator.score_store.scores.tolist() == [1, 0]
+    assert validator.hotkeys == ["hotkey-0", "new"]
+
+
+def test_resync_applies_pending_rewards_before_replacing():
+    validator = make_validator([f"hotkey-{uid}" for uid in range(4)])
+    validator.score_accumulator.add(np.array([1, 3]), np.array([1.0, 1.0]))
+    validator.subtensor.set(["hotkey-0", "new", "hotkey-2"])
+    resync(validator)
+
+    assert len(validator.score_accumulator) == 0
+    np.testing.assert_allclose(
+        validator.score_store.scores, [0.9, 0, 2.7], rtol=1e-6
+    )
+
+
+def test_resync_swaps_metagraph_without_touching_the_previous_one():
+    validator = make_validator([f"hotkey-{uid}" for uid in range(4)])
+    previous = validator.metagraph
+    validator.subtensor.set(["hotkey-0", "new"])
+    resync(validator)
+
+    # Forwards holding the previous metagraph keep seeing consistent arrays.
+    assert validator.metagraph is not previous
+    assert previous.hotkeys == [f"hotkey-{uid}" for uid in range(4)]
+    assert len(previous.axons) == 4
+    assert validator.metagraph.hotkeys == ["hotkey-0", "new"]
+
+
+def test_rewards_in_flight_across_resync_are_dropped():
+    validator = make_validator([f"hotkey-{uid}" for uid in range(4)])
+    generation = validator.score_accumulator.generation
+
+    # A forward sampled uids 1 and 3, the subnet shrinks and uid 1 is replaced before it is scored.
+    validator.subtensor.set(["hotkey-0", "new"])
+    resync(validator)
+    validator.score_accumulator.add(
+        np.array([1, 3]), np.array([1.0, 1.0]), generation=generation
+    )
+    validator.score_accumulator.add(np.array([0]), np.array([1.0]))
+    assert validator.score_accumulator.flush() == 1
+
+    np.testing.assert_allclose(
+        validator.score_store.scores, [1.0, 0], rtol=1e-6
+    )
+    assert validator.score_accumulator.stats()["dropped"] == 1
+
+
+def test_rewards_in_flight_across_growth_are_kept():
+    validator = make_validator([f"hotkey-{uid}" for uid in range(4)])
+    generation = validator.score_accumulator.generation
+
+    validator.subtensor.set([f"hotkey-{uid}" for uid in range(6)])
+    resync(validator)
+    validator.score_accumulator.add(
+        np.array([1]), np.array([1.0]), generation=generation
+    )
+    assert validator.score_accumulator.flush() == 1
+
+
+class ParameterMetagraph(FakeMetagraph):
+    """Keeps its arrays in a dict, as the torch metagraph keeps its parameters, which a shallow copy shares."""
+
+    def __init__(self, netuid, network="mock", sync=True):
+        self.__dict__["_parameters"] = {}
+        super().__init__(netuid, network=network, sync=sync)
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["_parameters"][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self._parameters[name] = value
+
+
+def test_resync_does_not_share_state_with_the_previous_metagraph(
+    monkeypatch,
+):
+    monkeypatch.setattr(bt, "metagraph", ParameterMetagraph)
+    validator = make_validator([f"hotkey-{uid}" for uid in range(4)])
+    validator.metagraph = ParameterMetagraph(1)
+    validator.metagraph.sync(validator.subtensor)
+    previous = validator.metagraph
+
+    validator.subtensor.set(["hotkey-0", "new"])
+    validator.fetch_metagraph()
+
+    assert validator.metagraph is previous
+    assert previous.hotkeys == [f"hotkey-{uid}" for uid in range(4)]
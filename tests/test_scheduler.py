@@ -0,0 +1,166 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import template.base.utils.scheduler as scheduler_module
+from template.base.utils.scheduler import StepScheduler
+
+
+class FakeClock:
+    """Stands in for the event loop clock and `asyncio.sleep` of the scheduler, recording every wait."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float):
+        self.sleeps.append(delay)
+        self.now += delay
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(
+        scheduler_module,
+        "asyncio",
+        SimpleNamespace(
+            get_running_loop=lambda: clock,
+            sleep=clock.sleep,
+            Semaphore=asyncio.Semaphore,
+        ),
+    )
+    monkeypatch.setattr(
+        scheduler_module, "time", SimpleNamespace(monotonic=clock.monotonic)
+    )
+    return clock
+
+
+async def noop():
+    return "done"
+
+
+def test_throttle_spaces_forwards_by_their_queries(clock):
+    scheduler = StepScheduler(target_qps=10)
+
+    async def main():
+        for _ in range(3):
+            assert await scheduler.run(noop, num_queries=5) == "done"
+
+    asyncio.run(main())
+    # Each forward reserves 5 / 10 seconds of budget, the first one starts right away.
+    assert clock.sleeps == [0.5, 0.5]
+    assert clock.now == 1.0
+
+
+def test_throttle_does_not_bank_idle_budget(clock):
+    scheduler = StepScheduler(target_qps=10)
+
+    async def main():
+        await scheduler.run(noop, num_queries=5)
+        clock.now += 10
+        await scheduler.run(noop, num_queries=5)
+        await scheduler.run(noop, num_queries=5)
+
+    asyncio.run(main())
+    # Idle time does not allow a burst, the third forward still waits its turn.
+    assert clock.sleeps == [0.5]
+
+
+def test_throttle_is_disabled_without_target_qps(clock):
+    scheduler = StepScheduler(target_qps=0)
+
+    async def main():
+        for _ in range(10):
+            await scheduler.run(noop, num_queries=100)
+
+    asyncio.run(main())
+    assert clock.sleeps == []
+
+
+def test_max_inflight_caps_concurrent_forwards():
+    scheduler = StepScheduler(max_inflight=3)
+    inflight = 0
+    peak = 0
+
+    async def forward():
+        nonlocal inflight, peak
+        inflight += 1
+        peak = max(peak, inflight)
+        assert scheduler.inflight <= 3
+        await asyncio.sleep(0.01)
+        inflight -= 1
+
+    async def main():
+        await asyncio.gather(*(scheduler.run(forward) for _ in range(10)))
+
+    asyncio.run(main())
+    assert peak == 3
+    assert scheduler.inflight == 0
+    assert scheduler.completed == 10
+
+
+def test_step_delay_does_not_block_the_loop():
+    scheduler = StepScheduler(step_delay=0.2, max_inflight=1)
+    events = []
+
+    async def forward(name):
+        events.append(f"start {name}")
+
+    async def lane(name):
+        await scheduler.run(lambda: forward(name))
+        events.append(f"end {name}")
+
+    async def ticker():
+        ticks = 0
+        while len(events) < 4:
+            ticks += 1
+            await asyncio.sleep(0.01)
+        return ticks
+
+    async def main():
+        _, _, ticks = await asyncio.gather(lane("a"), lane("b"), ticker())
+        return ticks
+
+    ticks = asyncio.run(main())
+    # The slot is released before the delay, so the second forward starts while the first lane waits.
+    assert events == ["start a", "start b", "end a", "end b"]
+    assert ticks >= 10
+
+
+def test_stats(clock):
+    scheduler = StepScheduler(max_inflight=2)
+
+    async def slow():
+        await clock.sleep(1.0)
+
+    async def failing():
+        await clock.sleep(1.0)
+        raise ValueError("boom")
+
+    async def main():
+        await scheduler.run(slow, num_queries=4)
+        await scheduler.run(slow, num_queries=4)
+        with pytest.raises(ValueError):
+            await scheduler.run(failing, num_queries=4)
+
+    asyncio.run(main())
+    clock.now = 6.0
+    assert scheduler.stats() == {
+        "inflight": 0,
+        "max_inflight": 2,
+        "completed": 2,
+        "failed": 1,
+        "queries": 8,
+        "queries_per_second": 8 / 6,
+        # 3 seconds of forwards over 2 slots during 6 seconds.
+        "utilisation": 0.25,
+    }
@@ -0,0 +1,177 @@
+import threading
+
+import numpy as np
+import pytest
+
+from template.base.utils.score_store import ScoreAccumulator, ScoreStore
+
+
+def test_resize_keeps_dtype_and_buffer():
+    store = ScoreStore(4, capacity=16)
+    buffer = store._buffer
+    store.set(np.array([1.0, 2.0, 3.0, 4.0], dtype=np.float64))
+
+    store.resize(10)
+    assert store.scores.dtype == np.float32
+    assert store.scores.tolist() == [1, 2, 3, 4, 0, 0, 0, 0, 0, 0]
+
+    store.resize(2)
+    assert store.scores.tolist() == [1, 2]
+    store.resize(4)
+    assert store.scores.tolist() == [1, 2, 0, 0]
+
+    assert store._buffer is buffer
+
+
+def test_resize_beyond_capacity_reallocates():
+    store = ScoreStore(2, capacity=2)
+    store.set([1.0, 2.0])
+    store.resize(5)
+
+    assert store.capacity >= 5
+    assert store.scores.dtype == np.float32
+    assert store.scores.tolist() == [1, 2, 0, 0, 0]
+
+
+def test_scores_view_writes_through():
+    store = ScoreStore(4, capacity=8)
+    store.scores[[1, 3]] = 0.5
+    store.reset(np.array([3]))
+
+    assert store.scores.tolist() == [0, 0.5, 0, 0]
+
+
+def test_sync_resets_replaced_hotkeys():
+    store = ScoreStore(4, capacity=8)
+    store.set([1.0, 2.0, 3.0, 4.0])
+
+    replaced = store.sync(["a", "b", "c", "d"], ["a", "x", "c", "d", "e", "f"])
+
+    assert replaced.tolist() == [1]
+    assert store.scores.tolist() == [1, 0, 3, 4, 0, 0]
+
+
+def reference_update(scores, uids, rewards, alpha):
+    # Original update_scores implementation, kept as the reference behaviour.
+    scattered_rewards = np.zeros_like(scores)
+    scattered_rewards[uids] = rewards
+    return alpha * scattered_rewards + (1 - alpha) * scores
+
+
+def test_update_matches_reference():
+    rng = np.random.default_rng(0)
+    store = ScoreStore(256)
+    expected = np.zeros(256, dtype=np.float32)
+
+    for _ in range(50):
+        uids = rng.choice(256, 16, replace=False)
+        rewards = rng.random(16)
+        store.update(uids, rewards, 0.1)
+        expected = reference_update(expected, uids, rewards, 0.1)
+
+    assert store.scores.dtype == expected.dtype == np.float32
+    np.testing.assert_array_equal(store.scores, expected)
+
+
+def test_update_sparse_only_touches_sampled_uids():
+    store = ScoreStore(8)
+    store.set(np.ones(8))
+
+    store.update_sparse(np.array([2, 5]), np.array([0.0, 3.0]), 0.5)
+    assert store.scores.tolist() == [1, 1, 0.5, 1, 1, 2, 1, 1]
+
+
+def test_update_sparse_decays_by_elapsed_steps():
+    store = ScoreStore(4)
+    uids = np.array([0, 1])
+    store.update_sparse(uids, np.array([1.0, 1.0]), 1.0, step=0, decay=0.5)
+    store.update_sparse(uids[:1], np.array([1.0]), 0.0, step=2, decay=0.5)
+
+    # uid 0 decayed over 2 steps before its update, uid 1 was not touched.
+    assert store.scores.tolist() == [0.25, 1, 0, 0]
+    # Decay since the last update is applied when reading the scores for weights.
+    assert store.decayed(3, 0.5).tolist() == [0.125, 0.125, 0, 0]
+    assert store.decayed(3, 0.0).tolist() == [0.25, 1, 0, 0]
+
+
+def test_update_many_matches_sequential_updates():
+    rng = np.random.default_rng(0)
+    batches = [
+        (rng.choice(64, 8, replace=False), rng.random(8)) for _ in range(10)
+    ]
+    sequential = ScoreStore(64)
+    batched = ScoreStore(64)
+    sequential.set(rng.random(64))
+    batched.set(sequential.scores)
+
+    for uids, rewards in batches:
+        sequential.update(uids, rewards, 0.1)
+    batched.update_many(batches, 0.1)
+
+    np.testing.assert_allclose(batched.scores, sequential.scores, rtol=1e-5)
+
+
+def test_accumulator_applies_concurrent_batches():
+    store = ScoreStore(32)
+    accumulator = ScoreAccumulator(store, alpha=0.5, mode="sparse")
+
+    def worker(uid):
+        for step in range(100):
+            accumulator.add(np.array([uid]), np.array([1.0]), step)
+            if step % 10 == 0:
+                accumulator.flush()
+                store.resize(32)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    accumulator.flush()
+
+    # Every uid received 100 updates toward 1, none was lost.
+    assert accumulator.batches == 3200
+    assert len(accumulator) == 0
+    np.testing.assert_allclose(store.scores, 1.0)
+
+
+@pytest.mark.parametrize("mode", ["dense", "sparse"])
+def test_accumulator_drops_uids_beyond_the_scores(mode):
+    store, expected = ScoreStore(4), ScoreStore(4)
+    accumulator = ScoreAccumulator(store, alpha=0.5, mode=mode)
+    reference = ScoreAccumulator(expected, alpha=0.5, mode=mode)
+
+    # uid 7 left the subnet while its forward was in flight.
+    accumulator.add(np.array([0, 7]), np.array([1.0, 1.0]), step=1)
+    accumulator.add(np.array([1]), np.array([1.0]), step=1)
+    reference.add(np.array([0]), np.array([1.0]), step=1)
+    reference.add(np.array([1]), np.array([1.0]), step=1)
+
+    assert accumulator.flush() == reference.flush() == 2
+    np.testing.assert_allclose(store.scores, expected.scores)
+    assert store.scores[1] > 0
+
+
+@pytest.mark.parametrize("mode", ["dense", "sparse"])
+def test_accumulator_drops_batches_of_previous_generations(mode):
+    store, expected = ScoreStore(4), ScoreStore(4)
+    accumulator = ScoreAccumulator(store, alpha=0.5, mode=mode)
+    reference = ScoreAccumulator(expected, alpha=0.5, mode=mode)
+    accumulator.add(np.array([0]), np.array([1.0]))
+    generation = accumulator.generation
+
+    # Pending batches are applied before the generation changes.
+    accumulator.advance()
+    assert accumulator.generation == generation + 1
+    assert len(accumulator) == 0
+    reference.add(np.array([0]), np.array([1.0]))
+    reference.flush()
+    np.testing.assert_allclose(store.scores, expected.scores)
+
+    accumulator.add(np.array([1]), np.array([1.0]), generation=generation)
+    accumulator.add(np.array([2]), np.array([1.0]))
+    reference.add(np.array([2]), np.array([1.0]))
+    assert accumulator.flush() == reference.flush() == 1
+    np.testing.assert_allclose(store.scores, expected.scores)
+    assert store.scores[1] == 0
+    assert accumulator.stats()["dropped"] == 1
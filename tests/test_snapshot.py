@@ -0,0 +1,48 @@
+import os
+
+import bittensor as bt
+import numpy as np
+
+from template.base.utils.snapshot import load_metagraph, save_metagraph
+
+
+def make_metagraph(block, n=4):
+    metagraph = bt.metagraph(netuid=1, network="mock", sync=False)
+    metagraph.n = np.array(n)
+    metagraph.block = np.array(block)
+    metagraph.uids = np.arange(n)
+    metagraph.stake = np.arange(n, dtype=np.float32)
+    metagraph.axons = [
+        bt.AxonInfo(
+            version=1,
+            ip="1.2.3.4",
+            port=8091 + uid,
+            ip_type=4,
+            hotkey=f"hotkey-{uid}",
+            coldkey="coldkey",
+        )
+        for uid in range(n)
+    ]
+    return metagraph
+
+
+def test_snapshot_round_trip(tmp_path):
+    directory = str(tmp_path / "metagraph")
+    save_metagraph(make_metagraph(10), directory)
+    save_metagraph(make_metagraph(20, n=6), directory)
+
+    # Only the latest snapshot is kept.
+    assert os.listdir(directory) == ["block-20.pt"]
+
+    metagraph = bt.metagraph(netuid=1, network="mock", sync=False)
+    assert load_metagraph(metagraph, directory)
+    assert int(metagraph.block) == 20
+    assert metagraph.hotkeys == [f"hotkey-{uid}" for uid in range(6)]
+    assert metagraph.axons[5].port == 8096
+    np.testing.assert_array_equal(metagraph.stake, np.arange(6))
+
+
+def test_load_without_snapshot(tmp_path):
+    metagraph = bt.metagraph(netuid=1, network="mock", sync=False)
+    assert not load_metagraph(metagraph, str(tmp_path / "missing"))
+    assert not load_metagraph(metagraph, str(tmp_path))
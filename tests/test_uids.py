@@ -0,0 +1,151 @@
+from types import SimpleNamespace
+
+import bittensor as bt
+import numpy as np
+import pytest
+
+from template.utils.uids import (
+    SAMPLING_POLICIES,
+    LatencySampler,
+    RoundRobinSampler,
+    StalenessSampler,
+    build_sampler,
+    check_uid_availability,
+    get_available_uids_mask,
+    get_axon_fingerprint,
+    get_hotkey_fingerprint,
+    sample_uids,
+)
+
+
+def make_metagraph(n=32, seed=0):
+    rng = np.random.default_rng(seed)
+    axons = [
+        SimpleNamespace(is_serving=bool(serving))
+        for serving in rng.random(n) < 0.8
+    ]
+    return SimpleNamespace(
+        n=np.array(n),
+        axons=axons,
+        validator_permit=rng.random(n) < 0.2,
+        S=rng.uniform(0, 8192, n).astype(np.float32),
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_mask_matches_check_uid_availability(seed):
+    metagraph = make_metagraph(seed=seed)
+    mask = get_available_uids_mask(metagraph, vpermit_tao_limit=4096)
+    expected = [
+        check_uid_availability(metagraph, uid, 4096)
+        for uid in range(int(metagraph.n))
+    ]
+    assert mask.tolist() == expected
+
+
+def test_sample_uids_respects_mask_and_exclude():
+    available = np.zeros(64, dtype=bool)
+    available[::2] = True
+    exclude = list(range(0, 20, 2))
+    rng = np.random.default_rng(0)
+
+    for _ in range(100):
+        uids = sample_uids(available, 10, exclude, rng)
+        assert len(uids) == len(set(uids.tolist())) == 10
+        assert available[uids].all()
+        assert not set(uids.tolist()) & set(exclude)
+
+
+def test_sample_uids_fills_from_excluded_and_caps_k():
+    available = np.zeros(16, dtype=bool)
+    available[[1, 3, 5, 7]] = True
+
+    uids = sample_uids(available, 3, exclude=[1, 3, 5])
+    assert 7 in uids.tolist()
+    assert len(set(uids.tolist())) == 3
+
+    uids = sample_uids(available, 10)
+    assert sorted(uids.tolist()) == [1, 3, 5, 7]
+
+
+@pytest.mark.parametrize("policy", list(SAMPLING_POLICIES))
+def test_policies_draw_distinct_available_uids(policy):
+    sampler = build_sampler(policy, rng=np.random.default_rng(0))
+    available = np.ones(40, dtype=bool)
+    available[::5] = False
+
+    for _ in range(20):
+        uids = sampler.sample(available, 8)
+        assert len(set(uids.tolist())) == 8
+        assert available[uids].all()
+        sampler.observe(uids, np.full(len(uids), 0.1))
+
+
+def test_round_robin_covers_subnet_in_one_epoch():
+    sampler = RoundRobinSampler(rng=np.random.default_rng(0))
+    available = np.ones(50, dtype=bool)
+
+    drawn = np.concatenate([sampler.sample(available, 10) for _ in range(5)])
+    assert sorted(drawn.tolist()) == list(range(50))
+    assert sampler.epoch == 0
+
+    sampler.sample(available, 10)
+    assert sampler.epoch == 1
+
+
+def test_staleness_prefers_unobserved_uids():
+    sampler = StalenessSampler(rng=np.random.default_rng(0), power=8)
+    available = np.ones(20, dtype=bool)
+    sampler.observe(np.arange(10))
+
+    uids = sampler.sample(available, 5)
+    assert (uids >= 10).all()
+
+
+def test_latency_sampler_prefers_fast_uids():
+    sampler = LatencySampler(rng=np.random.default_rng(0), floor=0.01)
+    available = np.ones(20, dtype=bool)
+    sampler.observe(np.arange(20), np.where(np.arange(20) < 5, 0.01, 10.0))
+
+    counts = np.zeros(20)
+    for _ in range(200):
+        counts[sampler.sample(available, 1)] += 1
+    assert counts[:5].sum() > 0.9 * counts.sum()
+
+
+def make_axon(hotkey, ip="1.2.3.4", port=8091):
+    return bt.AxonInfo(
+        version=1,
+        ip=ip,
+        port=port,
+        ip_type=4,
+        hotkey=hotkey,
+        coldkey="coldkey",
+    )
+
+
+def test_axon_fingerprint_changes_with_axon_equality():
+    axons = [make_axon(f"hotkey-{uid}") for uid in range(8)]
+    updated = list(axons)
+    updated[2] = make_axon("hotkey-2", port=9000)
+    updated[5] = make_axon("replaced")
+    updated[6] = make_axon("hotkey-6")
+
+    before = get_axon_fingerprint(axons)
+    after = get_axon_fingerprint(updated)
+    expected = [a != b for a, b in zip(axons, updated)]
+
+    assert before.dtype == np.int64
+    assert (before != after).tolist() == expected
+    assert np.flatnonzero(before != after).tolist() == [2, 5]
+
+
+def test_hotkey_fingerprint():
+    hotkeys = [f"hotkey-{uid}" for uid in range(8)]
+    updated = list(hotkeys)
+    updated[3] = "replaced"
+
+    changed = get_hotkey_fingerprint(hotkeys) != get_hotkey_fingerprint(
+        updated
+    )
+    assert np.flatnonzero(changed).tolist() == [3]
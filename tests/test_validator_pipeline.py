@@ -0,0 +1,348 @@
+import asyncio
+import random
+import sys
+import threading
+import time
+from unittest import mock
+
+import bittensor as bt
+import bittensor.utils.networking
+import numpy as np
+import pytest
+
+from template.base.validator import BaseValidatorNeuron
+from template.mock import MockDendrite
+from template.validator.forward import forward
+
+
+class PipelineValidator(BaseValidatorNeuron):
+    """Mock validator whose forward only records how many forwards run and what metagraph they see."""
+
+    def __init__(self, config=None):
+        super().__init__(config=config)
+        self.forwards = 0
+        self.inflight = 0
+        self.peak_inflight = 0
+        self.inconsistent = 0
+
+    async def forward(self):
+        self.inflight += 1
+        self.peak_inflight = max(self.peak_inflight, self.inflight)
+        try:
+            metagraph = self.metagraph
+            await asyncio.sleep(0.01)
+            n = int(metagraph.n)
+            if not (len(metagraph.axons) == len(metagraph.hotkeys) == n):
+                self.inconsistent += 1
+            self.forwards += 1
+        finally:
+            self.inflight -= 1
+
+
+class ForwardValidator(BaseValidatorNeuron):
+    """Mock validator running the template forward."""
+
+    async def forward(self):
+        return await forward(self)
+
+
+class SlowDendrite(MockDendrite):
+    """MockDendrite answering after 10 to 50 ms, so concurrent forwards interleave as on a real network."""
+
+    async def forward(self, *args, **kwargs):
+        await asyncio.sleep(random.uniform(0.01, 0.05))
+        return await super().forward(*args, **kwargs)
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def make_validator(tmp_path):
+    validators = []
+
+    def make(*args, cls=PipelineValidator):
+        # The mock chain is global, start from a fresh one to register the neurons again.
+        bt.MockSubtensor.reset()
+        argv = [
+            "validator",
+            "--mock",
+            "--netuid",
+            "1",
+            "--wallet.name",
+            "pipeline",
+            "--logging.logging_dir",
+            str(tmp_path),
+            "--neuron.dont_save_events",
+            "--neuron.axon_off",
+            "--neuron.step_delay",
+            "0",
+            "--neuron.sync_interval",
+            "0.05",
+            "--neuron.num_concurrent_forwards",
+            "3",
+            *args,
+        ]
+        with mock.patch.object(sys, "argv", argv), mock.patch.object(
+            bittensor.utils.networking,
+            "get_external_ip",
+            lambda: "127.0.0.1",
+        ):
+            validator = cls()
+        # Chain syncs only resync the metagraph.
+        validator.should_sync_metagraph = lambda: True
+        validator.should_set_weights = lambda: False
+        validators.append(validator)
+        return validator
+
+    yield make
+    for validator in validators:
+        validator.close()
+    bt.MockSubtensor.reset()
+
+
+def test_forwards_keep_running_while_metagraph_sync_hangs(make_validator):
+    validator = make_validator()
+    subtensor = validator.subtensor
+
+    # Syncing the metagraph hangs until released.
+    release = threading.Event()
+    entered = threading.Event()
+    neurons_lite = subtensor.neurons_lite
+
+    def hung_neurons_lite(*args, **kwargs):
+        entered.set()
+        release.wait(30)
+        return neurons_lite(*args, **kwargs)
+
+    validator.run_in_background_thread()
+    assert wait_until(lambda: validator.forwards > 0)
+
+    subtensor.neurons_lite = hung_neurons_lite
+    try:
+        assert entered.wait(5)
+        metagraph = validator.metagraph
+        forwards = validator.forwards
+        time.sleep(0.5)
+        assert validator.forwards - forwards >= 10
+        # The hung sync works on a copy, forwards keep the current metagraph.
+        assert validator.metagraph is metagraph
+    finally:
+        release.set()
+
+    # Once released, the synced copy replaces the metagraph.
+    assert wait_until(lambda: validator.metagraph is not metagraph)
+    validator.stop_run_thread()
+    assert validator.inconsistent == 0
+
+
+def test_lanes_keep_configured_forwards_in_flight(make_validator):
+    validator = make_validator("--neuron.sync_interval", "60")
+    validator.run_in_background_thread()
+    assert wait_until(lambda: validator.forwards >= 30)
+    validator.stop_run_thread()
+
+    # Each lane refills its slot as soon as its forward completes.
+    assert validator.peak_inflight == 3
+    assert validator.scheduler.max_inflight == 3
+
+
+def test_pipeline_stats_counters_increase(make_validator):
+    validator = make_validator("--neuron.sample_size", "4")
+    before = validator.pipeline_stats
+    assert before["completed"] == before["queries"] == 0
+
+    validator.run_in_background_thread()
+    assert wait_until(lambda: validator.pipeline_stats["completed"] >= 10)
+    middle = validator.pipeline_stats
+    assert wait_until(
+        lambda: validator.pipeline_stats["completed"] > middle["completed"]
+    )
+    validator.stop_run_thread()
+
+    after = validator.pipeline_stats
+    assert after["queries"] == 4 * after["completed"]
+    assert after["queries"] > middle["queries"]
+    assert after["failed"] == 0
+    assert after["queries_per_second"] > 0
+    assert 0 < after["utilisation"] <= 1
+
+
+def test_pipeline_exit_cancels_background_tasks_and_saves(make_validator):
+    validator = make_validator()
+    started = threading.Event()
+    cancelled = threading.Event()
+
+    async def score_flush_loop():
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    validator.score_flush_loop = score_flush_loop
+    saves = []
+    save_state = validator.save_state
+
+    def spy_save_state(force=False):
+        saves.append(force)
+        save_state(force=force)
+
+    validator.save_state = spy_save_state
+
+    validator.run_in_background_thread()
+    assert started.wait(5)
+    assert wait_until(lambda: validator.forwards > 0)
+    validator.stop_run_thread()
+
+    assert not validator.thread.is_alive()
+    assert cancelled.is_set()
+    assert saves[-1] is True
+    # The final state is written before the pipeline returns.
+    state = np.load(validator.config.neuron.full_path + "/state.npz")
+    assert int(state["step"]) == validator.step
+
+
+def test_validator_can_be_restarted(make_validator):
+    validator = make_validator()
+    for _ in range(2):
+        forwards = validator.forwards
+        validator.run_in_background_thread()
+        assert wait_until(lambda: validator.block_clock.running)
+        assert wait_until(lambda: validator.forwards > forwards)
+        validator.stop_run_thread()
+
+        assert not validator.thread.is_alive()
+        assert not validator.block_clock.running
+        # The chain is still reachable between runs.
+        assert validator.block == validator.subtensor.get_current_block()
+
+
+def test_close_stops_chain_threads(make_validator):
+    validator = make_validator()
+    validator.run_in_background_thread()
+    assert wait_until(lambda: validator.forwards > 0)
+    validator.close()
+
+    assert not validator.thread.is_alive()
+    assert not validator.block_clock.running
+    assert wait_until(
+        lambda: not any(
+            thread.is_alive() for thread in validator.chain._pool._threads
+        )
+    )
+
+
+def test_concurrent_forwards_score_the_query_they_sent(make_validator):
+    validator = make_validator(
+        "--neuron.sample_size",
+        "4",
+        cls=ForwardValidator,
+    )
+    # A metagraph synced from the mock chain has no serving axons, keep the mock one.
+    validator.should_sync_metagraph = lambda: False
+    with mock.patch.object(
+        bittensor.utils.networking, "get_external_ip", lambda: "127.0.0.1"
+    ):
+        validator.dendrite = SlowDendrite(wallet=validator.wallet)
+    rewards = []
+    update_scores = validator.update_scores
+
+    def spy_update_scores(batch, uids, **kwargs):
+        rewards.extend(batch)
+        update_scores(batch, uids, **kwargs)
+
+    validator.update_scores = spy_update_scores
+
+    validator.run_in_background_thread()
+    assert wait_until(lambda: len(rewards) >= 100)
+    validator.stop_run_thread()
+
+    # The mock miners always answer correctly, whatever the other lanes did meanwhile.
+    assert all(reward == 1.0 for reward in rewards)
+
+
+def test_score_flush_loop_survives_errors(make_validator):
+    validator = make_validator("--neuron.score_flush_interval", "0.01")
+    accumulator = validator.score_accumulator
+    flush = accumulator.flush
+    calls = []
+
+    def failing_flush():
+        calls.append(None)
+        if len(calls) == 1:
+            raise IndexError("index 9 is out of bounds")
+        return flush()
+
+    validator.run_in_background_thread()
+    assert wait_until(lambda: validator.forwards > 0)
+    accumulator.flush = failing_flush
+    assert wait_until(lambda: len(calls) >= 3)
+    validator.stop_run_thread()
+
+
+class WarmValidator(PipelineValidator):
+    """PipelineValidator recording its blocking syncs and serves."""
+
+    def __init__(self, config=None):
+        self.calls = []
+        super().__init__(config=config)
+
+    def sync(self):
+        self.calls.append("sync")
+        super().sync()
+
+    def serve(self):
+        self.calls.append("serve")
+        super().serve()
+
+
+def test_warm_start_defers_chain_sync_to_reconcile(make_validator):
+    # A cold start saves the metagraph snapshot the warm start restores.
+    cold = make_validator(cls=WarmValidator)
+    assert cold.calls == ["sync", "serve"]
+    assert not cold.warm_started
+    cold.close()
+
+    # Only the reconciliation resyncs the metagraph.
+    validator = make_validator(
+        "--neuron.warm_start",
+        "--neuron.sync_interval",
+        "60",
+        cls=WarmValidator,
+    )
+    assert validator.warm_started
+    assert validator.calls == []
+    assert validator.time_to_first_query is None
+
+    validator.run_in_background_thread()
+    assert wait_until(lambda: validator.forwards > 0)
+    assert validator.time_to_first_query is not None
+    # Reconciling resyncs the metagraph and serves in the background, the blocking sync never runs.
+    assert wait_until(lambda: "serve" in validator.calls)
+    assert validator.resync_stats["n"] == validator.metagraph.n
+    validator.stop_run_thread()
+    assert validator.calls == ["serve"]
+
+
+def test_history_is_closed_between_runs(make_validator):
+    validator = make_validator(
+        "--neuron.record_history",
+        "--neuron.score_flush_interval",
+        "0.01",
+        cls=ForwardValidator,
+    )
+    validator.should_sync_metagraph = lambda: False
+    history = validator.history
+    for _ in range(2):
+        rows = history.stats()["scores"]
+        validator.run_in_background_thread()
+        assert wait_until(lambda: not history.closed)
+        assert wait_until(lambda: history.stats()["scores"] > rows)
+        validator.stop_run_thread()
+        assert history.closed
@@ -0,0 +1,150 @@
+import numpy as np
+import pytest
+
+from template.base.utils.weight_utils import (
+    U16_MAX,
+    convert_weights_and_uids_for_emit,
+    normalize_max_weight,
+    normalize_max_weight_batch,
+)
+
+
+def reference_normalize_max_weight(
+    x: np.ndarray, limit: float = 0.1
+) -> np.ndarray:
+    # Original list comprehension implementation, kept as the reference behaviour.
+    epsilon = 1e-7
+
+    weights = x.copy()
+    values = np.sort(weights)
+
+    if x.sum() == 0 or len(x) * limit <= 1:
+        return np.ones_like(x) / x.size
+    else:
+        estimation = values / values.sum()
+
+        if estimation.max() <= limit:
+            return weights / weights.sum()
+
+        cumsum = np.cumsum(estimation, 0)
+
+        estimation_sum = np.array(
+            [(len(values) - i - 1) * estimation[i] for i in range(len(values))]
+        )
+        n_values = (
+            estimation / (estimation_sum + cumsum + epsilon) < limit
+        ).sum()
+
+        cutoff_scale = (limit * cumsum[n_values - 1] - epsilon) / (
+            1 - (limit * (len(estimation) - n_values))
+        )
+        cutoff = cutoff_scale * values.sum()
+
+        weights[weights > cutoff] = cutoff
+
+        y = weights / weights.sum()
+
+        return y
+
+
+def reference_convert_weights_and_uids_for_emit(uids, weights):
+    # Original list based implementation, kept as the reference behaviour.
+    uids = np.asarray(uids)
+    weights = np.asarray(weights)
+    if np.sum(weights) == 0:
+        return [], []
+    max_weight = float(np.max(weights))
+    weights = [float(value) / max_weight for value in weights]
+    weight_vals = []
+    weight_uids = []
+    for weight_i, uid_i in zip(weights, uids):
+        uint16_val = round(float(weight_i) * int(U16_MAX))
+        if uint16_val != 0:
+            weight_vals.append(uint16_val)
+            weight_uids.append(uid_i)
+    return weight_uids, weight_vals
+
+
+def random_weights(rng, n, kind):
+    if kind == "uniform":
+        return rng.random(n).astype(np.float32)
+    if kind == "heavy_tail":
+        return rng.pareto(1.0, n).astype(np.float32)
+    if kind == "sparse":
+        x = rng.random(n).astype(np.float32)
+        x[rng.random(n) < 0.9] = 0
+        return x
+    if kind == "zeros":
+        return np.zeros(n, dtype=np.float32)
+    raise ValueError(kind)
+
+
+KINDS = ["uniform", "heavy_tail", "sparse", "zeros"]
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("n", [1, 2, 5, 16, 256, 1024])
+@pytest.mark.parametrize("limit", [0.01, 0.05, 0.1, 0.5, 1.0])
+@pytest.mark.parametrize("kind", KINDS)
+def test_normalize_max_weight_matches_reference(seed, n, limit, kind):
+    x = random_weights(np.random.default_rng(seed), n, kind)
+
+    expected = reference_normalize_max_weight(x, limit)
+    actual = normalize_max_weight(x, limit)
+
+    assert actual.dtype == expected.dtype
+    np.testing.assert_array_equal(actual, expected)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n", [1, 2, 16, 256])
+@pytest.mark.parametrize("limit", [0.01, 0.1, 0.5])
+def test_normalize_max_weight_batch_matches_rows(seed, n, limit):
+    rng = np.random.default_rng(seed)
+    x = np.stack(
+        [random_weights(rng, n, KINDS[i % len(KINDS)]) for i in range(32)]
+    )
+
+    expected = np.stack([normalize_max_weight(row, limit) for row in x])
+    actual = normalize_max_weight_batch(x, limit)
+
+    assert actual.shape == x.shape
+    np.testing.assert_allclose(actual, expected, rtol=1e-6, atol=1e-9)
+    np.testing.assert_allclose(actual.sum(axis=1), 1, rtol=1e-5)
+
+
+def test_normalize_max_weight_batch_rejects_vectors():
+    with pytest.raises(ValueError):
+        normalize_max_weight_batch(np.ones(4))
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("n", [1, 16, 256, 4096])
+@pytest.mark.parametrize("kind", KINDS)
+def test_convert_weights_and_uids_matches_reference(seed, n, kind):
+    rng = np.random.default_rng(seed)
+    weights = random_weights(rng, n, kind)
+    uids = rng.permutation(n)
+
+    expected_uids, expected_vals = reference_convert_weights_and_uids_for_emit(
+        uids, weights
+    )
+    weight_uids, weight_vals = convert_weights_and_uids_for_emit(uids, weights)
+
+    assert weight_uids.dtype == weight_vals.dtype == np.uint16
+    assert weight_uids.tolist() == [int(uid) for uid in expected_uids]
+    assert weight_vals.tolist() == expected_vals
+
+
+@pytest.mark.parametrize(
+    "uids, weights",
+    [
+        ([0, 1], [0.5, -0.5]),
+        ([0, -1], [0.5, 0.5]),
+        ([0, U16_MAX + 1], [0.5, 0.5]),
+        ([0, 1, 2], [0.5, 0.5]),
+    ],
+)
+def test_convert_weights_and_uids_rejects_invalid(uids, weights):
+    with pytest.raises(ValueError):
+        convert_weights_and_uids_for_emit(np.array(uids), np.array(weights))